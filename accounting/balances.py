@@ -0,0 +1,136 @@
+from collections import defaultdict
+from decimal import Decimal
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import F, Sum
+
+from accounting.models import AccountBalance, LedgerEntry
+
+CENT = Decimal("0.01")
+ZERO = Decimal("0")
+
+
+def _get_batch_size():
+    return getattr(settings, "BULK_PERSISTENCE", {}).get("BATCH_SIZE")
+
+
+def _snapshot(account_id, branch_id, as_of_date, debit_total=ZERO, credit_total=ZERO):
+    return AccountBalance(
+        account_id=account_id,
+        branch_id=branch_id,
+        as_of_date=as_of_date,
+        debit_total=debit_total,
+        credit_total=credit_total,
+        balance=debit_total - credit_total,
+        is_system_generated=True,
+    )
+
+
+def apply_entries(entries):
+    """
+    Fold newly written LedgerEntry rows into the AccountBalance snapshots.
+    Call inside the transaction that wrote them.
+
+    Entries are summed per (account, branch, day). Days without a snapshot
+    get one, seeded from the nearest earlier snapshot; a concurrent post
+    may have inserted the same day since, so conflicts are skipped and its
+    row is used instead. Then each day's delta is added to that snapshot
+    and every later one with a single UPDATE ... SET x = x + delta, so
+    concurrent posts never overwrite each other.
+    """
+    deltas = defaultdict(lambda: [ZERO, ZERO])
+    for entry in entries:
+        delta = deltas[(entry.account_id, entry.branch_id, entry.entry_date)]
+        delta[0] += entry.base_dr
+        delta[1] += entry.base_cr
+    deltas = {key: value for key, value in deltas.items() if value[0] or value[1]}
+    if not deltas:
+        return
+
+    existing = set(
+        AccountBalance.objects
+        .filter(
+            account_id__in={account_id for account_id, _, _ in deltas},
+            as_of_date__in={day for _, _, day in deltas},
+        )
+        .values_list("account_id", "branch_id", "as_of_date")
+    )
+
+    missing = sorted((key for key in deltas if key not in existing), key=lambda key: key[2])
+    if missing:
+        new_rows = []
+        for account_id, branch_id, day in missing:
+            previous = (
+                AccountBalance.objects
+                .filter(account_id=account_id, branch_id=branch_id, as_of_date__lt=day)
+                .order_by("-as_of_date")
+                .values_list("debit_total", "credit_total")
+                .first()
+            )
+            new_rows.append(_snapshot(account_id, branch_id, day, *(previous or (ZERO, ZERO))))
+        AccountBalance.objects.bulk_create(new_rows, batch_size=_get_batch_size(), ignore_conflicts=True)
+
+    for (account_id, branch_id, day), (debit, credit) in sorted(deltas.items(), key=lambda item: item[0][2]):
+        AccountBalance.objects.filter(
+            account_id=account_id, branch_id=branch_id, as_of_date__gte=day
+        ).update(
+            debit_total=F("debit_total") + debit,
+            credit_total=F("credit_total") + credit,
+            balance=F("balance") + (debit - credit),
+        )
+
+
+def balance_as_of(account, as_of_date, branch=None):
+    """
+    (debit_total, credit_total, balance) of ``account`` in ``branch`` at the
+    end of ``as_of_date``: the nearest snapshot on or before that day, one
+    indexed lookup.
+    """
+    row = (
+        AccountBalance.objects
+        .filter(account=account, branch=branch, as_of_date__lte=as_of_date)
+        .order_by("-as_of_date")
+        .values_list("debit_total", "credit_total", "balance")
+        .first()
+    )
+    return row or (ZERO, ZERO, ZERO)
+
+
+def rebuild_balances(accounts, chunk_size=200):
+    """
+    Recompute the snapshots of ``accounts`` (a COA queryset) from the ledger.
+    Accounts are handled ``chunk_size`` at a time, each chunk in its own
+    transaction: its snapshots are deleted, the ledger is summed per day
+    in the database and running totals are written with bulk_create.
+    Returns the number of snapshots written.
+    """
+    written = 0
+    account_ids = list(accounts.order_by("pk").values_list("pk", flat=True))
+    for start in range(0, len(account_ids), chunk_size):
+        chunk = account_ids[start:start + chunk_size]
+        daily = (
+            LedgerEntry.objects
+            .filter(account_id__in=chunk)
+            .values("account_id", "branch_id", "entry_date")
+            .annotate(debit=Sum("base_dr"), credit=Sum("base_cr"))
+            .order_by("account_id", "branch_id", "entry_date")
+        )
+
+        with transaction.atomic():
+            rows = []
+            running = {}
+            for day in daily:
+                key = (day["account_id"], day["branch_id"])
+                debit_total, credit_total = running.get(key, (ZERO, ZERO))
+                debit_total = (debit_total + day["debit"]).quantize(CENT)
+                credit_total = (credit_total + day["credit"]).quantize(CENT)
+                running[key] = debit_total, credit_total
+                rows.append(_snapshot(key[0], key[1], day["entry_date"], debit_total, credit_total))
+
+            # Snapshots are derived rows: skip the per-row history a regular delete() writes
+            stale = AccountBalance.objects.filter(account_id__in=chunk)
+            stale._raw_delete(stale.db)
+            AccountBalance.objects.bulk_create(rows, batch_size=_get_batch_size())
+        written += len(rows)
+    return written
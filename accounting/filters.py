@@ -1,4 +1,5 @@
 import django_filters as filters
+from core.utils.TreeIndex import UnderFilter
 from .models import (
     AccountType,
     COA,
@@ -7,6 +8,7 @@ from .models import (
     CashTransfer,
     ChequeRegister,
     JournalVoucher,
+    LedgerEntry,
 )
 
 
@@ -24,6 +26,7 @@ class AccountTypeFilter(filters.FilterSet):
 class COAFilter(filters.FilterSet):
     branch = filters.UUIDFilter(field_name="branch_id")
     parent = filters.UUIDFilter(field_name="parent_id")
+    under = UnderFilter(field_name="pk")
     account_type = filters.UUIDFilter(field_name="account_type_id")
     code = filters.CharFilter(field_name="code", lookup_expr="icontains")
     name = filters.CharFilter(field_name="name", lookup_expr="icontains")
@@ -100,3 +103,16 @@ class JournalVoucherFilter(filters.FilterSet):
     class Meta:
         model = JournalVoucher
         fields = ["branch", "voucher_no", "voucher_date", "approved", "active"]
+
+
+class LedgerEntryFilter(filters.FilterSet):
+    branch = filters.UUIDFilter(field_name="branch_id")
+    account = filters.UUIDFilter(field_name="account_id")
+    entry_date = filters.DateFromToRangeFilter(field_name="entry_date")
+    source_id = filters.UUIDFilter(field_name="source_id")
+    source_no = filters.CharFilter(field_name="source_no", lookup_expr="icontains")
+    is_reversal = filters.BooleanFilter(field_name="is_reversal")
+
+    class Meta:
+        model = LedgerEntry
+        fields = ["branch", "account", "entry_date", "source_id", "source_no", "is_reversal"]
@@ -0,0 +1,41 @@
+# Generated by Django 5.2.18 on 2026-10-18 12:38
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounting', '0002_initial'),
+        ('crm', '0001_initial'),
+        ('master', '0001_initial'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='cashtransfer',
+            index=models.Index(fields=['branch', 'active', 'created'], name='accounting__branch__2ba519_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='cashtransfer',
+            index=models.Index(fields=['branch', 'transfer_date'], name='accounting__branch__99dfda_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='chequeregister',
+            index=models.Index(fields=['branch', 'active', 'created'], name='accounting__branch__ed7273_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='chequeregister',
+            index=models.Index(fields=['branch', 'cheque_date', 'status'], name='accounting__branch__beefa0_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='journalvoucher',
+            index=models.Index(fields=['branch', 'active', 'created'], name='accounting__branch__778958_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='journalvoucher',
+            index=models.Index(fields=['branch', 'voucher_date'], name='accounting__branch__4fd557_idx'),
+        ),
+    ]
@@ -0,0 +1,42 @@
+# Generated by Django 5.2.18 on 2026-10-18 13:43
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounting', '0003_branch_composite_indexes'),
+        ('contenttypes', '0002_remove_content_type_name'),
+        ('master', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='LedgerEntry',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('entry_date', models.DateField()),
+                ('dr', models.DecimalField(decimal_places=2, default=0, max_digits=18)),
+                ('cr', models.DecimalField(decimal_places=2, default=0, max_digits=18)),
+                ('exchange_rate', models.DecimalField(decimal_places=6, default=1, max_digits=18)),
+                ('base_dr', models.DecimalField(decimal_places=2, default=0, max_digits=18)),
+                ('base_cr', models.DecimalField(decimal_places=2, default=0, max_digits=18)),
+                ('source_id', models.UUIDField()),
+                ('source_no', models.CharField(blank=True, max_length=50, null=True)),
+                ('line_no', models.PositiveIntegerField(default=0)),
+                ('is_reversal', models.BooleanField(default=False)),
+                ('memo', models.CharField(blank=True, max_length=255, null=True)),
+                ('created', models.DateTimeField(auto_now_add=True)),
+                ('account', models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.PROTECT, related_name='ledger_entries', to='accounting.coa')),
+                ('branch', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.PROTECT, related_name='ledger_entries', to='master.branch')),
+                ('currency', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.PROTECT, related_name='ledger_entries', to='master.currency')),
+                ('source_type', models.ForeignKey(on_delete=django.db.models.deletion.PROTECT, related_name='+', to='contenttypes.contenttype')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['account', 'branch', 'entry_date'], name='accounting__account_7fac4f_idx')],
+                'constraints': [models.UniqueConstraint(fields=('source_type', 'source_id', 'is_reversal', 'line_no'), name='ledger_entry_unique_source_line')],
+            },
+        ),
+    ]
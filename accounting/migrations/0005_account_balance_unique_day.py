@@ -0,0 +1,20 @@
+# Generated by Django 5.2.18 on 2026-10-18 13:46
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounting', '0004_ledger_entry'),
+        ('master', '0001_initial'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddConstraint(
+            model_name='accountbalance',
+            constraint=models.UniqueConstraint(fields=('account', 'branch', 'as_of_date'), name='account_balance_unique_day'),
+        ),
+    ]
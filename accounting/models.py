@@ -4,6 +4,7 @@ from core.utils.coreModels import (
     BranchScopedStampedOwnedActive,
     TransactionBasedBranchScopedStampedOwnedActive,
 )
+from core.utils.TreeIndex import TreeIndexMixin
 from master.models import Currency, TaxRate
 from master.models import Branch  # optional, only if you need typing/IDE help
 
@@ -28,7 +29,7 @@ class AccountType(StampedOwnedActive):
         return self.name
 
 
-class COA(BranchScopedStampedOwnedActive):
+class COA(TreeIndexMixin, BranchScopedStampedOwnedActive):
     name = models.CharField(max_length=200)
     code = models.CharField(max_length=60, db_index=True)
     description = models.TextField(null=True, blank=True)
@@ -49,12 +50,28 @@ class COA(BranchScopedStampedOwnedActive):
 
 
 class AccountBalance(BranchScopedStampedOwnedActive):
+    """
+    Cumulative base-currency totals of an account in a branch at the end of
+    ``as_of_date`` (``balance`` is debit minus credit). There is a row for
+    every day with ledger movement, kept current by accounting.balances.
+    """
+
     account = models.ForeignKey(COA, on_delete=models.PROTECT, related_name="balances")
     as_of_date = models.DateField(db_index=True)
     debit_total = models.DecimalField(max_digits=18, decimal_places=2, default=0)
     credit_total = models.DecimalField(max_digits=18, decimal_places=2, default=0)
     balance = models.DecimalField(max_digits=18, decimal_places=2, default=0)
 
+    label_related = ("account",)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["account", "branch", "as_of_date"],
+                name="account_balance_unique_day",
+            ),
+        ]
+
     def __str__(self):
         return f"{self.account} @ {self.as_of_date}"
 
@@ -95,6 +112,11 @@ class CashTransfer(TransactionBasedBranchScopedStampedOwnedActive):
     total = models.DecimalField(max_digits=18, decimal_places=2, default=0)
     note = models.TextField(null=True, blank=True)
 
+    class Meta(TransactionBasedBranchScopedStampedOwnedActive.Meta):
+        indexes = TransactionBasedBranchScopedStampedOwnedActive.Meta.indexes + [
+            models.Index(fields=["branch", "transfer_date"]),
+        ]
+
     def __str__(self):
         return self.transfer_no or str(self.id)
 
@@ -134,6 +156,11 @@ class ChequeRegister(TransactionBasedBranchScopedStampedOwnedActive):
     total = models.DecimalField(max_digits=18, decimal_places=2, default=0)
     note = models.TextField(null=True, blank=True)
 
+    class Meta(TransactionBasedBranchScopedStampedOwnedActive.Meta):
+        indexes = TransactionBasedBranchScopedStampedOwnedActive.Meta.indexes + [
+            models.Index(fields=["branch", "cheque_date", "status"]),
+        ]
+
     def __str__(self):
         return self.cheque_no or str(self.id)
 
@@ -146,6 +173,11 @@ class JournalVoucher(TransactionBasedBranchScopedStampedOwnedActive):
     total = models.DecimalField(max_digits=18, decimal_places=2, default=0)
     note = models.TextField(null=True, blank=True)
 
+    class Meta(TransactionBasedBranchScopedStampedOwnedActive.Meta):
+        indexes = TransactionBasedBranchScopedStampedOwnedActive.Meta.indexes + [
+            models.Index(fields=["branch", "voucher_date"]),
+        ]
+
     def __str__(self):
         return self.voucher_no or str(self.id)
 
@@ -159,3 +191,49 @@ class JournalVoucherItem(models.Model):
     line_note = models.CharField(max_length=255, null=True, blank=True)
     created = models.DateTimeField(auto_now_add=True)
     updated = models.DateTimeField(auto_now=True)
+
+
+class LedgerEntry(models.Model):
+    """
+    One side of a posted double-entry line. Rows are written only by
+    accounting.posting from approved documents and are never edited: voiding a
+    document adds mirror rows with ``is_reversal`` set. ``dr``/``cr`` are in the
+    document currency, ``base_dr``/``base_cr`` in the base currency.
+    """
+
+    account = models.ForeignKey(COA, on_delete=models.PROTECT, related_name="ledger_entries", db_index=False)
+    branch = models.ForeignKey(Branch, on_delete=models.PROTECT, null=True, blank=True, related_name="ledger_entries")
+    entry_date = models.DateField()
+
+    dr = models.DecimalField(max_digits=18, decimal_places=2, default=0)
+    cr = models.DecimalField(max_digits=18, decimal_places=2, default=0)
+    currency = models.ForeignKey(Currency, on_delete=models.PROTECT, null=True, blank=True, related_name="ledger_entries")
+    exchange_rate = models.DecimalField(max_digits=18, decimal_places=6, default=1)
+    base_dr = models.DecimalField(max_digits=18, decimal_places=2, default=0)
+    base_cr = models.DecimalField(max_digits=18, decimal_places=2, default=0)
+
+    source_type = models.ForeignKey("contenttypes.ContentType", on_delete=models.PROTECT, related_name="+")
+    source_id = models.UUIDField()
+    source_no = models.CharField(max_length=50, null=True, blank=True)
+    line_no = models.PositiveIntegerField(default=0)
+    is_reversal = models.BooleanField(default=False)
+    memo = models.CharField(max_length=255, null=True, blank=True)
+
+    created = models.DateTimeField(auto_now_add=True)
+
+    label_related = ("account",)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["account", "branch", "entry_date"]),
+        ]
+        constraints = [
+            # Posting is idempotent: a document is posted, and reversed, at most once
+            models.UniqueConstraint(
+                fields=["source_type", "source_id", "is_reversal", "line_no"],
+                name="ledger_entry_unique_source_line",
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.account_id} {self.entry_date} Dr {self.dr} Cr {self.cr}"
@@ -0,0 +1,609 @@
+from collections import namedtuple
+from decimal import Decimal
+
+from django.apps import apps
+from django.conf import settings
+from django.contrib.contenttypes.models import ContentType
+from django.db import transaction
+from django.db.models import QuerySet
+from django.utils import timezone
+from rest_framework.exceptions import ValidationError
+
+from accounting.balances import apply_entries
+from accounting.models import COA, LedgerEntry
+
+CENT = Decimal("0.01")
+ZERO = Decimal("0")
+
+POSTED_MESSAGE = "Posted documents can only be voided."
+VOIDED_MESSAGE = "Voided documents that were posted cannot be changed."
+
+PostingLine = namedtuple("PostingLine", ["account_id", "dr", "cr", "memo"])
+
+
+class PostingError(Exception):
+    """A document cannot be turned into balanced ledger rows."""
+
+
+class PostingRule(object):
+    """
+    How one document model posts: its date and number fields, the relations
+    to load for a batch, and ``build(doc, accounts)`` returning PostingLines.
+    """
+
+    def __init__(self, model_label, date_field, number_field, build, select=(), prefetch=()):
+        self.model_label = model_label
+        self.date_field = date_field
+        self.number_field = number_field
+        self.build = build
+        self.select = select
+        self.prefetch = prefetch
+
+    @property
+    def model(self):
+        return apps.get_model(self.model_label)
+
+
+_rules = {}
+
+
+def posting_rule(model_label, date_field, number_field, select=(), prefetch=()):
+    def register(build):
+        _rules[model_label] = PostingRule(model_label, date_field, number_field, build, select, prefetch)
+        return build
+    return register
+
+
+def get_posting_rule(model):
+    return _rules.get(model._meta.label)
+
+
+class ControlAccounts(object):
+    """
+    Per-branch fallback accounts named in LEDGER_CONTROL_ACCOUNTS (role ->
+    COA code), loaded for a whole batch with one query.
+    """
+
+    def __init__(self, branch_ids):
+        self.codes = getattr(settings, "LEDGER_CONTROL_ACCOUNTS", {})
+        rows = COA.objects.filter(
+            branch_id__in=branch_ids, code__in=set(self.codes.values()), is_group=False
+        ).values_list("branch_id", "code", "pk")
+        self.by_code = {(branch_id, code): pk for branch_id, code, pk in rows}
+
+    def get(self, branch_id, role):
+        code = self.codes.get(role)
+        account_id = self.by_code.get((branch_id, code))
+        if account_id is None:
+            raise PostingError("No {} account (code {}) in the document's branch.".format(role, code))
+        return account_id
+
+
+# -------------------------
+# Document state
+# -------------------------
+def is_voided(doc):
+    return doc.voided_at is not None or getattr(doc, "status", None) == "void"
+
+
+def is_postable(doc):
+    return doc.approved and doc.active and not is_voided(doc)
+
+
+# -------------------------
+# Line helpers
+# -------------------------
+def _allocate(amount, weights):
+    """Split ``amount`` in cents in proportion to ``weights``; the last share takes the rounding."""
+    total = sum(weights, ZERO)
+    if not weights:
+        return []
+    amount = amount.quantize(CENT)
+    if not total:
+        return [ZERO] * (len(weights) - 1) + [amount]
+    shares = [(amount * weight / total).quantize(CENT) for weight in weights[:-1]]
+    return shares + [amount - sum(shares, ZERO)]
+
+
+def _trade_lines(doc, lines, line_account, accounts, default_role, party_account, debit_party):
+    """
+    Lines of an invoice, bill or note: the party account for grand_total
+    against the line accounts (net of tax, split by line_total) and tax.
+    """
+    # Work in cents, as stored, so the party line equals the sum of the others
+    grand_total = doc.grand_total.quantize(CENT)
+    tax_total = doc.tax_total.quantize(CENT)
+    net = grand_total - tax_total
+    lines = list(lines)
+    if lines:
+        account_ids = [line_account(line) or accounts.get(doc.branch_id, default_role) for line in lines]
+        shares = _allocate(net, [line.line_total for line in lines])
+    else:
+        account_ids = [accounts.get(doc.branch_id, default_role)]
+        shares = [net]
+
+    def side(account_id, amount, memo, debit):
+        return PostingLine(account_id, amount, ZERO, memo) if debit else PostingLine(account_id, ZERO, amount, memo)
+
+    out = [side(party_account, grand_total, None, debit_party)]
+    for account_id, amount, line in zip(account_ids, shares, lines or [None]):
+        memo = getattr(line, "product_name", None) or getattr(line, "description", None)
+        out.append(side(account_id, amount, memo, not debit_party))
+    if tax_total:
+        out.append(side(accounts.get(doc.branch_id, "tax"), tax_total, "Tax", not debit_party))
+    return out
+
+
+def _cash_account(doc, accounts):
+    if doc.bank_account_id is None:
+        return accounts.get(doc.branch_id, "cash")
+    if doc.bank_account.coa_account_id is None:
+        raise PostingError("Bank account {} has no ledger account.".format(doc.bank_account))
+    return doc.bank_account.coa_account_id
+
+
+def _contact_account(contact, field, accounts, branch_id, role):
+    if contact is not None and getattr(contact, field + "_id"):
+        return getattr(contact, field + "_id")
+    return accounts.get(branch_id, role)
+
+
+# -------------------------
+# Posting rules
+# -------------------------
+@posting_rule("accounting.JournalVoucher", "voucher_date", "voucher_no", prefetch=("items",))
+def _journal_voucher(doc, accounts):
+    return [PostingLine(i.account_id, i.dr_amount, i.cr_amount, i.line_note) for i in doc.items.all()]
+
+
+@posting_rule(
+    "accounting.CashTransfer", "transfer_date", "transfer_no",
+    select=("from_account",), prefetch=("items__to_account",),
+)
+def _cash_transfer(doc, accounts):
+    out = []
+    for item in doc.items.all():
+        if item.to_account.coa_account_id is None:
+            raise PostingError("Bank account {} has no ledger account.".format(item.to_account))
+        out.append(PostingLine(item.to_account.coa_account_id, item.amount.quantize(CENT), ZERO, item.note))
+    if doc.from_account.coa_account_id is None:
+        raise PostingError("Bank account {} has no ledger account.".format(doc.from_account))
+    out.append(PostingLine(doc.from_account.coa_account_id, ZERO, sum((i.dr for i in out), ZERO), None))
+    return out
+
+
+@posting_rule("sales.Invoice", "invoice_date", "invoice_no", select=("customer",), prefetch=("items__product",))
+def _invoice(doc, accounts):
+    party = _contact_account(doc.customer, "receivable_account", accounts, doc.branch_id, "receivable")
+    return _trade_lines(
+        doc, doc.items.all(), lambda line: line.product and line.product.sales_account_id,
+        accounts, "sales", party, debit_party=True,
+    )
+
+
+@posting_rule("sales.CreditNote", "credit_note_date", "credit_note_no", select=("customer",), prefetch=("lines__product",))
+def _credit_note(doc, accounts):
+    party = _contact_account(doc.customer, "receivable_account", accounts, doc.branch_id, "receivable")
+    return _trade_lines(
+        doc, doc.lines.all(), lambda line: line.product and line.product.sales_account_id,
+        accounts, "sales", party, debit_party=False,
+    )
+
+
+@posting_rule("sales.CustomerPayment", "payment_date", "payment_no", select=("customer", "bank_account"))
+def _customer_payment(doc, accounts):
+    party = _contact_account(doc.customer, "receivable_account", accounts, doc.branch_id, "receivable")
+    return [
+        PostingLine(_cash_account(doc, accounts), doc.amount, ZERO, doc.reference),
+        PostingLine(party, ZERO, doc.amount, doc.reference),
+    ]
+
+
+@posting_rule("purchase.PurchaseBill", "bill_date", "bill_no", select=("supplier",), prefetch=("lines__product",))
+def _purchase_bill(doc, accounts):
+    party = _contact_account(doc.supplier, "payable_account", accounts, doc.branch_id, "payable")
+    return _trade_lines(
+        doc, doc.lines.all(), lambda line: line.product and line.product.purchase_account_id,
+        accounts, "purchase", party, debit_party=False,
+    )
+
+
+@posting_rule("purchase.DebitNote", "debit_note_date", "debit_note_no", select=("supplier",), prefetch=("lines__product",))
+def _debit_note(doc, accounts):
+    party = _contact_account(doc.supplier, "payable_account", accounts, doc.branch_id, "payable")
+    return _trade_lines(
+        doc, doc.lines.all(),
+        lambda line: line.product and (line.product.purchase_return_account_id or line.product.purchase_account_id),
+        accounts, "purchase", party, debit_party=True,
+    )
+
+
+@posting_rule("purchase.SupplierPayment", "payment_date", "payment_no", select=("supplier", "bank_account"))
+def _supplier_payment(doc, accounts):
+    party = _contact_account(doc.supplier, "payable_account", accounts, doc.branch_id, "payable")
+    return [
+        PostingLine(party, doc.amount, ZERO, doc.reference),
+        PostingLine(_cash_account(doc, accounts), ZERO, doc.amount, doc.reference),
+    ]
+
+
+@posting_rule("purchase.Expense", "expense_date", "expense_no", select=("supplier",))
+def _expense(doc, accounts):
+    expense_account = doc.expense_account_id or accounts.get(doc.branch_id, "expense")
+    if doc.supplier_id is not None:
+        credit = _contact_account(doc.supplier, "payable_account", accounts, doc.branch_id, "payable")
+    else:
+        credit = accounts.get(doc.branch_id, "cash")
+    return [
+        PostingLine(expense_account, doc.grand_total, ZERO, doc.description),
+        PostingLine(credit, ZERO, doc.grand_total, doc.description),
+    ]
+
+
+# -------------------------
+# Entry building
+# -------------------------
+def _base(amount, rate):
+    return (amount * rate).quantize(CENT)
+
+
+def build_entries(rule, doc, accounts, source_type):
+    """
+    Unsaved LedgerEntry rows for ``doc``; raises PostingError unless they
+    balance. Amounts are rounded to cents first, as LedgerEntry stores
+    them, so what is checked here is what gets written.
+    """
+    lines = [
+        line._replace(dr=line.dr.quantize(CENT), cr=line.cr.quantize(CENT))
+        for line in rule.build(doc, accounts)
+    ]
+    lines = [line for line in lines if line.dr or line.cr]
+    if not lines:
+        raise PostingError("Document has nothing to post.")
+    if any(line.account_id is None for line in lines):
+        raise PostingError("Every line needs a ledger account.")
+    total_dr = sum((line.dr for line in lines), ZERO)
+    total_cr = sum((line.cr for line in lines), ZERO)
+    if total_dr != total_cr:
+        raise PostingError("Debits ({}) and credits ({}) do not balance.".format(total_dr, total_cr))
+
+    rate = doc.exchange_rate or Decimal("1")
+    currency_id = getattr(doc, "currency_id", None)
+    entry_date = getattr(doc, rule.date_field)
+    entries = [
+        LedgerEntry(
+            account_id=line.account_id,
+            branch_id=doc.branch_id,
+            entry_date=entry_date,
+            dr=line.dr,
+            cr=line.cr,
+            currency_id=currency_id,
+            exchange_rate=rate,
+            base_dr=_base(line.dr, rate),
+            base_cr=_base(line.cr, rate),
+            source_type=source_type,
+            source_id=doc.pk,
+            source_no=getattr(doc, rule.number_field),
+            line_no=line_no,
+            memo=(line.memo or "")[:255] or None,
+        )
+        for line_no, line in enumerate(lines)
+    ]
+
+    # Per-line rounding can leave the base amounts a cent or two apart
+    drift = sum((e.base_dr for e in entries), ZERO) - sum((e.base_cr for e in entries), ZERO)
+    if drift:
+        largest = max(entries, key=lambda e: e.base_dr + e.base_cr)
+        if largest.base_dr:
+            largest.base_dr -= drift
+        else:
+            largest.base_cr += drift
+    return entries
+
+
+def _reversal(entry, entry_date):
+    return LedgerEntry(
+        account_id=entry.account_id,
+        branch_id=entry.branch_id,
+        entry_date=entry_date,
+        dr=entry.cr,
+        cr=entry.dr,
+        currency_id=entry.currency_id,
+        exchange_rate=entry.exchange_rate,
+        base_dr=entry.base_cr,
+        base_cr=entry.base_dr,
+        source_type_id=entry.source_type_id,
+        source_id=entry.source_id,
+        source_no=entry.source_no,
+        line_no=entry.line_no,
+        is_reversal=True,
+        memo=entry.memo,
+    )
+
+
+# -------------------------
+# Posting
+# -------------------------
+class PostingResult(object):
+    def __init__(self):
+        self.posted = 0
+        self.reversed = 0
+        self.entries = 0
+        self.errors = []
+
+    def as_dict(self):
+        return {
+            "posted": self.posted,
+            "reversed": self.reversed,
+            "entries": self.entries,
+            "errors": [{"id": str(pk), "error": message} for pk, message in self.errors],
+        }
+
+
+def _get_batch_size():
+    return getattr(settings, "BULK_PERSISTENCE", {}).get("BATCH_SIZE")
+
+
+def _load_batch(rule, pks):
+    docs = list(
+        rule.model.objects.filter(pk__in=pks)
+        .select_related(*rule.select)
+        .prefetch_related(*rule.prefetch)
+    )
+    return docs, ControlAccounts({doc.branch_id for doc in docs})
+
+
+def _post_batch(rule, pks, source_type, strict, result):
+    model = rule.model
+    docs, accounts = _load_batch(rule, pks)
+
+    entries = []
+    for doc in docs:
+        try:
+            entries.extend(build_entries(rule, doc, accounts, source_type))
+        except PostingError as exc:
+            if strict:
+                raise PostingError("{} {}: {}".format(model._meta.verbose_name, doc, exc))
+            result.errors.append((doc.pk, str(exc)))
+            continue
+        result.posted += 1
+
+    LedgerEntry.objects.bulk_create(entries, batch_size=_get_batch_size())
+    apply_entries(entries)
+    result.entries += len(entries)
+
+
+# What a posted row must keep for its document to count as unchanged
+_ENTRY_KEY = (
+    "line_no", "account_id", "branch_id", "entry_date", "currency_id",
+    "dr", "cr", "base_dr", "base_cr", "source_no",
+)
+
+
+def _entry_key(entry):
+    return tuple(getattr(entry, name) for name in _ENTRY_KEY)
+
+
+def _check_batch(rule, pks, source_type, strict, result, message=POSTED_MESSAGE):
+    """Reject posted documents whose ledger rows no longer match what they would post now."""
+    stored = {}
+    rows = LedgerEntry.objects.filter(
+        source_type=source_type, source_id__in=pks, is_reversal=False
+    ).values_list("source_id", *_ENTRY_KEY)
+    for source_id, *key in rows:
+        stored.setdefault(source_id, []).append(tuple(key))
+
+    docs, accounts = _load_batch(rule, pks)
+    for doc in docs:
+        try:
+            current = sorted(_entry_key(entry) for entry in build_entries(rule, doc, accounts, source_type))
+        except PostingError:
+            current = None
+        if current != sorted(stored.get(doc.pk, [])):
+            _reject_posted_edit(rule.model, doc, strict, result, message)
+
+
+def _reject_posted_edit(model, doc, strict, result, message=POSTED_MESSAGE):
+    if strict:
+        raise PostingError("{} {}: {}".format(model._meta.verbose_name, doc, message))
+    result.errors.append((doc.pk, message))
+
+
+def _reverse_batch(pks, source_type, voided_on, result):
+    originals = LedgerEntry.objects.filter(source_type=source_type, source_id__in=pks, is_reversal=False)
+    entries = [_reversal(entry, voided_on.get(entry.source_id)) for entry in originals]
+    LedgerEntry.objects.bulk_create(entries, batch_size=_get_batch_size())
+    apply_entries(entries)
+    result.reversed += len(pks)
+    result.entries += len(entries)
+
+
+def sync_documents(model, docs, strict=True, result=None, check_posted=False):
+    """
+    Bring the ledger in line with ``docs`` (instances of one registered
+    model): approved documents not yet posted are posted, posted documents
+    that were voided get reversing rows, everything else is left alone, so
+    calling this again is a no-op. Lines are loaded for the whole batch at
+    once, rows are written with bulk_create and the AccountBalance
+    snapshots are updated in the same transaction.
+
+    A posted document can only be voided, and once reversed it stays
+    voided. Un-approving a posted document or un-voiding a reversed one is
+    always an error; with ``check_posted`` (set after an edit) a posted
+    document, voided or not, is also rebuilt and rejected when its rows
+    would differ from the stored ones, so amounts, lines, accounts and
+    dates stay as they were posted.
+
+    With ``strict`` the first PostingError aborts; otherwise failures are
+    collected on the returned PostingResult and the rest still post.
+    """
+    rule = get_posting_rule(model)
+    result = result if result is not None else PostingResult()
+    docs = [doc for doc in docs if doc is not None]
+    if rule is None or not docs:
+        return result
+
+    source_type = ContentType.objects.get_for_model(model)
+    state = set(
+        LedgerEntry.objects
+        .filter(source_type=source_type, source_id__in=[doc.pk for doc in docs])
+        .values_list("source_id", "is_reversal")
+        .distinct()
+    )
+
+    to_post = []
+    to_reverse = {}
+    to_check = []
+    to_check_voided = []
+    for doc in docs:
+        posted = (doc.pk, False) in state
+        reversed_ = (doc.pk, True) in state
+        if not posted:
+            if is_postable(doc):
+                to_post.append(doc.pk)
+        elif reversed_:
+            # Voided for good: its rows net to zero and cannot post again
+            if not is_voided(doc):
+                _reject_posted_edit(model, doc, strict, result, VOIDED_MESSAGE)
+            elif check_posted:
+                to_check_voided.append(doc.pk)
+        elif is_voided(doc):
+            to_reverse[doc.pk] = timezone.localdate(doc.voided_at) if doc.voided_at else timezone.localdate()
+            if check_posted:
+                # Voiding reverses the rows as posted, so it may change nothing else
+                to_check.append(doc.pk)
+        elif not is_postable(doc):
+            _reject_posted_edit(model, doc, strict, result)
+        elif check_posted:
+            to_check.append(doc.pk)
+
+    with transaction.atomic():
+        if to_check:
+            _check_batch(rule, to_check, source_type, strict, result)
+        if to_check_voided:
+            _check_batch(rule, to_check_voided, source_type, strict, result, VOIDED_MESSAGE)
+        if to_post:
+            _post_batch(rule, to_post, source_type, strict, result)
+        if to_reverse:
+            _reverse_batch(list(to_reverse), source_type, to_reverse, result)
+    return result
+
+
+def sync_queryset(queryset, batch_size=500, strict=False):
+    """Run sync_documents over a queryset in batches, e.g. to post a backlog."""
+    result = PostingResult()
+    batch = []
+    for doc in queryset.order_by("pk").iterator(chunk_size=batch_size):
+        batch.append(doc)
+        if len(batch) >= batch_size:
+            sync_documents(queryset.model, batch, strict=strict, result=result)
+            batch = []
+    if batch:
+        sync_documents(queryset.model, batch, strict=strict, result=result)
+    return result
+
+
+def posting_models():
+    return [rule.model for rule in _rules.values()]
+
+
+def _sync_or_reject(model, docs):
+    try:
+        sync_documents(model, docs, check_posted=True)
+    except PostingError as exc:
+        raise ValidationError({"ledger": [str(exc)]})
+
+
+class LedgerPostingMixin(object):
+    """
+    ViewSet mixin for document endpoints: whatever a create or update saves
+    (one document or a bulk list) is synced to the ledger inside the same
+    transaction, so approving posts and voiding reverses. A document that
+    cannot post, an edit that would change a posted one's ledger rows, or
+    deleting a posted one is rejected with a 400.
+    """
+
+    def sync_ledger(self, serializer):
+        instance = serializer.instance
+        docs = instance if isinstance(instance, (list, tuple)) else [instance]
+        _sync_or_reject(self.serializer_class.Meta.model, docs)
+
+    def perform_create(self, serializer):
+        with transaction.atomic():
+            super().perform_create(serializer)
+            self.sync_ledger(serializer)
+
+    def perform_update(self, serializer):
+        with transaction.atomic():
+            super().perform_update(serializer)
+            self.sync_ledger(serializer)
+
+    def _check_unposted(self, pks):
+        source_type = ContentType.objects.get_for_model(self.serializer_class.Meta.model)
+        if LedgerEntry.objects.filter(source_type=source_type, source_id__in=pks).exists():
+            raise ValidationError({"ledger": [POSTED_MESSAGE]})
+
+    def perform_destroy(self, instance):
+        self._check_unposted([instance.pk])
+        super().perform_destroy(instance)
+
+    def perform_bulk_destroy(self, objects):
+        self._check_unposted(objects.values("pk"))
+        super().perform_bulk_destroy(objects)
+
+
+class LedgerLineMixin(object):
+    """
+    ViewSet mixin for the line endpoints of posting documents
+    (``invoice-items`` ...). ``ledger_document_field`` names the FK to the
+    document. Writes and deletes re-check the documents they touch, before
+    and after, in one transaction, so lines of a posted document can only
+    change in ways that leave its ledger rows as they are.
+    """
+
+    ledger_document_field = None
+
+    def _document_field(self):
+        return self.serializer_class.Meta.model._meta.get_field(self.ledger_document_field)
+
+    def _document_ids(self, lines):
+        attname = self._document_field().attname
+        return {getattr(line, attname) for line in lines}
+
+    def _check_documents(self, document_ids):
+        document_ids = {pk for pk in document_ids if pk is not None}
+        if document_ids:
+            model = self._document_field().related_model
+            _sync_or_reject(model, model.objects.filter(pk__in=document_ids))
+
+    def _lines(self, serializer):
+        instance = serializer.instance
+        if isinstance(instance, QuerySet):
+            # A bulk update validates against the whole list queryset; its
+            # targets are the rows the list serializer already matched
+            return list((getattr(serializer, "_instance_map", None) or {}).values())
+        return instance if isinstance(instance, (list, tuple)) else [instance]
+
+    def perform_create(self, serializer):
+        with transaction.atomic():
+            super().perform_create(serializer)
+            self._check_documents(self._document_ids(self._lines(serializer)))
+
+    def perform_update(self, serializer):
+        # A line moved to another document changes both of them
+        before = self._document_ids(self._lines(serializer))
+        with transaction.atomic():
+            super().perform_update(serializer)
+            self._check_documents(before | self._document_ids(self._lines(serializer)))
+
+    def perform_destroy(self, instance):
+        document_ids = self._document_ids([instance])
+        with transaction.atomic():
+            super().perform_destroy(instance)
+            self._check_documents(document_ids)
+
+    def perform_bulk_destroy(self, objects):
+        document_ids = set(objects.values_list(self._document_field().attname, flat=True))
+        with transaction.atomic():
+            super().perform_bulk_destroy(objects)
+            self._check_documents(document_ids)
@@ -0,0 +1,196 @@
+import datetime
+from decimal import Decimal
+
+from django.db.models import DecimalField, F, Q, RowRange, Sum, Window
+from django.db.models.functions import RowNumber
+
+from accounting.models import COA, AccountBalance, LedgerEntry
+
+CENT = Decimal("0.01")
+ZERO = Decimal("0")
+
+
+def latest_balances(as_of_date, branch_id=None, account_ids=None):
+    """
+    {account_id: (debit_total, credit_total)} at the end of ``as_of_date``,
+    summed over branches. One query: the newest snapshot on or before the
+    date per (account, branch), picked with ROW_NUMBER() in the database.
+    """
+    snapshots = AccountBalance.objects.filter(as_of_date__lte=as_of_date)
+    if branch_id is not None:
+        snapshots = snapshots.filter(branch_id=branch_id)
+    if account_ids is not None:
+        snapshots = snapshots.filter(account_id__in=account_ids)
+    rows = (
+        snapshots
+        .annotate(rank=Window(
+            RowNumber(),
+            partition_by=[F("account_id"), F("branch_id")],
+            order_by=F("as_of_date").desc(),
+        ))
+        .filter(rank=1)
+        .values_list("account_id", "debit_total", "credit_total")
+    )
+
+    totals = {}
+    for account_id, debit, credit in rows:
+        current = totals.get(account_id, (ZERO, ZERO))
+        totals[account_id] = (current[0] + debit, current[1] + credit)
+    return totals
+
+
+def money(value):
+    """Amount as the API renders money: a decimal string in cents, e.g. "113.00"."""
+    return str(value.quantize(CENT))
+
+
+def _split(balance):
+    """Trial balance columns for a net balance (debit minus credit)."""
+    return (balance, ZERO) if balance >= 0 else (ZERO, -balance)
+
+
+def trial_balance(as_of_date, branch_id=None, include_zero=False):
+    """
+    Trial balance at the end of ``as_of_date`` for one branch, or all of
+    them. Leaf totals come from latest_balances(). The chart is loaded with
+    one more query and folded bottom-up in memory, so every group account
+    carries the totals of its whole subtree. Rows come back in tree order,
+    with amounts as money() strings.
+    """
+    own = latest_balances(as_of_date, branch_id)
+
+    accounts = COA.objects.all()
+    if branch_id is not None:
+        accounts = accounts.filter(Q(branch_id=branch_id) | Q(pk__in=list(own)))
+    nodes = {
+        row["id"]: dict(row, children=[])
+        for row in accounts.values(
+            "id", "code", "name", "parent_id", "is_group", "account_type__category"
+        )
+    }
+
+    roots = []
+    for node in nodes.values():
+        parent = nodes.get(node["parent_id"])
+        (parent["children"] if parent else roots).append(node)
+
+    # Preorder walk: parents before children, children sorted by code
+    order = []
+    stack = sorted(roots, key=lambda node: node["code"], reverse=True)
+    while stack:
+        node = stack.pop()
+        node["level"] = nodes[node["parent_id"]]["level"] + 1 if node["parent_id"] in nodes else 0
+        order.append(node)
+        stack.extend(sorted(node["children"], key=lambda child: child["code"], reverse=True))
+
+    # Reverse preorder visits every child before its parent
+    for node in reversed(order):
+        debit, credit = own.get(node["id"], (ZERO, ZERO))
+        for child in node["children"]:
+            debit += child["debit_total"]
+            credit += child["credit_total"]
+        node["debit_total"], node["credit_total"] = debit, credit
+
+    rows = []
+    for node in order:
+        if not include_zero and not node["debit_total"] and not node["credit_total"]:
+            continue
+        balance = node["debit_total"] - node["credit_total"]
+        debit, credit = _split(balance)
+        rows.append({
+            "id": node["id"],
+            "code": node["code"],
+            "name": node["name"],
+            "parent": node["parent_id"],
+            "is_group": node["is_group"],
+            "category": node["account_type__category"],
+            "level": node["level"],
+            "debit_total": money(node["debit_total"]),
+            "credit_total": money(node["credit_total"]),
+            "balance": money(balance),
+            "debit": money(debit),
+            "credit": money(credit),
+        })
+
+    columns = [_split(debit - credit) for debit, credit in own.values()]
+    return {
+        "as_of": as_of_date,
+        "branch": branch_id,
+        "total_debit": money(sum((debit for debit, _ in columns), ZERO)),
+        "total_credit": money(sum((credit for _, credit in columns), ZERO)),
+        "accounts": rows,
+    }
+
+
+def opening_balance(account_id, date_from, branch_id=None):
+    """Net balance (debit minus credit) at the start of ``date_from``, from the snapshots."""
+    if date_from is None:
+        return ZERO
+    debit, credit = latest_balances(
+        date_from - datetime.timedelta(days=1), branch_id, [account_id]
+    ).get(account_id, (ZERO, ZERO))
+    return debit - credit
+
+
+STATEMENT_FIELDS = (
+    "id",
+    "entry_date",
+    "source_type__model",
+    "source_id",
+    "source_no",
+    "memo",
+    "is_reversal",
+    "base_dr",
+    "base_cr",
+)
+
+
+def statement_queryset(account_id, date_from=None, date_to=None, branch_id=None, after=None):
+    """
+    Ledger movements of one account in (entry_date, id) order, as dicts
+    with ``running``: SUM(base_dr - base_cr) OVER (ORDER BY entry_date, id),
+    computed in the database. ``after`` = (entry_date, id) continues past a
+    keyset cursor; the running total then restarts there, so callers add the
+    balance carried by the cursor (see statement_row()).
+    """
+    entries = LedgerEntry.objects.filter(account_id=account_id)
+    if branch_id is not None:
+        entries = entries.filter(branch_id=branch_id)
+    if date_from is not None:
+        entries = entries.filter(entry_date__gte=date_from)
+    if date_to is not None:
+        entries = entries.filter(entry_date__lte=date_to)
+    if after is not None:
+        day, pk = after
+        entries = entries.filter(entry_date__gte=day).filter(Q(entry_date__gt=day) | Q(pk__gt=pk))
+
+    money = DecimalField(max_digits=18, decimal_places=2)
+    return (
+        entries
+        .order_by("entry_date", "id")
+        .annotate(running=Window(
+            Sum(F("base_dr") - F("base_cr"), output_field=money),
+            order_by=[F("entry_date").asc(), F("id").asc()],
+            frame=RowRange(start=None, end=0),
+        ))
+        .values(*STATEMENT_FIELDS, "running")
+    )
+
+
+def statement_row(row, start_balance):
+    """
+    API shape of a statement_queryset() row, amounts as money() strings;
+    ``start_balance`` is the balance before the first row.
+    """
+    return {
+        "id": row["id"],
+        "entry_date": row["entry_date"],
+        "source_type": row["source_type__model"],
+        "source_id": row["source_id"],
+        "source_no": row["source_no"],
+        "memo": row["memo"],
+        "is_reversal": row["is_reversal"],
+        "debit": money(row["base_dr"]),
+        "credit": money(row["base_cr"]),
+        "balance": money(start_balance + row["running"]),
+    }
@@ -1,4 +1,3 @@
-import uuid
 from rest_framework import serializers
 from .models import (
     AccountType,
@@ -10,33 +9,13 @@ from .models import (
     ChequeRegister,
     JournalVoucher,
     JournalVoucherItem,
+    LedgerEntry,
 )
 
 
 from core.utils.AdaptedBulkListSerializer import BulkModelSerializer
-
-
-class ReadablePKField(serializers.PrimaryKeyRelatedField):
-    """
-    Shows readable string in response while still being PK-based.
-    """
-
-    def __init__(self, *args, **kwargs):
-        self._placeholder_queryset = object()
-        if kwargs.get("queryset") is None and not kwargs.get("read_only", False):
-            kwargs["queryset"] = self._placeholder_queryset
-        super().__init__(*args, **kwargs)
-
-    def get_queryset(self):
-        queryset = self.queryset
-        if queryset is self._placeholder_queryset:
-            return None
-        if hasattr(queryset, "all"):
-            return queryset.all()
-        return queryset
-
-    def to_representation(self, value):
-        return {"id": str(value.pk), "label": str(value)}
+from core.utils.NestedDocumentSerializer import NestedDocumentSerializerMixin
+from core.utils.ReadablePKField import ReadablePKField
 
 
 # -------------------------
@@ -69,14 +48,10 @@ class AccountBalanceSerializer(BulkModelSerializer):
 
 
 class BankAccountSerializer(BulkModelSerializer):
-    currency = ReadablePKField(queryset=None, required=False, allow_null=True)  # set in __init__
+    currency = ReadablePKField(queryset=None, required=False, allow_null=True)
     coa_account = ReadablePKField(queryset=COA.objects.all(), required=False, allow_null=True)
 
-    def __init__(self, *args, **kwargs):
-        super().__init__(*args, **kwargs)
-        # avoid circular imports; Currency is in master app
-        from master.models import Currency
-        self.fields["currency"].queryset = Currency.objects.all()
+    lazy_querysets = {"currency": "master.Currency"}
 
     class Meta:
         model = BankAccount
@@ -105,58 +80,18 @@ class CashTransferItemSerializer(BulkModelSerializer):
         return attrs
 
 
-class CashTransferSerializer(BulkModelSerializer):
+class CashTransferSerializer(NestedDocumentSerializerMixin, BulkModelSerializer):
     from_account = ReadablePKField(queryset=BankAccount.objects.all())
     items = CashTransferItemSerializer(many=True, required=False)
+    line_field = "items"
 
     class Meta:
         model = CashTransfer
         fields = "__all__"
         read_only_fields = ("id", "created", "updated", "user_add", "history", "is_system_generated")
 
-    def _ensure_item_uuid(self, item):
-        # Your model has id UUIDField(primary_key=True, editable=False) with no default.
-        # So we generate here if missing.
-        if not item.get("id"):
-            item["id"] = uuid.uuid4()
-        return item
-
-    def create(self, validated_data):
-        items_data = validated_data.pop("items", [])
-        obj = CashTransfer.objects.create(**validated_data)
-
-        total = 0
-        for item in items_data:
-            item = self._ensure_item_uuid(item)
-            CashTransferItem.objects.create(cash_transfer=obj, **item)
-            total += item.get("amount") or 0
-
-        # set total (optional but useful)
-        obj.total = total
-        obj.save(update_fields=["total"])
-        return obj
-
-    def update(self, instance, validated_data):
-        items_data = validated_data.pop("items", None)
-
-        for k, v in validated_data.items():
-            setattr(instance, k, v)
-        instance.save()
-
-        if items_data is not None:
-            # Replace strategy (simple & reliable):
-            instance.items.all().delete()
-
-            total = 0
-            for item in items_data:
-                item = self._ensure_item_uuid(item)
-                CashTransferItem.objects.create(cash_transfer=instance, **item)
-                total += item.get("amount") or 0
-
-            instance.total = total
-            instance.save(update_fields=["total"])
-
-        return instance
+    def compute_header_totals(self, lines_data):
+        return {"total": sum((item.get("amount") or 0) for item in lines_data)}
 
 
 # -------------------------
@@ -168,10 +103,7 @@ class ChequeRegisterSerializer(BulkModelSerializer):
 
     contact = ReadablePKField(queryset=None, required=False, allow_null=True)  # crm.Contact
 
-    def __init__(self, *args, **kwargs):
-        super().__init__(*args, **kwargs)
-        from crm.models import Contact
-        self.fields["contact"].queryset = Contact.objects.all()
+    lazy_querysets = {"contact": "crm.Contact"}
 
     class Meta:
         model = ChequeRegister
@@ -203,50 +135,30 @@ class JournalVoucherItemSerializer(BulkModelSerializer):
         return attrs
 
 
-class JournalVoucherSerializer(BulkModelSerializer):
+class JournalVoucherSerializer(NestedDocumentSerializerMixin, BulkModelSerializer):
     items = JournalVoucherItemSerializer(many=True, required=False)
+    line_field = "items"
 
     class Meta:
         model = JournalVoucher
         fields = "__all__"
         read_only_fields = ("id", "created", "updated", "user_add", "history", "is_system_generated")
 
-    def _ensure_item_uuid(self, item):
-        if not item.get("id"):
-            item["id"] = uuid.uuid4()
-        return item
-
-    def create(self, validated_data):
-        items_data = validated_data.pop("items", [])
-        obj = JournalVoucher.objects.create(**validated_data)
-
-        total = 0
-        for item in items_data:
-            item = self._ensure_item_uuid(item)
-            JournalVoucherItem.objects.create(journal_voucher=obj, **item)
-            total += (item.get("dr_amount") or 0) + (item.get("cr_amount") or 0)
-
-        obj.total = total
-        obj.save(update_fields=["total"])
-        return obj
-
-    def update(self, instance, validated_data):
-        items_data = validated_data.pop("items", None)
-
-        for k, v in validated_data.items():
-            setattr(instance, k, v)
-        instance.save()
+    def compute_header_totals(self, lines_data):
+        return {
+            "total": sum(
+                (item.get("dr_amount") or 0) + (item.get("cr_amount") or 0) for item in lines_data
+            )
+        }
 
-        if items_data is not None:
-            instance.items.all().delete()
 
-            total = 0
-            for item in items_data:
-                item = self._ensure_item_uuid(item)
-                JournalVoucherItem.objects.create(journal_voucher=instance, **item)
-                total += (item.get("dr_amount") or 0) + (item.get("cr_amount") or 0)
-
-            instance.total = total
-            instance.save(update_fields=["total"])
+# -------------------------
+# Ledger
+# -------------------------
+class LedgerEntrySerializer(BulkModelSerializer):
+    account = ReadablePKField(queryset=COA.objects.all())
 
-        return instance
+    class Meta:
+        model = LedgerEntry
+        fields = "__all__"
+        read_only_fields = tuple(f.name for f in LedgerEntry._meta.concrete_fields)
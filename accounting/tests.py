@@ -1,3 +1,110 @@
+import datetime
+from decimal import Decimal
+from unittest import mock
+
+from django.contrib.auth import get_user_model
 from django.test import TestCase
+from rest_framework.test import APITestCase
+
+from accounting.balances import apply_entries
+from accounting.models import COA, AccountBalance, LedgerEntry
+from core.seeders.seed_default import seed_branch_chart_of_accounts
+from crm.models import Contact
+from master.models import Branch
+
+
+class PostedDocumentEditTests(APITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.branch = Branch.objects.create(code="T-HQ", name="Test Head Office", is_head_office=True)
+        seed_branch_chart_of_accounts(cls.branch)
+        cls.user = get_user_model().objects.create_user(
+            username="head", email="head@example.com", password="x", branch=cls.branch
+        )
+        cls.customer = Contact.objects.create(type="customer", name="Customer", branch=cls.branch)
+
+    def setUp(self):
+        self.client.force_authenticate(self.user)
+        response = self.client.post("/api/sales/invoices/", {
+            "invoice_date": "2026-01-06",
+            "customer": str(self.customer.pk),
+            "approved": True,
+            "grand_total": "113.00",
+            "tax_total": "13.00",
+            "items": [{"product_name": "Item", "line_total": "100.00"}],
+        }, format="json")
+        self.assertEqual(response.status_code, 201, response.data)
+        self.url = "/api/sales/invoices/{}/".format(response.data["id"])
+        self.invoice_id = response.data["id"]
+
+    def entries(self, **filters):
+        return LedgerEntry.objects.filter(source_id=self.invoice_id, **filters)
+
+    def test_amount_edit_of_posted_document_is_rejected(self):
+        response = self.client.patch(self.url, {"grand_total": "500.00"}, format="json")
+
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(sorted(self.entries().values_list("dr", flat=True)), [0, 0, 113])
+
+    def test_voided_document_cannot_be_unvoided_or_edited(self):
+        voided = self.client.patch(self.url, {"status": "void", "voided_at": "2026-02-01T10:00:00Z"}, format="json")
+        self.assertEqual(voided.status_code, 200)
+        self.assertEqual(self.entries(is_reversal=True).count(), 3)
+
+        unvoided = self.client.patch(self.url, {"status": "posted", "voided_at": None}, format="json")
+        edited = self.client.patch(self.url, {"grand_total": "500.00"}, format="json")
+        noted = self.client.patch(self.url, {"note": "Archived"}, format="json")
+
+        self.assertEqual(unvoided.status_code, 400)
+        self.assertEqual(edited.status_code, 400)
+        self.assertEqual(noted.status_code, 200)
+        self.assertEqual(self.entries().count(), 6)
+
+
+class ApplyEntriesTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.branch = Branch.objects.create(code="T-HQ", name="Test Head Office", is_head_office=True)
+        seed_branch_chart_of_accounts(cls.branch)
+        cls.cash = COA.objects.get(branch=cls.branch, code="1110")
+
+    def test_day_snapshot_inserted_concurrently_is_incremented(self):
+        day = datetime.date(2026, 5, 1)
+        entry = LedgerEntry(account=self.cash, branch=self.branch, entry_date=day, base_dr=Decimal("10"), base_cr=0)
+        bulk_create = AccountBalance.objects.bulk_create
+
+        def concurrent_insert(rows, **kwargs):
+            # Another posting created the day's snapshot after apply_entries() looked
+            AccountBalance.objects.create(
+                account=self.cash, branch=self.branch, as_of_date=day,
+                debit_total=Decimal("5"), credit_total=0, balance=Decimal("5"),
+            )
+            return bulk_create(rows, **kwargs)
+
+        with mock.patch.object(AccountBalance.objects, "bulk_create", side_effect=concurrent_insert):
+            apply_entries([entry])
+
+        snapshot = AccountBalance.objects.get(account=self.cash, branch=self.branch, as_of_date=day)
+        self.assertEqual((snapshot.debit_total, snapshot.balance), (Decimal("15"), Decimal("15")))
+
+
+class AccountStatementScopeTests(APITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.branch = Branch.objects.create(code="T-B1", name="Test Branch 1")
+        cls.other = Branch.objects.create(code="T-B2", name="Test Branch 2")
+        seed_branch_chart_of_accounts(cls.branch)
+        seed_branch_chart_of_accounts(cls.other)
+        cls.user = get_user_model().objects.create_user(
+            username="branch", email="branch@example.com", password="x", branch=cls.branch
+        )
+
+    def statement(self, branch):
+        account = COA.objects.get(branch=branch, code="1110")
+        return self.client.get("/api/accounting/reports/account-statement/?account={}".format(account.pk))
+
+    def test_branch_user_cannot_read_other_branch_account(self):
+        self.client.force_authenticate(self.user)
 
-# Create your tests here.
+        self.assertEqual(self.statement(self.branch).status_code, 200)
+        self.assertEqual(self.statement(self.other).status_code, 404)
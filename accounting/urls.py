@@ -8,6 +8,9 @@ from .views import (
     CashTransferViewSet,
     ChequeRegisterViewSet,
     JournalVoucherViewSet,
+    LedgerEntryViewSet,
+    TrialBalanceView,
+    AccountStatementView,
 )
 
 router = BulkRouter()
@@ -18,7 +21,10 @@ router.register(r"bank-accounts", BankAccountViewSet, basename="bank-account")
 router.register(r"cash-transfers", CashTransferViewSet, basename="cash-transfer")
 router.register(r"cheque-registers", ChequeRegisterViewSet, basename="cheque-register")
 router.register(r"journal-vouchers", JournalVoucherViewSet, basename="journal-voucher")
+router.register(r"ledger-entries", LedgerEntryViewSet, basename="ledger-entry")
 
 urlpatterns = [
+    path("reports/trial-balance/", TrialBalanceView.as_view(), name="trial-balance"),
+    path("reports/account-statement/", AccountStatementView.as_view(), name="account-statement"),
     path("", include(router.urls)),
 ]
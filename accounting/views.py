@@ -1,8 +1,33 @@
+import uuid
+from decimal import Decimal
+
+from django.core import signing
+from django.http import StreamingHttpResponse
+from django.utils import timezone
+from django.utils.dateparse import parse_date
 from rest_framework import viewsets
+from rest_framework.exceptions import NotFound, PermissionDenied, ValidationError
 from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+from rest_framework.utils.urls import replace_query_param
+from rest_framework.views import APIView
 from rest_framework.filters import SearchFilter, OrderingFilter
 from django_filters.rest_framework import DjangoFilterBackend
 from core.utils.BaseModelViewSet import BaseModelViewSet
+from core.utils.BranchScopeRegistry import get_branch_scope
+from core.utils.RequestPrincipal import get_principal
+from core.utils.StreamingExport import CSVRenderer, NDJSONRenderer, StreamingRenderer
+from .posting import LedgerPostingMixin
+from .reports import (
+    ZERO,
+    latest_balances,
+    money,
+    opening_balance,
+    statement_queryset,
+    statement_row,
+    trial_balance,
+)
 from .models import (
     AccountType,
     COA,
@@ -11,6 +36,7 @@ from .models import (
     CashTransfer,
     ChequeRegister,
     JournalVoucher,
+    LedgerEntry,
 )
 from .serializers import (
     AccountTypeSerializer,
@@ -20,6 +46,7 @@ from .serializers import (
     CashTransferSerializer,
     ChequeRegisterSerializer,
     JournalVoucherSerializer,
+    LedgerEntrySerializer,
 )
 from .filters import (
     AccountTypeFilter,
@@ -29,6 +56,7 @@ from .filters import (
     CashTransferFilter,
     ChequeRegisterFilter,
     JournalVoucherFilter,
+    LedgerEntryFilter,
 )
 
 
@@ -47,6 +75,8 @@ class COAViewSet(BaseModelViewSet):
 
 
 class AccountBalanceViewSet(BaseModelViewSet):
+    # Maintained by accounting.balances from the ledger
+    http_method_names = ["get", "head", "options"]
     queryset = AccountBalance.objects.select_related("account", "branch").all()
     serializer_class = AccountBalanceSerializer
     filterset_class = AccountBalanceFilter
@@ -60,11 +90,12 @@ class BankAccountViewSet(BaseModelViewSet):
     search_fields = ["display_name", "code", "bank_name", "account_number"]
 
 
-class CashTransferViewSet(BaseModelViewSet):
+class CashTransferViewSet(LedgerPostingMixin, BaseModelViewSet):
     queryset = CashTransfer.objects.select_related("from_account", "branch").prefetch_related("items").all()
     serializer_class = CashTransferSerializer
     filterset_class = CashTransferFilter
     search_fields = ["transfer_no", "reference_no", "note"]
+    cursor_ordering = ("-transfer_date", "-created", "-id")
 
 
 class ChequeRegisterViewSet(BaseModelViewSet):
@@ -74,8 +105,180 @@ class ChequeRegisterViewSet(BaseModelViewSet):
     search_fields = ["cheque_no", "memo", "note"]
 
 
-class JournalVoucherViewSet(BaseModelViewSet):
+class JournalVoucherViewSet(LedgerPostingMixin, BaseModelViewSet):
     queryset = JournalVoucher.objects.select_related("branch").prefetch_related("items").all()
     serializer_class = JournalVoucherSerializer
     filterset_class = JournalVoucherFilter
     search_fields = ["voucher_no", "narration", "note"]
+    cursor_ordering = ("-voucher_date", "-created", "-id")
+
+
+class LedgerEntryViewSet(BaseModelViewSet):
+    # Written only by accounting.posting; the API reads it
+    http_method_names = ["get", "head", "options"]
+    queryset = LedgerEntry.objects.select_related("account", "branch").all()
+    serializer_class = LedgerEntrySerializer
+    filterset_class = LedgerEntryFilter
+    search_fields = ["source_no", "memo", "account__code", "account__name"]
+    cursor_ordering = ("-entry_date", "-id")
+
+
+# -------------------------
+# Reports
+# -------------------------
+def get_report_branch(request):
+    """
+    Branch a report runs for: ``?branch=`` for head-office users (all
+    branches when omitted), always the caller's own branch otherwise.
+    """
+    principal = get_principal(request)
+    requested = request.query_params.get("branch") or None
+    if requested:
+        try:
+            requested = str(uuid.UUID(requested))
+        except ValueError:
+            raise ValidationError({"branch": ["Must be a valid UUID."]})
+    if principal is not None and principal.branch_id and not principal.is_head_office:
+        if requested and requested != str(principal.branch_id):
+            raise PermissionDenied("You can only report on your own branch.")
+        return principal.branch_id
+    return requested
+
+
+def get_report_date(request, param, default=None):
+    value = request.query_params.get(param)
+    if not value:
+        return default
+    try:
+        parsed = parse_date(value)
+    except ValueError:
+        parsed = None
+    if parsed is None:
+        raise ValidationError({param: ["Expected a date (YYYY-MM-DD)."]})
+    return parsed
+
+
+class TrialBalanceView(APIView):
+    """
+    GET ?as_of=YYYY-MM-DD&branch=<id>&include_zero=true
+
+    Balances of every account at the end of ``as_of`` (default today),
+    rolled up through the chart into group accounts.
+    """
+
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request):
+        as_of = get_report_date(request, "as_of", timezone.localdate())
+        include_zero = request.query_params.get("include_zero") in ("1", "true", "True")
+        return Response(trial_balance(as_of, get_report_branch(request), include_zero))
+
+
+class AccountStatementView(APIView):
+    """
+    GET ?account=<id>&from=YYYY-MM-DD&to=YYYY-MM-DD&branch=<id>
+
+    Ledger of one account: opening balance (from the nearest AccountBalance
+    snapshot before ``from``), every movement with its running balance and
+    the closing balance at ``to``. JSON is keyset-paged: ``next`` carries the
+    last row's position and balance in a signed cursor, so each page is one
+    range scan of ``page_size`` rows. ``?format=csv|ndjson`` streams the whole
+    range instead.
+    """
+
+    permission_classes = [IsAuthenticated]
+    renderer_classes = list(api_settings.DEFAULT_RENDERER_CLASSES) + [CSVRenderer, NDJSONRenderer]
+
+    page_size = 100
+    max_page_size = 1000
+    stream_chunk_size = 2000
+    cursor_salt = "accounting.account-statement"
+
+    def get_page_size(self, request):
+        try:
+            size = int(request.query_params.get("page_size", self.page_size))
+        except ValueError:
+            size = self.page_size
+        return max(1, min(size, self.max_page_size))
+
+    def get_account(self, request):
+        value = request.query_params.get("account")
+        try:
+            account_id = uuid.UUID(value or "")
+        except ValueError:
+            raise ValidationError({"account": ["A valid account id is required."]})
+        # Same visibility as the COA list: other branches' accounts don't exist here
+        accounts = COA.objects.filter(pk=account_id)
+        principal = get_principal(request)
+        if principal is not None and principal.branch_id and not principal.is_head_office:
+            accounts = get_branch_scope(COA).filter(accounts, principal.branch_id)
+        account = accounts.values("id", "code", "name").first()
+        if account is None:
+            raise NotFound("Account not found.")
+        return account
+
+    def decode_cursor(self, token, account):
+        try:
+            payload = signing.loads(token, salt=self.cursor_salt)
+            if payload["a"] != str(account["id"]):
+                raise ValueError
+            return (parse_date(payload["d"]), payload["i"]), Decimal(payload["b"])
+        except (signing.BadSignature, KeyError, TypeError, ValueError, ArithmeticError):
+            raise NotFound("Invalid cursor")
+
+    def encode_cursor(self, request, account, row):
+        token = signing.dumps(
+            {"a": str(account["id"]), "d": row["entry_date"].isoformat(), "i": row["id"], "b": str(row["balance"])},
+            salt=self.cursor_salt,
+        )
+        return replace_query_param(request.build_absolute_uri(), "cursor", token)
+
+    def get(self, request):
+        account = self.get_account(request)
+        branch = get_report_branch(request)
+        date_from = get_report_date(request, "from")
+        date_to = get_report_date(request, "to", timezone.localdate())
+        if date_from is not None and date_from > date_to:
+            raise ValidationError({"from": ["Must not be after 'to'."]})
+
+        opening = opening_balance(account["id"], date_from, branch)
+        queryset = statement_queryset(account["id"], date_from, date_to, branch)
+
+        if isinstance(request.accepted_renderer, StreamingRenderer):
+            return self.stream(request, account, queryset, opening)
+
+        start = opening
+        token = request.query_params.get("cursor")
+        if token:
+            after, start = self.decode_cursor(token, account)
+            queryset = statement_queryset(account["id"], date_from, date_to, branch, after=after)
+
+        page_size = self.get_page_size(request)
+        rows = list(queryset[:page_size + 1])
+        results = [statement_row(row, start) for row in rows[:page_size]]
+        debit, credit = latest_balances(date_to, branch, [account["id"]]).get(account["id"], (ZERO, ZERO))
+
+        return Response({
+            "account": account,
+            "branch": branch,
+            "from": date_from,
+            "to": date_to,
+            "opening_balance": money(opening),
+            "closing_balance": money(debit - credit),
+            "next": self.encode_cursor(request, account, results[-1]) if len(rows) > page_size else None,
+            "results": results,
+        })
+
+    def stream(self, request, account, queryset, opening):
+        # Rows are read after the view returns; stay on the database picked now
+        queryset = queryset.using(queryset.db)
+        rows = (statement_row(row, opening) for row in queryset.iterator(chunk_size=self.stream_chunk_size))
+        renderer = request.accepted_renderer
+        response = StreamingHttpResponse(
+            renderer.stream(rows),
+            content_type="{}; charset={}".format(renderer.media_type, renderer.charset),
+        )
+        response["Content-Disposition"] = 'attachment; filename="statement-{}.{}"'.format(
+            account["code"], renderer.format
+        )
+        return response
@@ -4,3 +4,18 @@ from django.apps import AppConfig
 class CoreConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'core'
+
+    def ready(self):
+        from django.db.models.signals import post_migrate, post_save
+
+        from core.seeders.bootstrap import seed_after_migrate, seed_new_branch
+        from core.utils.BranchScopeRegistry import build_branch_scope_registry
+        from core.utils.RequestPrincipal import connect_principal_invalidation
+        from core.utils.TreeIndex import connect_tree_index
+        from master.models import Branch
+
+        build_branch_scope_registry()
+        connect_principal_invalidation()
+        connect_tree_index()
+        post_migrate.connect(seed_after_migrate, sender=self, dispatch_uid="core_default_seed")
+        post_save.connect(seed_new_branch, sender=Branch, dispatch_uid="core_seed_new_branch")
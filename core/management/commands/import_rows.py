@@ -0,0 +1,102 @@
+import json
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.urls import Resolver404, resolve
+
+from accounting.posting import LedgerPostingMixin
+from core.utils.BaseModelViewSet import BaseModelViewSet
+from core.utils.BranchScopeRegistry import get_branch_scope
+from core.utils.BulkImport import FORMATS, BulkImporter, detect_format, read_rows
+from master.models import Branch
+
+
+class Command(BaseCommand):
+    help = (
+        "Import a CSV or NDJSON file through an API list route's serializer, "
+        "e.g. `import_rows crm/contacts contacts.csv --branch HQ`."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("route", help="List route under /api/ (crm/contacts) or a full path.")
+        parser.add_argument("path", help="File to import.")
+        parser.add_argument("--format", choices=FORMATS, help="Defaults from the file extension.")
+        parser.add_argument("--branch", help="Branch code to stamp rows with (defaults to the user's branch).")
+        parser.add_argument("--user", help="Username recorded as the history user.")
+        parser.add_argument("--chunk-size", type=int, default=BaseModelViewSet.import_chunk_size)
+        parser.add_argument("--max-errors", type=int, default=1000, help="Row errors kept in the report.")
+        parser.add_argument("--dry-run", action="store_true", help="Validate only.")
+        parser.add_argument("--report", help="Write the full JSON report to this file.")
+
+    def _get_view_class(self, route):
+        path = route if route.startswith("/") else "/api/{}/".format(route.strip("/"))
+        try:
+            match = resolve(path)
+        except Resolver404:
+            raise CommandError("No route matches {}.".format(path))
+        view_class = getattr(match.func, "cls", None)
+        if view_class is None or not issubclass(view_class, BaseModelViewSet):
+            raise CommandError("{} is not a BaseModelViewSet list route.".format(path))
+        if "post" not in view_class.http_method_names:
+            raise CommandError("{} is read-only.".format(path))
+        return view_class
+
+    def handle(self, *args, **options):
+        # rest_framework_bulk's serializers read context["view"].request
+        view = self._get_view_class(options["route"])(request=None, action="import_rows")
+        serializer_class = view.serializer_class
+
+        user = None
+        if options["user"]:
+            try:
+                user = get_user_model()._default_manager.get_by_natural_key(options["user"])
+            except get_user_model().DoesNotExist:
+                raise CommandError("User {} does not exist.".format(options["user"]))
+
+        branch = user.branch if user is not None else None
+        if options["branch"]:
+            branch = Branch.objects.filter(code=options["branch"]).first()
+            if branch is None:
+                raise CommandError("Branch {} does not exist.".format(options["branch"]))
+
+        save_kwargs = {}
+        scope = get_branch_scope(serializer_class.Meta.model)
+        if scope.stamp_field:
+            if branch is None:
+                raise CommandError("{} rows are branch-scoped; pass --branch or --user.".format(
+                    serializer_class.Meta.model.__name__))
+            save_kwargs[scope.stamp_field] = branch
+
+        save = None
+        if isinstance(view, LedgerPostingMixin):
+            # As the API's perform_create: approved documents post with their chunk
+            def save(serializer):
+                serializer.save(**save_kwargs)
+                view.sync_ledger(serializer)
+
+        importer = BulkImporter(
+            serializer_class,
+            context={"view": view, "user": user},
+            save_kwargs=save_kwargs,
+            branch=branch,
+            chunk_size=options["chunk_size"],
+            max_errors=options["max_errors"],
+            dry_run=options["dry_run"],
+            save=save,
+        )
+        try:
+            file_format = detect_format(options["path"], options["format"])
+            with open(options["path"], "rb") as stream:
+                report = importer.run(read_rows(stream, file_format))
+        except (OSError, ValueError) as exc:
+            raise CommandError(str(exc))
+
+        for entry in report["errors"]:
+            self.stderr.write("row {}: {}".format(entry["row"], json.dumps(entry["errors"])))
+        if options["report"]:
+            with open(options["report"], "w") as out:
+                json.dump(report, out, indent=2)
+
+        done = "valid" if options["dry_run"] else "created"
+        self.stdout.write(self.style.SUCCESS("{} rows read, {} {}, {} failed.".format(
+            report["rows"], report[done], done, report["failed"])))
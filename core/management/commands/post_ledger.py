@@ -0,0 +1,40 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from accounting.posting import posting_models, sync_queryset
+
+
+class Command(BaseCommand):
+    help = (
+        "Post approved documents that are not in the ledger yet and reverse "
+        "voided ones. Safe to re-run: documents already posted are skipped."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("models", nargs="*", help="Model labels to post, e.g. sales.Invoice (default: all)")
+        parser.add_argument("--branch", help="Only documents of this branch id")
+        parser.add_argument("--batch-size", type=int, default=500)
+
+    def handle(self, *args, **options):
+        models = {model._meta.label.lower(): model for model in posting_models()}
+        labels = [label.lower() for label in options["models"]] or list(models)
+        unknown = [label for label in labels if label not in models]
+        if unknown:
+            raise CommandError("No posting rule for: {}".format(", ".join(unknown)))
+
+        failed = 0
+        for label in labels:
+            queryset = models[label].objects.filter(approved=True)
+            if options["branch"]:
+                queryset = queryset.filter(branch_id=options["branch"])
+            result = sync_queryset(queryset, batch_size=options["batch_size"])
+            self.stdout.write(
+                "{}: {} posted, {} reversed, {} entries".format(
+                    label, result.posted, result.reversed, result.entries
+                )
+            )
+            for pk, message in result.errors:
+                self.stderr.write("  {} {}: {}".format(label, pk, message))
+            failed += len(result.errors)
+
+        if failed:
+            raise CommandError("{} document(s) could not be posted.".format(failed))
@@ -0,0 +1,39 @@
+import uuid
+
+from django.core.management.base import BaseCommand
+from django.db.models import Q
+
+from accounting.balances import rebuild_balances
+from accounting.models import COA
+
+
+class Command(BaseCommand):
+    help = (
+        "Recompute AccountBalance snapshots from the ledger, a chunk of "
+        "accounts per transaction. Posting keeps them current; run this after "
+        "a restore or to repair drift."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--branch", help="Only accounts of this branch id")
+        parser.add_argument("--account", action="append", default=[], help="Account id or code (repeatable)")
+        parser.add_argument("--chunk-size", type=int, default=200, help="Accounts per transaction")
+
+    def handle(self, *args, **options):
+        accounts = COA.objects.all()
+        if options["branch"]:
+            accounts = accounts.filter(branch_id=options["branch"])
+        if options["account"]:
+            ids = [value for value in options["account"] if _is_uuid(value)]
+            accounts = accounts.filter(Q(pk__in=ids) | Q(code__in=options["account"]))
+
+        written = rebuild_balances(accounts, chunk_size=options["chunk_size"])
+        self.stdout.write(self.style.SUCCESS("{} balance snapshot(s) written.".format(written)))
+
+
+def _is_uuid(value):
+    try:
+        uuid.UUID(value)
+    except ValueError:
+        return False
+    return True
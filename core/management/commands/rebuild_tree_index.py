@@ -0,0 +1,22 @@
+from django.apps import apps
+from django.core.management.base import BaseCommand, CommandError
+
+from core.utils.TreeIndex import TreeIndexMixin, rebuild_tree_index
+
+
+class Command(BaseCommand):
+    help = "Recompute the closure-table tree index of TreeIndexMixin models from their parent column."
+
+    def add_arguments(self, parser):
+        parser.add_argument("models", nargs="*", help="Model labels, e.g. accounting.COA (default: all)")
+
+    def handle(self, *args, **options):
+        models = {model._meta.label.lower(): model for model in apps.get_models() if issubclass(model, TreeIndexMixin)}
+        labels = [label.lower() for label in options["models"]] or sorted(models)
+        unknown = [label for label in labels if label not in models]
+        if unknown:
+            raise CommandError("Not a tree-indexed model: {}".format(", ".join(unknown)))
+
+        for label in labels:
+            rows = rebuild_tree_index(models[label])
+            self.stdout.write("{}: {} closure rows".format(label, rows))
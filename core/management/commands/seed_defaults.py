@@ -0,0 +1,20 @@
+from django.core.management.base import BaseCommand
+
+from core.seeders.bootstrap import SEED_VERSION, run_default_seed
+
+
+class Command(BaseCommand):
+    help = "Seed the default branch, superuser, currencies, taxes, master data and chart of accounts."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--force",
+            action="store_true",
+            help="Run the seed even if this seed version is already recorded.",
+        )
+
+    def handle(self, *args, **options):
+        if run_default_seed(force=options["force"]):
+            self.stdout.write(self.style.SUCCESS(f"Default data seeded (version {SEED_VERSION})."))
+        else:
+            self.stdout.write(f"Default data already at version {SEED_VERSION}; use --force to re-run.")
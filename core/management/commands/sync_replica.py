@@ -0,0 +1,32 @@
+import sqlite3
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DEFAULT_DB_ALIAS, connections
+
+from core.utils.ReplicaRouter import get_replica_alias
+
+
+class Command(BaseCommand):
+    help = (
+        "Copy the SQLite primary database onto the SQLite replica file, for "
+        "running the read-replica router locally. Server databases replicate "
+        "on their own."
+    )
+
+    def handle(self, *args, **options):
+        replica = get_replica_alias()
+        if replica is None:
+            raise CommandError("No replica configured; set DB_REPLICA_NAME.")
+
+        primary = connections[DEFAULT_DB_ALIAS]
+        if primary.vendor != "sqlite" or connections[replica].vendor != "sqlite":
+            raise CommandError("sync_replica only copies SQLite databases.")
+
+        primary.ensure_connection()
+        connections[replica].close()
+        target = sqlite3.connect(str(connections[replica].settings_dict["NAME"]))
+        try:
+            primary.connection.backup(target)
+        finally:
+            target.close()
+        self.stdout.write(self.style.SUCCESS("Replica {} synced from {}.".format(replica, DEFAULT_DB_ALIAS)))
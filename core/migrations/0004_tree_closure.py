@@ -0,0 +1,29 @@
+# Generated by Django 5.2.18 on 2026-10-18 13:57
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('contenttypes', '0002_remove_content_type_name'),
+        ('core', '0003_seed_marker'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TreeClosure',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('ancestor_id', models.UUIDField()),
+                ('descendant_id', models.UUIDField()),
+                ('depth', models.PositiveIntegerField()),
+                ('content_type', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='contenttypes.contenttype')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['content_type', 'descendant_id', 'depth'], name='core_treecl_content_5dfaae_idx')],
+                'constraints': [models.UniqueConstraint(fields=('content_type', 'ancestor_id', 'descendant_id'), name='tree_closure_unique_pair')],
+            },
+        ),
+    ]
@@ -0,0 +1,63 @@
+from django.db import migrations
+
+TREE_MODELS = [
+    ("accounting", "coa"),
+    ("inventory", "productcategory"),
+    ("crm", "contactgroup"),
+    ("master", "masterdata"),
+]
+
+
+def closure_pairs(parents):
+    """(ancestor, descendant, depth) for every node in ``parents`` ({id: parent_id})."""
+    chains = {}
+    for node_id in parents:
+        # Climb past the root (or to a node already done), then fill in downwards
+        trail = []
+        current = node_id
+        while current in parents and current not in chains:
+            if current in trail:
+                raise ValueError("Tree cycle through {}".format(current))
+            trail.append(current)
+            current = parents.get(current)
+        above = chains.get(current, [])
+        for child_id in reversed(trail):
+            above = [(child_id, 0)] + [(ancestor_id, depth + 1) for ancestor_id, depth in above]
+            chains[child_id] = above
+    for node_id, chain in chains.items():
+        for ancestor_id, depth in chain:
+            yield ancestor_id, node_id, depth
+
+
+def index_trees(apps, schema_editor):
+    ContentType = apps.get_model("contenttypes", "ContentType")
+    TreeClosure = apps.get_model("core", "TreeClosure")
+    for app_label, model_name in TREE_MODELS:
+        model = apps.get_model(app_label, model_name)
+        if not model.objects.exists():
+            continue
+        content_type, _ = ContentType.objects.get_or_create(app_label=app_label, model=model_name)
+        parents = dict(model.objects.values_list("pk", "parent_id"))
+        TreeClosure.objects.filter(content_type=content_type).delete()
+        TreeClosure.objects.bulk_create(
+            [
+                TreeClosure(content_type=content_type, ancestor_id=ancestor_id, descendant_id=descendant_id, depth=depth)
+                for ancestor_id, descendant_id, depth in closure_pairs(parents)
+            ],
+            batch_size=1000,
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("core", "0004_tree_closure"),
+        ("accounting", "0005_account_balance_unique_day"),
+        ("crm", "0001_initial"),
+        ("inventory", "0002_branch_composite_indexes"),
+        ("master", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.RunPython(index_trees, migrations.RunPython.noop),
+    ]
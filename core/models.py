@@ -54,8 +54,48 @@ class CustomUser(AbstractUser):
     REQUIRED_FIELDS = ["username"] 
      
 
+    label_related = ("branch",)
+
     def __str__(self):
         if self.branch:
             return f"{self.username} - {self.branch}"
         full = f"{self.first_name} {self.last_name}".strip()
         return full or self.username
+
+
+class SeedMarker(models.Model):
+    """Records which version of the default data seed has been applied."""
+
+    key = models.CharField(max_length=100, unique=True)
+    version = models.PositiveIntegerField(default=0)
+    applied_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"{self.key} v{self.version}"
+
+
+class TreeClosure(models.Model):
+    """
+    Ancestor/descendant pairs (closure table) of the models using
+    core.utils.TreeIndex.TreeIndexMixin, including each node paired with
+    itself at depth 0.
+    """
+
+    content_type = models.ForeignKey("contenttypes.ContentType", on_delete=models.CASCADE, related_name="+")
+    ancestor_id = models.UUIDField()
+    descendant_id = models.UUIDField()
+    depth = models.PositiveIntegerField()
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["content_type", "ancestor_id", "descendant_id"],
+                name="tree_closure_unique_pair",
+            ),
+        ]
+        indexes = [
+            models.Index(fields=["content_type", "descendant_id", "depth"]),
+        ]
+
+    def __str__(self):
+        return f"{self.ancestor_id} > {self.descendant_id} ({self.depth})"
@@ -0,0 +1,44 @@
+from django.db import DEFAULT_DB_ALIAS, connection, transaction
+from django.db.utils import OperationalError, ProgrammingError
+
+from core.seeders.seed_default import seed_all_defaults, seed_branch_chart_of_accounts
+
+# Bump when seed_all_defaults() gains rows that existing databases should get.
+SEED_VERSION = 2
+
+
+def run_default_seed(force=False):
+    """
+    Seed default data once per schema. The applied version is stored in
+    SeedMarker, so later calls cost a single lookup until SEED_VERSION moves.
+    Returns True if the seed ran.
+    """
+    from core.models import SeedMarker
+
+    schema_name = getattr(connection, "schema_name", "default")  # works with django-tenants
+    key = f"default_seed:{schema_name}"
+
+    marker = SeedMarker.objects.filter(key=key).first()
+    if not force and marker is not None and marker.version >= SEED_VERSION:
+        return False
+
+    with transaction.atomic():
+        seed_all_defaults(schema_name=schema_name)
+        SeedMarker.objects.update_or_create(key=key, defaults={"version": SEED_VERSION})
+    return True
+
+
+def seed_after_migrate(sender, using=DEFAULT_DB_ALIAS, **kwargs):
+    if using != DEFAULT_DB_ALIAS:
+        return
+    try:
+        run_default_seed()
+    except (OperationalError, ProgrammingError):
+        # Only part of the schema is migrated yet; the next migrate seeds.
+        pass
+
+
+def seed_new_branch(sender, instance, created, raw=False, **kwargs):
+    """Give branches created after bootstrap their default chart of accounts."""
+    if created and not raw:
+        transaction.on_commit(lambda: seed_branch_chart_of_accounts(instance))
@@ -6,7 +6,6 @@ from django.db import transaction
 def seed_all_defaults(schema_name: str = "default"):
     try:
         from django.contrib.auth import get_user_model
-        from accounting.models import AccountType, COA
         from master.models import Branch, Currency, TaxClass, TaxRate, MasterData
     except Exception:
         return
@@ -137,79 +136,89 @@ def seed_all_defaults(schema_name: str = "default"):
                 )
 
         # ---- Chart of Accounts defaults (per branch) ----
-        account_types = {
-            "asset": ("Asset", AccountType.Category.ASSET, AccountType.NormalBalance.DR),
-            "liability": ("Liability", AccountType.Category.LIABILITY, AccountType.NormalBalance.CR),
-            "equity": ("Equity", AccountType.Category.EQUITY, AccountType.NormalBalance.CR),
-            "income": ("Income", AccountType.Category.INCOME, AccountType.NormalBalance.CR),
-            "expense": ("Expense", AccountType.Category.EXPENSE, AccountType.NormalBalance.DR),
-        }
-        account_type_map = {}
-        for key, (name, category, balance) in account_types.items():
-            account_type, _ = AccountType.objects.get_or_create(
-                name=name,
-                defaults={
-                    "category": category,
-                    "normal_balance": balance,
-                    "is_system_generated": True,
-                },
-            )
-            account_type_map[key] = account_type
-
-        coa_template = [
-            {"code": "1000", "name": "Assets", "type": "asset", "parent": None, "is_group": True},
-            {"code": "1100", "name": "Current Assets", "type": "asset", "parent": "1000", "is_group": True},
-            {"code": "1110", "name": "Cash", "type": "asset", "parent": "1100"},
-            {"code": "1120", "name": "Bank", "type": "asset", "parent": "1100"},
-            {"code": "1200", "name": "Accounts Receivable", "type": "asset", "parent": "1000"},
-            {"code": "2000", "name": "Liabilities", "type": "liability", "parent": None, "is_group": True},
-            {"code": "2100", "name": "Current Liabilities", "type": "liability", "parent": "2000", "is_group": True},
-            {"code": "2200", "name": "Accounts Payable", "type": "liability", "parent": "2000"},
-            {"code": "3000", "name": "Equity", "type": "equity", "parent": None, "is_group": True},
-            {"code": "4000", "name": "Income", "type": "income", "parent": None, "is_group": True},
-            {"code": "4100", "name": "Freight Income", "type": "income", "parent": "4000"},
-            {"code": "4200", "name": "Service Income", "type": "income", "parent": "4000"},
-            {"code": "5000", "name": "Expenses", "type": "expense", "parent": None, "is_group": True},
-            {"code": "5100", "name": "Operating Expenses", "type": "expense", "parent": "5000", "is_group": True},
-            {"code": "5110", "name": "Salaries", "type": "expense", "parent": "5100"},
-            {"code": "5120", "name": "Rent", "type": "expense", "parent": "5100"},
-            {"code": "5130", "name": "Utilities", "type": "expense", "parent": "5100"},
-        ]
-
+        account_type_map = seed_account_types()
         for branch in Branch.objects.all():
-            if COA.objects.filter(branch=branch).exists():
-                continue
-
-            by_code = {}
-
-            for row in [r for r in coa_template if r["parent"] is None]:
-                obj, _ = COA.objects.get_or_create(
-                    branch=branch,
-                    code=row["code"],
-                    defaults={
-                        "name": row["name"],
-                        "description": "",
-                        "account_type": account_type_map[row["type"]],
-                        "is_group": row.get("is_group", False),
-                        "is_system": True,
-                        "is_system_generated": True,
-                    },
-                )
-                by_code[row["code"]] = obj
-
-            for row in [r for r in coa_template if r["parent"] is not None]:
-                parent_obj = by_code.get(row["parent"])
-                obj, _ = COA.objects.get_or_create(
-                    branch=branch,
-                    code=row["code"],
-                    defaults={
-                        "name": row["name"],
-                        "description": "",
-                        "parent": parent_obj,
-                        "account_type": account_type_map[row["type"]],
-                        "is_group": row.get("is_group", False),
-                        "is_system": True,
-                        "is_system_generated": True,
-                    },
-                )
-                by_code[row["code"]] = obj
+            seed_branch_chart_of_accounts(branch, account_type_map)
+
+
+COA_TEMPLATE = [
+    {"code": "1000", "name": "Assets", "type": "asset", "parent": None, "is_group": True},
+    {"code": "1100", "name": "Current Assets", "type": "asset", "parent": "1000", "is_group": True},
+    {"code": "1110", "name": "Cash", "type": "asset", "parent": "1100"},
+    {"code": "1120", "name": "Bank", "type": "asset", "parent": "1100"},
+    {"code": "1200", "name": "Accounts Receivable", "type": "asset", "parent": "1000"},
+    {"code": "2000", "name": "Liabilities", "type": "liability", "parent": None, "is_group": True},
+    {"code": "2100", "name": "Current Liabilities", "type": "liability", "parent": "2000", "is_group": True},
+    {"code": "2110", "name": "Tax Payable", "type": "liability", "parent": "2100"},
+    {"code": "2200", "name": "Accounts Payable", "type": "liability", "parent": "2000"},
+    {"code": "3000", "name": "Equity", "type": "equity", "parent": None, "is_group": True},
+    {"code": "4000", "name": "Income", "type": "income", "parent": None, "is_group": True},
+    {"code": "4100", "name": "Freight Income", "type": "income", "parent": "4000"},
+    {"code": "4200", "name": "Service Income", "type": "income", "parent": "4000"},
+    {"code": "5000", "name": "Expenses", "type": "expense", "parent": None, "is_group": True},
+    {"code": "5100", "name": "Operating Expenses", "type": "expense", "parent": "5000", "is_group": True},
+    {"code": "5110", "name": "Salaries", "type": "expense", "parent": "5100"},
+    {"code": "5120", "name": "Rent", "type": "expense", "parent": "5100"},
+    {"code": "5130", "name": "Utilities", "type": "expense", "parent": "5100"},
+    {"code": "5200", "name": "Purchases", "type": "expense", "parent": "5000"},
+]
+
+
+def seed_account_types():
+    from accounting.models import AccountType
+
+    account_types = {
+        "asset": ("Asset", AccountType.Category.ASSET, AccountType.NormalBalance.DR),
+        "liability": ("Liability", AccountType.Category.LIABILITY, AccountType.NormalBalance.CR),
+        "equity": ("Equity", AccountType.Category.EQUITY, AccountType.NormalBalance.CR),
+        "income": ("Income", AccountType.Category.INCOME, AccountType.NormalBalance.CR),
+        "expense": ("Expense", AccountType.Category.EXPENSE, AccountType.NormalBalance.DR),
+    }
+    account_type_map = {}
+    for key, (name, category, balance) in account_types.items():
+        account_type, _ = AccountType.objects.get_or_create(
+            name=name,
+            defaults={
+                "category": category,
+                "normal_balance": balance,
+                "is_system_generated": True,
+            },
+        )
+        account_type_map[key] = account_type
+    return account_type_map
+
+
+def seed_branch_chart_of_accounts(branch, account_type_map=None):
+    """
+    Create the default chart of accounts for ``branch``. On a branch that
+    already has a chart only the template codes it lacks are added, so
+    accounts added to COA_TEMPLATE reach existing branches when
+    SEED_VERSION is bumped.
+    """
+    from accounting.models import COA
+
+    by_code = {
+        account.code: account
+        for account in COA.objects.filter(branch=branch, code__in=[row["code"] for row in COA_TEMPLATE])
+    }
+    missing = [row for row in COA_TEMPLATE if row["code"] not in by_code]
+    if not missing:
+        return
+
+    if account_type_map is None:
+        account_type_map = seed_account_types()
+
+    with transaction.atomic():
+        # Parents come first in COA_TEMPLATE
+        for row in missing:
+            by_code[row["code"]] = COA.objects.create(
+                branch=branch,
+                code=row["code"],
+                name=row["name"],
+                description="",
+                parent=by_code.get(row["parent"]),
+                account_type=account_type_map[row["type"]],
+                is_group=row.get("is_group", False),
+                is_system=True,
+                is_system_generated=True,
+            )
@@ -1,11 +1,142 @@
+import copy
+
+from django.apps import apps
+from django.conf import settings
+from django.core.exceptions import ValidationError as DjangoValidationError
+from django.db import transaction
 from rest_framework import serializers
 from rest_framework_bulk.serializers import BulkListSerializer, BulkSerializerMixin
 from rest_framework.exceptions import ValidationError
 from rest_framework.fields import SkipField
 from rest_framework.settings import api_settings
-from rest_framework.utils import html
+from rest_framework.utils import html, model_meta
+from simple_history.exceptions import NotHistoricalModelError
+from simple_history.utils import (
+    bulk_create_with_history,
+    bulk_update_with_history,
+    get_history_manager_for_model,
+)
+
+from core.utils.TreeIndex import sync_tree_index
+
+
+def is_historical_model(model):
+    try:
+        get_history_manager_for_model(model)
+    except NotHistoricalModelError:
+        return False
+    return True
+
+
+def get_history_user(context):
+    # Outside a request (management commands) the caller may pass context['user']
+    request = context.get('request')
+    user = getattr(request, 'user', None) or context.get('user')
+    if user is not None and user.is_authenticated:
+        return user
+    return None
+
+
+def bulk_create_rows(model, objs, batch_size=None, user=None):
+    """
+    bulk_create ``objs``, writing simple_history rows in bulk when the model
+    is historical and tree-index rows when it is a TreeIndexMixin model.
+    """
+    if is_historical_model(model):
+        objs = bulk_create_with_history(objs, model, batch_size=batch_size, default_user=user)
+    else:
+        objs = model.objects.bulk_create(objs, batch_size=batch_size)
+    sync_tree_index(model, objs, created=True)
+    return objs
+
+
+def bulk_update_rows(model, objs, fields, batch_size=None, user=None):
+    """bulk_update ``objs``, with history rows and tree-index moves as for bulk_create_rows()."""
+    if is_historical_model(model):
+        bulk_update_with_history(objs, model, fields, batch_size=batch_size, default_user=user)
+    else:
+        model.objects.bulk_update(objs, fields, batch_size=batch_size)
+    sync_tree_index(model, objs, created=False)
+    return objs
+
+
+def touch_auto_now_fields(model, objs):
+    """
+    bulk_update() skips Field.pre_save(), so stamp auto_now columns by hand.
+    Returns the names of the stamped fields.
+    """
+    names = []
+    for field in model._meta.concrete_fields:
+        if getattr(field, 'auto_now', False):
+            for obj in objs:
+                field.pre_save(obj, add=False)
+            names.append(field.name)
+    return names
+
 
 class AdaptedBulkListSerializerMixin(object):
+    def _get_update_lookup_field(self):
+        return getattr(self.child.Meta, 'update_lookup_field', 'id')
+
+    def _to_lookup_key(self, value):
+        """
+        Normalise an incoming lookup value (e.g. a UUID string) so it can be
+        matched against the loaded instances. Returns None for invalid values.
+        """
+        id_attr = self._get_update_lookup_field()
+        try:
+            field = self.child.Meta.model._meta.get_field(id_attr)
+            return str(field.to_python(value))
+        except (DjangoValidationError, TypeError, ValueError):
+            return None
+
+    def _load_instance_map(self, data):
+        """
+        Fetch every instance targeted by a bulk update with a single
+        ``id__in`` query and return them as an id -> instance map.
+        """
+        id_attr = self._get_update_lookup_field()
+        keys = set()
+        for item in data:
+            if isinstance(item, dict) and item.get(id_attr) is not None:
+                key = self._to_lookup_key(item[id_attr])
+                if key is not None:
+                    keys.add(key)
+
+        if not keys:
+            return {}
+
+        if hasattr(self.instance, 'filter'):
+            objects = self.instance.filter(**{'{}__in'.format(id_attr): keys})
+        else:
+            objects = self.instance
+
+        instance_map = {}
+        for obj in objects:
+            key = str(getattr(obj, id_attr))
+            if key in keys:
+                instance_map[key] = obj
+        return instance_map
+
+    def _prefetch_related_values(self, data):
+        """
+        Resolve the pks sent for each related field across all rows with one
+        query per field, instead of one get() per row per field. Returns the
+        fields that were primed so the caller can clear them.
+        """
+        primed = []
+        for field in self.child.fields.values():
+            if field.read_only or not hasattr(field, 'prefetch'):
+                continue
+            values = [
+                item[field.field_name] for item in data
+                if isinstance(item, dict) and item.get(field.field_name) is not None
+            ]
+            if values:
+                field.prefetch(values)
+                primed.append(field)
+        return primed
+
     def to_internal_value(self, data):
         """
         List of dicts of native values <- List of dicts of primitive datatypes.
@@ -33,28 +164,155 @@ class AdaptedBulkListSerializerMixin(object):
         ret = []
         errors = []
 
-        for item in data:
-            try:
-                # Code that was inserted
-                self.child.instance = self.instance.get(id=item['id']) if self.instance else None
-                self.child.initial_data = item
-                validated = self.child.run_validation(item)
-            except ValidationError as exc:
-                errors.append(exc.detail)
-            else:
-                ret.append(validated)
-                errors.append({})
+        id_attr = self._get_update_lookup_field()
+        self._instance_map = self._load_instance_map(data) if self.instance is not None else None
+
+        primed = self._prefetch_related_values(data)
+        try:
+            for item in data:
+                try:
+                    if self._instance_map is not None:
+                        self.child.instance = self._get_child_instance(item, id_attr)
+                    else:
+                        self.child.instance = None
+                    self.child.initial_data = item
+                    validated = self.child.run_validation(item)
+                except ValidationError as exc:
+                    errors.append(exc.detail)
+                else:
+                    ret.append(validated)
+                    errors.append({})
+        finally:
+            for field in primed:
+                field.clear_prefetch()
 
         if any(errors):
             raise ValidationError(errors)
 
         return ret
 
+    def _get_child_instance(self, item, id_attr):
+        if not isinstance(item, dict) or item.get(id_attr) is None:
+            raise ValidationError({id_attr: ['This field is required.']}, code='required')
+
+        instance = self._instance_map.get(self._to_lookup_key(item[id_attr]))
+        if instance is None:
+            raise ValidationError(
+                {id_attr: ['Object with {}={} does not exist.'.format(id_attr, item[id_attr])]},
+                code='does_not_exist',
+            )
+        return instance
+
+    def _bulk_persistence_config(self):
+        config = getattr(settings, 'BULK_PERSISTENCE', {})
+        meta = self.child.Meta
+        enabled = getattr(meta, 'bulk_persistence', config.get('ENABLED', False))
+        batch_size = getattr(meta, 'bulk_batch_size', config.get('BATCH_SIZE', 500))
+        return enabled, batch_size
+
+    def _can_bulk_persist(self, method_name, all_validated_data):
+        """
+        Bulk persistence is only used for plain rows: the child must keep the
+        default ModelSerializer create/update and no to-many values may be set.
+        """
+        enabled, _ = self._bulk_persistence_config()
+        if not enabled:
+            return False
+
+        if getattr(type(self.child), method_name) is not getattr(serializers.ModelSerializer, method_name):
+            return False
+
+        relations = model_meta.get_field_info(self.child.Meta.model).relations
+        for attrs in all_validated_data:
+            for attr in attrs:
+                if attr in relations and relations[attr].to_many:
+                    return False
+        return True
+
+    def create(self, validated_data):
+        if not self._can_bulk_persist('create', validated_data):
+            return super().create(validated_data)
+
+        model = self.child.Meta.model
+        _, batch_size = self._bulk_persistence_config()
+        objs = [model(**attrs) for attrs in validated_data]
+
+        with transaction.atomic():
+            return bulk_create_rows(model, objs, batch_size, get_history_user(self.context))
+
+    def update(self, queryset, all_validated_data):
+        instance_map = getattr(self, '_instance_map', None)
+        if instance_map is None:
+            return super().update(queryset, all_validated_data)
+
+        id_attr = self._get_update_lookup_field()
+        pairs = [
+            (instance_map[self._to_lookup_key(attrs.pop(id_attr))], attrs)
+            for attrs in all_validated_data
+        ]
+
+        if not self._can_bulk_persist('update', all_validated_data):
+            return [self.child.update(obj, attrs) for obj, attrs in pairs]
+
+        model = self.child.Meta.model
+        _, batch_size = self._bulk_persistence_config()
+        objs = []
+        update_fields = set()
+        for obj, attrs in pairs:
+            for attr, value in attrs.items():
+                setattr(obj, attr, value)
+                update_fields.add(attr)
+            objs.append(obj)
+
+        if not update_fields:
+            return objs
+
+        update_fields.update(touch_auto_now_fields(model, objs))
+
+        with transaction.atomic():
+            return bulk_update_rows(
+                model, objs, sorted(update_fields), batch_size, get_history_user(self.context)
+            )
+
 class AdaptedBulkListSerializer(AdaptedBulkListSerializerMixin, BulkListSerializer):
     pass
 
+_field_templates = {}
+
+
 class BulkModelSerializer(BulkSerializerMixin, serializers.ModelSerializer):
+    # Field name -> "app_label.Model" for related fields whose queryset can't
+    # be built at import time (circular imports). Resolved once per class.
+    lazy_querysets = {}
+
+    def get_fields(self):
+        """
+        ModelSerializer rebuilds every field from model introspection on each
+        instantiation (and nested many=True children are instantiated per
+        parent). Build them once per class and hand out copies.
+        """
+        cls = type(self)
+        template = _field_templates.get(cls)
+        if template is None:
+            template = super().get_fields()
+            for name, model_label in self.lazy_querysets.items():
+                field = template[name]
+                field = getattr(field, "child_relation", field)
+                field.queryset = apps.get_model(model_label)._default_manager.all()
+                # Field.__deepcopy__ rebuilds from the constructor kwargs
+                field._kwargs["queryset"] = field.queryset
+            _field_templates[cls] = template
+        return copy.deepcopy(template)
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        # Subclasses declare their own Meta, so default it to the adapted
+        # list serializer unless they pick a list_serializer_class themselves.
+        meta = cls.__dict__.get('Meta')
+        if meta is not None and not hasattr(meta, 'list_serializer_class'):
+            meta.list_serializer_class = AdaptedBulkListSerializer
+
     class Meta:
         list_serializer_class = AdaptedBulkListSerializer
         depth=2
-        readonly_feilds=['created','updated','user_add','is_system_generated','id','uuid']
\ No newline at end of file
+        readonly_feilds=['created','updated','user_add','is_system_generated','id','uuid']
@@ -0,0 +1,68 @@
+from functools import update_wrapper
+
+from asgiref.sync import sync_to_async
+from django.views.decorators.csrf import csrf_exempt
+
+
+class AsyncReadMixin:
+    """
+    Serves ``async_actions`` (list/retrieve by default) from a coroutine
+    view, so under ASGI a slow client only costs an open connection on the
+    event loop, not a thread. The database work of the request -
+    authentication on a principal cache miss, filtering, paging and
+    serialization - runs as one sync_to_async call, the same way Django's
+    async ORM methods reach the database. Other methods go through the usual
+    sync DRF view.
+    """
+
+    async_actions = ("list", "retrieve")
+
+    @classmethod
+    def as_view(cls, actions=None, **initkwargs):
+        view = super().as_view(actions, **initkwargs)
+        async_methods = {method for method, action in actions.items() if action in cls.async_actions}
+        if not async_methods:
+            return view
+        if "get" in async_methods:
+            async_methods.add("head")
+        sync_view = sync_to_async(view)
+
+        async def async_view(request, *args, **kwargs):
+            if "get" in actions and "head" not in actions:
+                actions["head"] = actions["get"]
+            if request.method.lower() not in async_methods:
+                return await sync_view(request, *args, **kwargs)
+
+            # As ViewSetMixin.as_view()'s view()
+            self = cls(**initkwargs)
+            self.action_map = actions
+            for method, action in actions.items():
+                setattr(self, method, getattr(self, action))
+            self.request = request
+            self.args = args
+            self.kwargs = kwargs
+            return await self.adispatch(request, *args, **kwargs)
+
+        update_wrapper(async_view, view)
+        return csrf_exempt(async_view)
+
+    def _handle(self, request, *args, **kwargs):
+        self.initial(request, *args, **kwargs)
+        handler = getattr(self, request.method.lower(), self.http_method_not_allowed)
+        return handler(request, *args, **kwargs)
+
+    async def adispatch(self, request, *args, **kwargs):
+        """APIView.dispatch() with the handler awaited."""
+        self.args = args
+        self.kwargs = kwargs
+        request = self.initialize_request(request, *args, **kwargs)
+        self.request = request
+        self.headers = self.default_response_headers
+
+        try:
+            response = await sync_to_async(self._handle)(request, *args, **kwargs)
+        except Exception as exc:
+            response = self.handle_exception(exc)
+
+        self.response = self.finalize_response(request, response, *args, **kwargs)
+        return self.response
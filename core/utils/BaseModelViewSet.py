@@ -1,12 +1,22 @@
 
+from django.http import StreamingHttpResponse
 from rest_framework import viewsets, permissions, filters, status
 from rest_framework.decorators import action
+from rest_framework.exceptions import PermissionDenied, ValidationError
+from rest_framework.parsers import MultiPartParser
 from rest_framework.response import Response
 from django_filters.rest_framework import DjangoFilterBackend
 from rest_framework_bulk.generics import BulkModelViewSet
-from master.models import Branch
 from core.utils.IsMainBranchOrOwnBranch import IsMainBranchOrOwnBranch
 from core.utils.userSession import get_current_user_branch
+from core.utils.BranchScopeRegistry import get_branch_scope
+from core.utils.RequestPrincipal import get_principal
+from core.utils.KeysetPagination import KeysetPagination
+from core.utils.RelationLabels import apply_label_plan, apply_sparse_plan, prefetch_labels
+from core.utils.SparseFieldsets import parse_field_paths, trim_serializer
+from core.utils.StreamingExport import CSVRenderer, NDJSONRenderer
+from core.utils.BulkImport import BulkImporter, detect_format, read_rows
+from core.utils.TreeIndex import TreeCycleError
 
 class IsAuthenticated(permissions.IsAuthenticated):
     pass
@@ -19,21 +29,19 @@ class BranchScopedMixin:
     def get_queryset(self):
         qs = super().get_queryset()
 
-        user = getattr(self.request, "user", None)
-        if not user or not user.is_authenticated:
+        principal = get_principal(self.request)
+        if principal is None:
             return qs.none()  # or just return qs if you want anonymous to see nothing
 
-        # If model has a branch field
-        model_cls = self.serializer_class.Meta.model
-        if any(f.name == "branch" for f in model_cls._meta.get_fields()):
-            branch = getattr(user, "branch", None)
-            if branch:
-                if getattr(branch, "is_main_branch", False):
-                    # Main branch → see everything
-                    return qs
-                else:
-                    # Non-main branch → filter only own branch
-                    return qs.filter(branch=branch)
+        # If model is branch-scoped (own branch FK or its parent document's)
+        scope = get_branch_scope(self.serializer_class.Meta.model)
+        if scope.is_scoped and principal.branch_id:
+            if principal.is_head_office:
+                # Main branch → see everything
+                return qs
+            else:
+                # Non-main branch → filter only own branch
+                return scope.filter(qs, principal.branch_id)
 
         # If no branch field, just return all
         return qs
@@ -46,42 +54,199 @@ class BaseModelViewSet(BranchScopedMixin, BulkModelViewSet):
     search_fields = []
     filterset_class = None
 
+    # Keyset pagination, opt-in per request with ?pagination=cursor. Document
+    # endpoints set (document date, created, id); the default is (created, id).
+    cursor_pagination_class = KeysetPagination
+    cursor_ordering = None
+
+    # Sparse fieldsets on reads: ?fields=id,name,items.qty keeps only those
+    # fields, ?expand=category renders pk relations as {"id", "label"}. The
+    # queryset is trimmed to match (only() and the joins still needed).
+    sparse_fields_query_param = "fields"
+    expand_query_param = "expand"
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        fields, expand = self.get_sparse_fieldsets()
+        if fields is None and expand is None:
+            # Join whatever the serializer's ReadablePKField labels need
+            return apply_label_plan(queryset, self.get_serializer_class())
+
+        serializer = self.get_serializer_class()(context=self.get_serializer_context())
+        trim_serializer(serializer, fields, expand)
+        return apply_sparse_plan(queryset, serializer, self.get_sparse_required_fields())
+
+    def get_serializer(self, *args, **kwargs):
+        serializer = super().get_serializer(*args, **kwargs)
+        fields, expand = self.get_sparse_fieldsets()
+        if fields is not None or expand is not None:
+            trim_serializer(serializer, fields, expand)
+        return serializer
+
+    def get_sparse_fieldsets(self):
+        """(fields, expand) path trees for a read request, (None, None) otherwise."""
+        if self.request is None or self.request.method not in ("GET", "HEAD"):
+            return None, None
+        params = self.request.query_params
+        return (
+            parse_field_paths(params.get(self.sparse_fields_query_param)),
+            parse_field_paths(params.get(self.expand_query_param)),
+        )
+
+    def get_sparse_required_fields(self):
+        """Columns the view reads itself and so must survive only()."""
+        required = []
+        scope = get_branch_scope(self.serializer_class.Meta.model)
+        if scope.stamp_field:
+            required.append(scope.stamp_field)
+        if isinstance(self.paginator, KeysetPagination):
+            required.extend(term.lstrip("-") for term in self.get_cursor_ordering())
+        return required
+
+    def get_cursor_ordering(self):
+        if self.cursor_ordering:
+            return self.cursor_ordering
+        return get_branch_scope(self.serializer_class.Meta.model).cursor_ordering
+
+    @property
+    def paginator(self):
+        if not hasattr(self, "_paginator"):
+            params = self.request.query_params if self.request is not None else {}
+            if params.get("pagination") == "cursor" or KeysetPagination.cursor_query_param in params:
+                self._paginator = self.cursor_pagination_class()
+            else:
+                self._paginator = super().paginator
+        return self._paginator
+
+    # GET <list route>/export/?format=csv|ndjson streams every row matching the
+    # list filters, read through a chunked iterator instead of pages.
+    export_chunk_size = 2000
+
+    @action(detail=False, methods=["get"], renderer_classes=[CSVRenderer, NDJSONRenderer])
+    def export(self, request, *args, **kwargs):
+        queryset = self.filter_queryset(self.get_queryset())
+        # Rows are read while streaming, after the request has finished;
+        # keep the database the router picks for this request.
+        queryset = queryset.using(queryset.db)
+        serializer = self.get_serializer()
+        rows = (
+            serializer.to_representation(obj)
+            for obj in queryset.iterator(chunk_size=self.export_chunk_size)
+        )
+
+        renderer = request.accepted_renderer
+        response = StreamingHttpResponse(
+            renderer.stream(rows),
+            content_type="{}; charset={}".format(renderer.media_type, renderer.charset),
+        )
+        filename = getattr(self, "basename", None) or self.serializer_class.Meta.model._meta.model_name
+        response["Content-Disposition"] = 'attachment; filename="{}.{}"'.format(filename, renderer.format)
+        return response
+
+    # POST <list route>/import/ with a multipart "file" (CSV or NDJSON, or set
+    # "format") creates rows chunk by chunk and returns a row-level report.
+    # "dry_run=true" validates without writing.
+    import_chunk_size = 1000
+
+    @action(detail=False, methods=["post"], url_path="import", url_name="import", parser_classes=[MultiPartParser])
+    def import_rows(self, request, *args, **kwargs):
+        upload = request.FILES.get("file")
+        if upload is None:
+            raise ValidationError({"file": ["Upload a CSV or NDJSON file."]})
+        try:
+            file_format = detect_format(upload.name, request.data.get("format"))
+        except ValueError as exc:
+            raise ValidationError({"format": [str(exc)]})
+
+        principal = get_principal(request)
+        importer = BulkImporter(
+            self.get_serializer_class(),
+            context=self.get_serializer_context(),
+            save_kwargs=self.get_branch_stamp(),
+            branch=principal.branch,
+            chunk_size=self.import_chunk_size,
+            dry_run=request.data.get("dry_run") in ("1", "true", "True"),
+            save=self.perform_create,
+        )
+        return Response(importer.run(read_rows(upload, file_format)))
+
+    # Rows flagged is_system_generated are read-only through the API.
+    system_generated_message = "System-generated records cannot be updated or deleted."
+    protected_methods = ("PUT", "PATCH", "DELETE")
+
+    def _is_system_generated_protected(self):
+        return get_branch_scope(self.serializer_class.Meta.model).system_generated
+
+    def check_system_generated(self, objs):
+        if any(getattr(obj, "is_system_generated", False) for obj in objs):
+            raise PermissionDenied(self.system_generated_message)
+
+    def get_object(self):
+        obj = super().get_object()
+        if self.request.method in self.protected_methods:
+            self.check_system_generated([obj])
+        return obj
+
+    def update(self, request, *args, **kwargs):
+        # As UpdateModelMixin.update, minus clearing the prefetch cache that
+        # perform_update() just filled for the response labels.
+        partial = kwargs.pop("partial", False)
+        instance = self.get_object()
+        serializer = self.get_serializer(instance, data=request.data, partial=partial)
+        serializer.is_valid(raise_exception=True)
+        self.perform_update(serializer)
+        return Response(serializer.data)
+
+    def perform_bulk_update(self, serializer):
+        # The bulk list serializer already loaded every target row during validation
+        instance_map = getattr(serializer, "_instance_map", None)
+        if instance_map is not None:
+            self.check_system_generated(instance_map.values())
+        return super().perform_bulk_update(serializer)
+
+    def perform_bulk_destroy(self, objects):
+        if self._is_system_generated_protected() and objects.filter(is_system_generated=True).exists():
+            raise PermissionDenied(self.system_generated_message)
+        return super().perform_bulk_destroy(objects)
+
     def _valid_branch_for(self, user):
         """Return a valid Branch object for this user, else None."""
-        branch = getattr(user, "branch", None)
-        if branch and Branch.objects.filter(pk=branch.pk).exists():
-            return branch
+        # The principal joins the branch, so a dangling branch_id comes back as None
+        principal = get_principal(self.request)
+        if principal is not None and principal.branch is not None:
+            return principal.branch
 
         # Optional fallback from session helper
         try:
-            fb_id = get_current_user_branch()
+            return get_current_user_branch()
         except Exception:
-            fb_id = None
-        if fb_id and Branch.objects.filter(pk=fb_id).exists():
-            return Branch.objects.get(pk=fb_id)
-
-        return None
+            return None
+
+    def get_branch_stamp(self):
+        """Save kwargs stamping the caller's branch on models that carry one."""
+        branch = get_principal(self.request).branch
+        scope = get_branch_scope(self.serializer_class.Meta.model)
+        if branch is not None and scope.stamp_field:
+            return {scope.stamp_field: branch}
+        return {}
+
+    def save_serializer(self, serializer):
+        extra = self.get_branch_stamp()
+        try:
+            if extra:
+                serializer.save(**extra)
+            else:
+                serializer.save()
+        except TreeCycleError as exc:
+            # Raised inside the save's transaction, so nothing was written
+            model = self.serializer_class.Meta.model
+            raise ValidationError({model.tree_parent_field: [str(exc)]})
+        prefetch_labels(serializer.instance, self.get_serializer_class())
 
     def perform_create(self, serializer):
-        branch = self.request.user.branch
-        extra = {}
-        model_cls = serializer.Meta.model
-        if branch is not None and any(f.name == "branch" for f in model_cls._meta.get_fields()):
-            extra["branch"] = branch
-        if extra:
-            serializer.save(**extra)
-        else:
-            serializer.save()
+        self.save_serializer(serializer)
 
     def perform_update(self, serializer):
-        extra = {}
-        branch = self.request.user.branch
-        model_cls = serializer.Meta.model
-        if branch is not None and any(f.name == "branch" for f in model_cls._meta.get_fields()):
-            extra["branch"] = branch
-        if extra:
-            serializer.save(**extra)
-        else:
-            serializer.save()
+        self.save_serializer(serializer)
 
 
@@ -0,0 +1,75 @@
+from django.apps import apps
+from django.db import models
+
+
+class BranchScope(object):
+    """
+    Branch-scoping metadata for one model, plus the other model facts
+    BaseModelViewSet checks on each request, computed once at startup.
+
+    ``field_path`` is the lookup used to filter rows by branch: ``branch`` for
+    models that carry the FK themselves, or ``<parent>__branch`` for line
+    models owned (CASCADE) by a branch-scoped document. ``stamp_field`` is set
+    only when the model has its own ``branch`` column to fill on write.
+
+    ``system_generated`` is set when the model has an ``is_system_generated``
+    column, i.e. when its system rows are write-protected.
+    ``cursor_ordering`` is the keyset order used when a viewset sets none:
+    (created, id) when the model has ``created``, else id alone.
+    """
+
+    def __init__(self, field_path=None, stamp_field=None, system_generated=False, cursor_ordering=("-id",)):
+        self.field_path = field_path
+        self.stamp_field = stamp_field
+        self.system_generated = system_generated
+        self.cursor_ordering = cursor_ordering
+
+    @property
+    def is_scoped(self):
+        return self.field_path is not None
+
+    def filter(self, queryset, branch):
+        return queryset.filter(**{self.field_path: branch})
+
+
+_registry = {}
+
+
+def _has_branch_fk(model):
+    try:
+        field = model._meta.get_field("branch")
+    except Exception:
+        return False
+    return field.many_to_one and not field.auto_created
+
+
+def _build_scope(model):
+    names = {f.name for f in model._meta.concrete_fields}
+    facts = {
+        "system_generated": "is_system_generated" in names,
+        "cursor_ordering": ("-created", "-id") if "created" in names else ("-id",),
+    }
+    if _has_branch_fk(model):
+        return BranchScope(field_path="branch", stamp_field="branch", **facts)
+
+    for field in model._meta.concrete_fields:
+        if not field.many_to_one or field.remote_field.on_delete is not models.CASCADE:
+            continue
+        if _has_branch_fk(field.related_model):
+            return BranchScope(field_path="{}__branch".format(field.name), **facts)
+
+    return BranchScope(**facts)
+
+
+def build_branch_scope_registry():
+    """Populate the registry for every installed model. Called from CoreConfig.ready()."""
+    _registry.clear()
+    for model in apps.get_models():
+        _registry[model] = _build_scope(model)
+
+
+def get_branch_scope(model):
+    scope = _registry.get(model)
+    if scope is None:
+        scope = _registry[model] = _build_scope(model)
+    return scope
@@ -0,0 +1,228 @@
+import codecs
+import csv
+import json
+
+from django.core.exceptions import FieldDoesNotExist
+from django.db import DatabaseError, transaction
+from django.db.models import Q
+from rest_framework.exceptions import ValidationError
+from rest_framework.settings import api_settings
+
+from core.utils.BranchScopeRegistry import get_branch_scope
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+FORMATS = ("csv", "ndjson")
+LOOKUP_SEPARATOR = "__"
+_AMBIGUOUS = object()
+
+
+def detect_format(filename, requested=None):
+    """``requested`` if given, else ndjson for .ndjson/.jsonl files and csv otherwise."""
+    if requested:
+        requested = requested.lower()
+        if requested not in FORMATS:
+            raise ValueError("Unsupported format {!r}; use one of {}.".format(requested, ", ".join(FORMATS)))
+        return requested
+    extension = (filename or "").rsplit(".", 1)[-1].lower()
+    return "ndjson" if extension in ("ndjson", "jsonl") else "csv"
+
+
+def read_csv(lines):
+    """(row, error) pairs from an iterable of byte lines. Empty cells are left out of the row."""
+    reader = csv.DictReader(codecs.iterdecode(lines, "utf-8-sig"))
+    for record in reader:
+        yield {key.strip(): value for key, value in record.items() if key and value not in ("", None)}, None
+
+
+def read_ndjson(lines):
+    """(row, error) pairs from an iterable of byte lines holding one JSON object each."""
+    loads = orjson.loads if orjson is not None else json.loads
+    for line in lines:
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            data = loads(line)
+        except ValueError as exc:
+            yield None, "Invalid JSON: {}".format(exc)
+            continue
+        if not isinstance(data, dict):
+            yield None, "Expected a JSON object."
+            continue
+        yield data, None
+
+
+def read_rows(lines, file_format):
+    return {"csv": read_csv, "ndjson": read_ndjson}[file_format](lines)
+
+
+class BulkImporter(object):
+    """
+    Validates and writes rows from read_rows() in chunks of ``chunk_size``
+    with ``serializer_class`` (a bulk list serializer, so each chunk is one
+    bulk_create in its own transaction). Only one chunk is held at a time.
+
+    Columns named ``<fk>__<field>`` (``account__code``, ``currency__code``)
+    are resolved to ``<fk>`` pks with one query per column per chunk; for
+    branch-scoped targets the lookup is limited to ``branch``.
+
+    ``save`` writes a validated chunk, by default ``serializer.save(**save_kwargs)``;
+    the API passes its viewset's perform_create so the same hooks run as for
+    a bulk POST (ledger posting, for one). A ValidationError it raises fails
+    the whole chunk, which is rolled back.
+
+    run() returns ``{"rows", "created", "failed", "errors"}`` where errors
+    lists ``{"row": n, "errors": {...}}`` (1-based data rows), capped at
+    ``max_errors`` entries.
+    """
+
+    def __init__(self, serializer_class, context=None, save_kwargs=None, branch=None,
+                 chunk_size=1000, max_errors=1000, dry_run=False, save=None):
+        self.serializer_class = serializer_class
+        self.model = serializer_class.Meta.model
+        self.context = context or {}
+        self.save_kwargs = save_kwargs or {}
+        self.save = save or self.default_save
+        self.branch = branch
+        self.chunk_size = chunk_size
+        self.max_errors = max_errors
+        self.dry_run = dry_run
+
+    def run(self, records):
+        report = {"rows": 0, "created": 0, "failed": 0, "errors": []}
+        if self.dry_run:
+            report["valid"] = report.pop("created")
+
+        chunk = []
+        try:
+            for data, error in records:
+                report["rows"] += 1
+                if error is not None:
+                    self.fail(report, report["rows"], {api_settings.NON_FIELD_ERRORS_KEY: [error]})
+                    continue
+                chunk.append((report["rows"], data))
+                if len(chunk) >= self.chunk_size:
+                    self.process_chunk(chunk, report)
+                    chunk = []
+        except (csv.Error, UnicodeDecodeError) as exc:
+            # The rest of the file can't be read reliably
+            report["rows"] += 1
+            self.fail(report, report["rows"], {api_settings.NON_FIELD_ERRORS_KEY: ["Could not read file: {}".format(exc)]})
+
+        if chunk:
+            self.process_chunk(chunk, report)
+        return report
+
+    def default_save(self, serializer):
+        serializer.save(**self.save_kwargs)
+
+    def fail(self, report, row_number, errors):
+        report["failed"] += 1
+        if len(report["errors"]) < self.max_errors:
+            report["errors"].append({"row": row_number, "errors": errors})
+
+    def process_chunk(self, chunk, report):
+        pending = []
+        for (row_number, row), errors in zip(chunk, self.resolve_lookups([row for _, row in chunk])):
+            if errors:
+                self.fail(report, row_number, errors)
+            else:
+                pending.append((row_number, row))
+
+        # A list serializer is all-or-nothing: drop the invalid rows and
+        # validate the rest again.
+        serializer = None
+        while pending:
+            serializer = self.serializer_class(data=[row for _, row in pending], many=True, context=self.context)
+            if serializer.is_valid():
+                break
+            valid = []
+            for (row_number, row), errors in zip(pending, serializer.errors):
+                if errors:
+                    self.fail(report, row_number, errors)
+                else:
+                    valid.append((row_number, row))
+            pending = valid
+        if not pending:
+            return
+
+        if self.dry_run:
+            report["valid"] += len(pending)
+            return
+
+        try:
+            with transaction.atomic():
+                self.save(serializer)
+        except ValidationError as exc:
+            errors = exc.detail if isinstance(exc.detail, dict) else {api_settings.NON_FIELD_ERRORS_KEY: exc.detail}
+            for row_number, _ in pending:
+                self.fail(report, row_number, errors)
+            return
+        except DatabaseError as exc:
+            for row_number, _ in pending:
+                self.fail(report, row_number, {api_settings.NON_FIELD_ERRORS_KEY: ["Could not be saved: {}".format(exc)]})
+            return
+        report["created"] += len(pending)
+
+    def _lookup_columns(self, rows):
+        """``<fk>__<field>`` columns present in ``rows`` -> (fk name, related model, field)."""
+        columns = {}
+        for row in rows:
+            for column in row:
+                if column in columns or LOOKUP_SEPARATOR not in column:
+                    continue
+                name, lookup = column.split(LOOKUP_SEPARATOR, 1)
+                try:
+                    field = self.model._meta.get_field(name)
+                    forward = field.concrete and (field.many_to_one or field.one_to_one)
+                    related_field = field.related_model._meta.get_field(lookup) if forward else None
+                except FieldDoesNotExist:
+                    related_field = None
+                if related_field is None or related_field.is_relation:
+                    columns[column] = None
+                    continue
+                columns[column] = (name, field.related_model, lookup)
+        return {column: spec for column, spec in columns.items() if spec is not None}
+
+    def _fetch_lookup(self, related_model, lookup, values):
+        queryset = related_model._default_manager.filter(**{"{}__in".format(lookup): values})
+        scope = get_branch_scope(related_model)
+        if self.branch is not None and scope.stamp_field:
+            queryset = queryset.filter(
+                Q(**{scope.stamp_field: self.branch}) | Q(**{"{}__isnull".format(scope.stamp_field): True})
+            )
+        matches = {}
+        for key, pk in queryset.values_list(lookup, "pk"):
+            key = str(key)
+            matches[key] = _AMBIGUOUS if key in matches else pk
+        return matches
+
+    def resolve_lookups(self, rows):
+        """Replace lookup columns with pks in place; returns a per-row errors dict (empty if fine)."""
+        errors = [{} for _ in rows]
+        for column, (name, related_model, lookup) in self._lookup_columns(rows).items():
+            values = {str(row[column]) for row in rows if row.get(column) is not None}
+            matches = self._fetch_lookup(related_model, lookup, values) if values else {}
+            for row, row_errors in zip(rows, errors):
+                if column not in row:
+                    continue
+                value = row.pop(column)
+                if value is None:
+                    continue
+                if name in row:
+                    row_errors[column] = ["Give either {} or {}, not both.".format(name, column)]
+                    continue
+                pk = matches.get(str(value))
+                if pk is None:
+                    row_errors[column] = ["{} with {} \"{}\" does not exist.".format(
+                        related_model._meta.verbose_name.capitalize(), lookup, value)]
+                elif pk is _AMBIGUOUS:
+                    row_errors[column] = ["More than one {} has {} \"{}\".".format(
+                        related_model._meta.verbose_name, lookup, value)]
+                else:
+                    row[name] = str(pk)
+        return errors
@@ -0,0 +1,62 @@
+from rest_framework import parsers, renderers
+from rest_framework.utils import encoders
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import get_encoding
+
+try:
+    import orjson
+except ImportError:  # optional: fall back to the stock DRF classes
+    orjson = None
+
+
+_drf_default = encoders.JSONEncoder().default
+
+
+def _default(obj):
+    # Anything orjson does not handle natively (Decimal, lazy strings,
+    # querysets, timedelta ...) is encoded exactly like DRF's JSONEncoder.
+    return _drf_default(obj)
+
+
+class ORJSONRenderer(renderers.JSONRenderer):
+    """
+    JSONRenderer backed by orjson. UUIDs, dates and datetimes are encoded
+    natively in the same form DRF produces (UTC as ``Z``); everything else
+    goes through DRF's encoder. Indented or ASCII-only output, or a missing
+    orjson, falls back to the stock renderer.
+    """
+
+    options = (orjson.OPT_UTC_Z | orjson.OPT_NON_STR_KEYS) if orjson else 0
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b""
+
+        if orjson is None or self.ensure_ascii or not self.compact:
+            return super().render(data, accepted_media_type, renderer_context)
+        if self.get_indent(accepted_media_type, renderer_context or {}) is not None:
+            return super().render(data, accepted_media_type, renderer_context)
+
+        ret = orjson.dumps(data, default=_default, option=self.options)
+
+        # Keep JSONRenderer's escaping of U+2028/U+2029 (strict JS subset)
+        if b"\xe2\x80\xa8" in ret or b"\xe2\x80\xa9" in ret:
+            ret = ret.replace(b"\xe2\x80\xa8", b"\\u2028").replace(b"\xe2\x80\xa9", b"\\u2029")
+        return ret
+
+
+class ORJSONParser(parsers.JSONParser):
+    """JSONParser backed by orjson for UTF-8 bodies (orjson rejects NaN/Infinity like strict mode)."""
+
+    renderer_class = ORJSONRenderer
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        parser_context = parser_context or {}
+        encoding = get_encoding(parser_context)
+        if orjson is None or not self.strict or encoding.lower().replace("-", "") != "utf8":
+            return super().parse(stream, media_type, parser_context)
+
+        try:
+            return orjson.loads(stream.read())
+        except ValueError as exc:
+            raise ParseError("JSON parse error - %s" % str(exc))
@@ -1,19 +1,57 @@
-from rest_framework.permissions import BasePermission
+from rest_framework.permissions import SAFE_METHODS, BasePermission
+
+from core.utils.BranchScopeRegistry import get_branch_scope
+from core.utils.RequestPrincipal import get_principal
 
 class IsMainBranchOrOwnBranch(BasePermission):
     """
     Allows access to all data if user is from the main branch.
-    Otherwise, restricts access to data from user's own branch.
+    Otherwise, restricts access to data from user's own branch. Models
+    with no branch at all (Branch, Currency, TaxRate ...) are shared by
+    every branch, so only the main branch may write them.
     """
 
+    def _can_write_shared(self, request, principal):
+        # Users without a branch are not branch-restricted anywhere
+        return (
+            request.method in SAFE_METHODS
+            or not principal.branch_id
+            or principal.is_head_office
+            or principal.user.is_superuser
+        )
+
     def has_permission(self, request, view):
         # Safe methods like GET, HEAD, OPTIONS are allowed generally
-        return request.user and request.user.is_authenticated
+        if not (request.user and request.user.is_authenticated):
+            return False
+        if request.method in SAFE_METHODS:
+            return True
+
+        # Checked here as well as per object: creates and bulk writes
+        # never reach has_object_permission()
+        principal = get_principal(request)
+        if principal is None:
+            return False
+        serializer_class = getattr(view, "serializer_class", None)
+        model = getattr(getattr(serializer_class, "Meta", None), "model", None)
+        if model is not None and not get_branch_scope(model).is_scoped:
+            return self._can_write_shared(request, principal)
+        return True
 
     def has_object_permission(self, request, view, obj):
+        principal = get_principal(request)
+        if principal is None:
+            return False
+
         # If user is from main branch, allow everything
-        if request.user.branch and request.user.branch.is_main_branch:
+        if principal.is_head_office:
             return True
 
-        # Otherwise, restrict access to user's own branch
-        return hasattr(obj, 'branch_display') and obj.branch_display == request.user.branch
+        # Otherwise, restrict access to user's own branch. Line models are
+        # scoped through their document by the viewset queryset already.
+        scope = get_branch_scope(type(obj))
+        if not scope.is_scoped:
+            return self._can_write_shared(request, principal)
+        if not scope.stamp_field or not principal.branch_id:
+            return True
+        return getattr(obj, "branch_id", None) == principal.branch_id
@@ -0,0 +1,161 @@
+import json
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+from collections import OrderedDict
+
+from django.core.exceptions import ValidationError as DjangoValidationError
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination, _positive_int
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+
+class KeysetPagination(BasePagination):
+    """
+    Keyset (seek) pagination over the viewset's ``cursor_ordering``, e.g.
+    ``("-invoice_date", "-created", "-id")``. The cursor holds the ordering
+    values of the boundary row, so every page is one indexed range scan with
+    ``LIMIT page_size + 1`` and deep pages cost the same as the first.
+
+    No ``COUNT(*)`` is run unless the client asks for it with ``?count=true``.
+    """
+
+    cursor_query_param = "cursor"
+    page_size_query_param = "page_size"
+    count_query_param = "count"
+    max_page_size = 1000
+    invalid_cursor_message = "Invalid cursor"
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.base_url = request.build_absolute_uri()
+        self.page_size = self.get_page_size(request)
+        self.ordering = [self._parse_ordering(term) for term in view.get_cursor_ordering()]
+        self.model = queryset.model
+
+        self.count = None
+        if request.query_params.get(self.count_query_param) in ("1", "true", "True"):
+            self.count = queryset.count()
+
+        position, self.reverse = self.decode_cursor(request)
+
+        queryset = queryset.order_by(*self._order_by(self.reverse))
+        if position is not None:
+            queryset = queryset.filter(self._seek_filter(position, self.reverse))
+
+        rows = list(queryset[:self.page_size + 1])
+        has_more = len(rows) > self.page_size
+        rows = rows[:self.page_size]
+        if self.reverse:
+            rows.reverse()
+
+        if self.reverse:
+            self.has_next, self.has_previous = position is not None, has_more
+        else:
+            self.has_next, self.has_previous = has_more, position is not None
+
+        self.first_position = self._position(rows[0]) if rows else None
+        self.last_position = self._position(rows[-1]) if rows else None
+        return rows
+
+    def get_page_size(self, request):
+        try:
+            return _positive_int(
+                request.query_params[self.page_size_query_param],
+                strict=True,
+                cutoff=self.max_page_size,
+            )
+        except (KeyError, ValueError):
+            return api_settings.PAGE_SIZE or 20
+
+    def _parse_ordering(self, term):
+        descending = term.startswith("-")
+        name = term.lstrip("-")
+        return name, descending
+
+    def _order_by(self, reverse):
+        return [
+            ("-" if descending != reverse else "") + name
+            for name, descending in self.ordering
+        ]
+
+    def _seek_filter(self, position, reverse):
+        """
+        Rows strictly after ``position`` in the current direction:
+        (a > x) OR (a = x AND b > y) OR (a = x AND b = y AND c > z) ...
+        """
+        seek = Q()
+        equal = Q()
+        for (name, descending), value in zip(self.ordering, position):
+            lookup = "lt" if descending != reverse else "gt"
+            seek |= equal & Q(**{"{}__{}".format(name, lookup): value})
+            equal &= Q(**{name: value})
+
+        # Leading inclusive bound so the planner can range-scan the index
+        name, descending = self.ordering[0]
+        bound = "lte" if descending != reverse else "gte"
+        return Q(**{"{}__{}".format(name, bound): position[0]}) & seek
+
+    def _position(self, obj):
+        return [getattr(obj, self.model._meta.get_field(name).attname) for name, _ in self.ordering]
+
+    def encode_cursor(self, position, reverse):
+        values = [value.isoformat() if hasattr(value, "isoformat") else str(value) for value in position]
+        payload = json.dumps({"p": values, "r": int(reverse)}, separators=(",", ":"))
+        cursor = urlsafe_b64encode(payload.encode("ascii")).decode("ascii")
+        return replace_query_param(self.base_url, self.cursor_query_param, cursor)
+
+    def decode_cursor(self, request):
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None, False
+
+        try:
+            payload = json.loads(urlsafe_b64decode(encoded.encode("ascii")).decode("ascii"))
+            values = payload["p"]
+            reverse = bool(payload.get("r"))
+            if len(values) != len(self.ordering):
+                raise ValueError
+            position = [
+                self.model._meta.get_field(name).to_python(value)
+                for (name, _), value in zip(self.ordering, values)
+            ]
+        except (TypeError, ValueError, KeyError, UnicodeError, DjangoValidationError):
+            raise NotFound(self.invalid_cursor_message)
+        return position, reverse
+
+    def get_next_link(self):
+        if not self.has_next:
+            return None
+        if self.last_position is None:
+            return None
+        return self.encode_cursor(self.last_position, False)
+
+    def get_previous_link(self):
+        if not self.has_previous:
+            return None
+        if self.first_position is None:
+            return remove_query_param(self.base_url, self.cursor_query_param)
+        return self.encode_cursor(self.first_position, True)
+
+    def get_paginated_response(self, data):
+        body = OrderedDict()
+        if self.count is not None:
+            body["count"] = self.count
+        body["next"] = self.get_next_link()
+        body["previous"] = self.get_previous_link()
+        body["results"] = data
+        return Response(body)
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            "type": "object",
+            "required": ["results"],
+            "properties": {
+                "count": {"type": "integer", "example": 123},
+                "next": {"type": "string", "nullable": True, "format": "uri"},
+                "previous": {"type": "string", "nullable": True, "format": "uri"},
+                "results": schema,
+            },
+        }
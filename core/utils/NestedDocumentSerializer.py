@@ -0,0 +1,143 @@
+import uuid
+
+from django.conf import settings
+from django.db import transaction
+
+from core.utils.AdaptedBulkListSerializer import (
+    bulk_create_rows,
+    bulk_update_rows,
+    get_history_user,
+    touch_auto_now_fields,
+)
+
+
+class NestedDocumentSerializerMixin(object):
+    """
+    Writes a document header together with its lines.
+
+    ``line_field`` is the nested ``many=True`` field holding the lines and must
+    match the reverse accessor on the header model (``items``, ``lines`` ...).
+    Header totals are computed in memory before the single header insert, and
+    all lines are inserted with one ``bulk_create``. On update, incoming lines
+    are matched to existing ones by id so unchanged lines are left alone and
+    every line keeps its identity.
+    """
+
+    line_field = "items"
+
+    def get_line_defaults(self, header):
+        """Values applied to every line unless the line sets them itself."""
+        return {}
+
+    def compute_header_totals(self, lines_data):
+        """Header fields derived from the lines, assigned before the header is saved."""
+        return {}
+
+    def _get_line_relation(self):
+        rel = self.Meta.model._meta.get_field(self.line_field)
+        return rel.related_model, rel.field.name
+
+    def _build_line(self, header, line, defaults):
+        line_model, fk_name = self._get_line_relation()
+        values = {**defaults, **line}
+        if not values.get("id"):
+            values["id"] = uuid.uuid4()
+        values[fk_name] = header
+        return line_model(**values)
+
+    def _get_batch_size(self):
+        return getattr(settings, "BULK_PERSISTENCE", {}).get("BATCH_SIZE")
+
+    def _insert_lines(self, header, lines_data):
+        if not lines_data:
+            return []
+        line_model, _ = self._get_line_relation()
+        defaults = self.get_line_defaults(header)
+        lines = [self._build_line(header, line, defaults) for line in lines_data]
+        return bulk_create_rows(line_model, lines, self._get_batch_size(), get_history_user(self.context))
+
+    def _apply_line_changes(self, line, values):
+        """
+        Assign ``values`` to an existing line and return the names of the
+        fields that actually changed. Relations are compared by id so no
+        related rows are loaded.
+        """
+        changed = []
+        for name, value in values.items():
+            if name == "id":
+                continue
+            field = line._meta.get_field(name)
+            if field.is_relation:
+                current = getattr(line, field.attname)
+                incoming = value.pk if value is not None else None
+            else:
+                current = getattr(line, name)
+                incoming = value
+            if current != incoming:
+                setattr(line, name, value)
+                changed.append(name)
+        return changed
+
+    def _sync_lines(self, header, lines_data):
+        """
+        Diff incoming lines against the stored ones: delete the missing ones
+        with one ``id__in`` delete, ``bulk_update`` the changed ones and
+        ``bulk_create`` the new ones.
+        """
+        line_model, _ = self._get_line_relation()
+        existing = {str(line.pk): line for line in getattr(header, self.line_field).all()}
+
+        new_lines = []
+        changed_lines = []
+        changed_fields = set()
+        kept = set()
+        for values in lines_data:
+            key = str(values["id"]) if values.get("id") else None
+            line = existing.get(key)
+            if line is None:
+                new_lines.append(values)
+                continue
+            kept.add(key)
+            changed = self._apply_line_changes(line, values)
+            if changed:
+                changed_lines.append(line)
+                changed_fields.update(changed)
+
+        removed = [line.pk for key, line in existing.items() if key not in kept]
+        if removed:
+            line_model.objects.filter(pk__in=removed).delete()
+
+        if changed_lines:
+            changed_fields.update(touch_auto_now_fields(line_model, changed_lines))
+            bulk_update_rows(
+                line_model,
+                changed_lines,
+                sorted(changed_fields),
+                self._get_batch_size(),
+                get_history_user(self.context),
+            )
+
+        self._insert_lines(header, new_lines)
+
+    def create(self, validated_data):
+        lines_data = validated_data.pop(self.line_field, [])
+        validated_data.update(self.compute_header_totals(lines_data))
+
+        with transaction.atomic():
+            header = self.Meta.model.objects.create(**validated_data)
+            self._insert_lines(header, lines_data)
+        return header
+
+    def update(self, instance, validated_data):
+        lines_data = validated_data.pop(self.line_field, None)
+        if lines_data is not None:
+            validated_data.update(self.compute_header_totals(lines_data))
+
+        for key, value in validated_data.items():
+            setattr(instance, key, value)
+
+        with transaction.atomic():
+            instance.save()
+            if lines_data is not None:
+                self._sync_lines(instance, lines_data)
+        return instance
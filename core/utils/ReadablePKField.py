@@ -0,0 +1,70 @@
+from django.core.exceptions import ValidationError as DjangoValidationError
+from rest_framework import serializers
+
+
+class ReadablePKField(serializers.PrimaryKeyRelatedField):
+    """
+    Shows readable string in response while still being PK-based.
+
+    Labels come from the related object's ``__str__``; BaseModelViewSet
+    select_related()s the columns they need (see core.utils.RelationLabels).
+    """
+
+    def __init__(self, *args, **kwargs):
+        self._placeholder_queryset = object()
+        if kwargs.get("queryset") is None and not kwargs.get("read_only", False):
+            kwargs["queryset"] = self._placeholder_queryset
+        super().__init__(*args, **kwargs)
+
+    def use_pk_only_optimization(self):
+        # The label needs the related object, not just its pk
+        return False
+
+    def get_queryset(self):
+        queryset = self.queryset
+        if queryset is self._placeholder_queryset:
+            return None
+        if hasattr(queryset, "all"):
+            return queryset.all()
+        return queryset
+
+    def _lookup_key(self, model, data):
+        if isinstance(data, bool):
+            return None
+        try:
+            return str(model._meta.pk.to_python(data))
+        except (DjangoValidationError, TypeError, ValueError):
+            return None
+
+    def prefetch(self, values):
+        """
+        Resolve every pk in ``values`` with one ``pk__in`` query; until
+        clear_prefetch(), to_internal_value() reads from the result. Values
+        that are not valid pks are left to the normal lookup so they keep
+        their usual error.
+        """
+        queryset = self.get_queryset()
+        if queryset is None:
+            return
+        keys = {self._lookup_key(queryset.model, value) for value in values} - {None}
+        self._prefetch_model = queryset.model
+        self._prefetched = {str(obj.pk): obj for obj in queryset.filter(pk__in=keys)} if keys else {}
+
+    def clear_prefetch(self):
+        self._prefetched = None
+
+    def to_internal_value(self, data):
+        prefetched = getattr(self, "_prefetched", None)
+        if prefetched is not None:
+            key = self._lookup_key(self._prefetch_model, data)
+            if key is not None:
+                obj = prefetched.get(key)
+                if obj is None:
+                    self.fail("does_not_exist", pk_value=data)
+                return obj
+        return super().to_internal_value(data)
+
+    def to_representation(self, value):
+        if value is None:
+            return None
+        return {"id": str(value.pk), "label": str(value)}
@@ -0,0 +1,187 @@
+from django.db.models import Prefetch, prefetch_related_objects
+from rest_framework import serializers
+
+from core.utils.ReadablePKField import ReadablePKField
+
+
+def get_label_related(model, _seen=None):
+    """
+    Relation paths a model's ``__str__`` walks, expanded recursively from the
+    ``label_related`` attribute each model declares, e.g. POSSession ->
+    ("shift", "shift__register").
+    """
+    seen = _seen or set()
+    if model in seen:
+        return ()
+    seen = seen | {model}
+
+    paths = []
+    for name in getattr(model, "label_related", ()):
+        paths.append(name)
+        related_model = model._meta.get_field(name).related_model
+        paths.extend("{}__{}".format(name, sub) for sub in get_label_related(related_model, seen))
+    return tuple(paths)
+
+
+class LabelPlan(object):
+    """
+    select_related paths and per-relation prefetch plans needed to render one
+    serializer, plus the concrete columns it reads (``only``). ``restrictable``
+    is False when some field reads something other than a model field, so the
+    columns cannot be narrowed safely.
+    """
+
+    def __init__(self):
+        self.select_related = []
+        self.prefetch = {}
+        self.only = []
+        self.restrictable = True
+
+    def add_prefetch(self, path, related_model, plan):
+        self.prefetch[path] = (related_model, plan)
+
+
+def _source_path(name, field):
+    source = field.source or name
+    return source.replace(".", "__")
+
+
+def _fields_of(serializer, bound):
+    return serializer.fields if bound else type(serializer)._declared_fields
+
+
+def _build_plan(fields, model, prefix="", bound=False):
+    """
+    Walk ``fields`` (a serializer class's declared fields, or with ``bound``
+    the fields of a serializer instance, possibly trimmed) against ``model``.
+    """
+    plan = LabelPlan()
+    for name, field in fields.items():
+        if field.write_only:
+            continue
+        if field.source == "*":
+            plan.restrictable = False
+            continue
+        path = _source_path(name, field)
+        try:
+            model_field = model._meta.get_field(path.split("__")[0])
+        except Exception:
+            plan.restrictable = False
+            continue
+        if not model_field.is_relation:
+            plan.only.append(model_field.name)
+            continue
+        related_model = model_field.related_model
+        full_path = prefix + path
+        single = not (model_field.many_to_many or model_field.one_to_many)
+        if model_field.concrete and single:
+            plan.only.append(model_field.name)
+            if "__" in path:
+                plan.restrictable = False
+        elif single:
+            # Reverse one-to-one or generic relation
+            plan.restrictable = False
+
+        if isinstance(field, ReadablePKField):
+            if not single:
+                continue
+            plan.select_related.append(full_path)
+            plan.select_related.extend("{}__{}".format(full_path, sub) for sub in get_label_related(related_model))
+        elif isinstance(field, serializers.ManyRelatedField) and isinstance(field.child_relation, ReadablePKField):
+            child_plan = LabelPlan()
+            child_plan.select_related.extend(get_label_related(related_model))
+            child_plan.restrictable = False
+            plan.add_prefetch(full_path, related_model, child_plan)
+        elif isinstance(field, serializers.ListSerializer):
+            child_plan = _build_plan(_fields_of(field.child, bound), related_model, bound=bound)
+            if model_field.one_to_many:
+                # The prefetch matches lines to their parent through this FK
+                child_plan.only.append(model_field.field.name)
+            else:
+                child_plan.restrictable = False
+            plan.add_prefetch(full_path, related_model, child_plan)
+        elif isinstance(field, serializers.ModelSerializer) and single:
+            nested = _build_plan(_fields_of(field, bound), related_model, prefix=full_path + "__", bound=bound)
+            plan.select_related.append(full_path)
+            plan.select_related.extend(nested.select_related)
+            plan.prefetch.update(nested.prefetch)
+    return plan
+
+
+_plans = {}
+
+
+def get_label_plan(serializer_class):
+    """Plan for ``serializer_class``, built once per class from its declared fields."""
+    plan = _plans.get(serializer_class)
+    if plan is None:
+        meta = getattr(serializer_class, "Meta", None)
+        model = getattr(meta, "model", None)
+        plan = _plans[serializer_class] = (
+            _build_plan(serializer_class._declared_fields, model) if model else LabelPlan()
+        )
+    return plan
+
+
+def _planned_prefetches(plan, restrict=False):
+    return [
+        Prefetch(path, queryset=apply_plan(related_model._default_manager.all(), child, restrict))
+        for path, (related_model, child) in plan.prefetch.items()
+    ]
+
+
+def apply_plan(queryset, plan, restrict=False):
+    if restrict and plan.restrictable:
+        queryset = queryset.only(*plan.only)
+    if plan.select_related:
+        queryset = queryset.select_related(*plan.select_related)
+    if plan.prefetch:
+        # Replace plain lookups such as prefetch_related("items") with the
+        # planned Prefetch, otherwise Django rejects the duplicate lookup.
+        kept = [
+            lookup for lookup in queryset._prefetch_related_lookups
+            if (lookup.prefetch_to if isinstance(lookup, Prefetch) else lookup) not in plan.prefetch
+        ]
+        queryset = queryset.prefetch_related(None).prefetch_related(*kept, *_planned_prefetches(plan, restrict))
+    return queryset
+
+
+def apply_label_plan(queryset, serializer_class):
+    """Add the select_related/prefetch_related needed to render labels without lazy loads."""
+    return apply_plan(queryset, get_label_plan(serializer_class))
+
+
+def apply_sparse_plan(queryset, serializer, required=()):
+    """
+    Load only what a trimmed serializer instance (see core.utils.SparseFieldsets)
+    renders: the queryset's own select_related/prefetch_related are replaced by
+    the joins its remaining fields need, and columns are narrowed with only()
+    plus ``required`` (fields the view itself reads, e.g. ``branch``).
+    """
+    if isinstance(serializer, serializers.ListSerializer):
+        serializer = serializer.child
+    plan = _build_plan(serializer.fields, queryset.model, bound=True)
+    if not plan.restrictable:
+        return apply_plan(queryset, plan)
+
+    plan.only.extend(required)
+    queryset = queryset.select_related(None).prefetch_related(None)
+    return apply_plan(queryset, plan, restrict=True)
+
+
+def prefetch_labels(instances, serializer_class):
+    """
+    Same as apply_label_plan() for objects that were just saved (and so were
+    not loaded through the viewset queryset), so the write response renders
+    labels without lazy loads.
+    """
+    if instances is None:
+        return
+    if not isinstance(instances, (list, tuple)):
+        instances = [instances]
+    plan = get_label_plan(serializer_class)
+    for obj in instances:
+        # Lines written by the serializer are not in the prefetch cache
+        getattr(obj, "_prefetched_objects_cache", {}).clear()
+    if instances and (plan.select_related or plan.prefetch):
+        prefetch_related_objects(list(instances), *plan.select_related, *_planned_prefetches(plan))
@@ -0,0 +1,88 @@
+from asgiref.local import Local
+from django.conf import settings
+from django.core.cache import cache
+from django.db import DEFAULT_DB_ALIAS, connections
+from django.utils.deprecation import MiddlewareMixin
+
+PIN_CACHE_KEY = "replica_pin:{}"
+SAFE_METHODS = ("GET", "HEAD", "OPTIONS")
+
+# Per-request routing state; asgiref's Local works for threads and async tasks
+_state = Local()
+
+
+def get_replica_alias():
+    return getattr(settings, "REPLICA_DATABASE", None)
+
+
+def _pinned_to_primary():
+    """True if this request's user wrote within the last REPLICA_PIN_SECONDS."""
+    pinned = getattr(_state, "pinned", None)
+    if pinned is not None:
+        return pinned
+    user = getattr(_state.request, "user", None)
+    if user is None or not user.is_authenticated:
+        # DRF authenticates inside the view; check again once it has
+        return False
+    _state.pinned = cache.get(PIN_CACHE_KEY.format(user.pk)) is not None
+    return _state.pinned
+
+
+class ReplicaRouter(object):
+    """
+    Sends reads made while serving a GET/HEAD request to REPLICA_DATABASE;
+    everything else (writes, reads in write requests, management commands)
+    uses the primary. After a request writes, its later reads stay on the
+    primary, and the user is pinned there for REPLICA_PIN_SECONDS so they
+    read their own writes while the replica catches up.
+    """
+
+    def db_for_read(self, model, **hints):
+        instance = hints.get("instance")
+        if instance is not None and instance._state.db:
+            # Related lookups follow the object they start from
+            return instance._state.db
+
+        replica = get_replica_alias()
+        if (
+            replica is None
+            or not getattr(_state, "safe", False)
+            or getattr(_state, "wrote", False)
+            or connections[DEFAULT_DB_ALIAS].in_atomic_block
+            or _pinned_to_primary()
+        ):
+            return DEFAULT_DB_ALIAS
+        return replica
+
+    def db_for_write(self, model, **hints):
+        if getattr(_state, "request", None) is not None:
+            _state.wrote = True
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # The replica is a copy of the primary
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        return db != get_replica_alias()
+
+
+class ReplicaRoutingMiddleware(MiddlewareMixin):
+    """Tracks the request for ReplicaRouter and pins users who wrote to the primary."""
+
+    def process_request(self, request):
+        _state.request = request
+        _state.safe = request.method in SAFE_METHODS
+        _state.wrote = False
+        _state.pinned = None
+
+    def process_response(self, request, response):
+        if getattr(_state, "wrote", False):
+            user = getattr(request, "user", None)
+            if user is not None and user.is_authenticated:
+                cache.set(PIN_CACHE_KEY.format(user.pk), True, getattr(settings, "REPLICA_PIN_SECONDS", 5))
+        _state.request = None
+        _state.safe = False
+        _state.wrote = False
+        _state.pinned = None
+        return response
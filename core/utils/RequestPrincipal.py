@@ -0,0 +1,143 @@
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db.models.signals import m2m_changed, post_delete, post_save
+from django.utils.translation import gettext_lazy as _
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed, InvalidToken
+from rest_framework_simplejwt.settings import api_settings as jwt_settings
+from rest_framework_simplejwt.utils import get_md5_hash_password
+
+CACHE_KEY = "principal:{}"
+
+
+class Principal(object):
+    """
+    Everything auth, permissions and branch scoping need about the caller:
+    the user with its branch joined and its groups prefetched. Cached per
+    user id for PRINCIPAL_CACHE_TIMEOUT seconds.
+    """
+
+    def __init__(self, user):
+        self.user = user
+        self.user_id = user.pk
+        self.branch = user.branch
+        self.branch_id = self.branch.pk if self.branch is not None else None
+        self.is_head_office = bool(self.branch is not None and self.branch.is_head_office)
+        groups = list(user.groups.all())
+        self.group_ids = frozenset(g.pk for g in groups)
+        self.group_names = frozenset(g.name for g in groups)
+
+
+def _get_timeout():
+    return getattr(settings, "PRINCIPAL_CACHE_TIMEOUT", 60)
+
+
+def load_principal(user_id):
+    """Return the Principal for ``user_id`` from cache, or load it; None if the user is gone."""
+    key = CACHE_KEY.format(user_id)
+    principal = cache.get(key)
+    if principal is not None:
+        return principal
+
+    user = (
+        get_user_model().objects
+        .select_related("branch")
+        .prefetch_related("groups")
+        .filter(pk=user_id)
+        .first()
+    )
+    if user is None:
+        return None
+
+    principal = Principal(user)
+    cache.set(key, principal, _get_timeout())
+    return principal
+
+
+def invalidate_principal(*user_ids):
+    cache.delete_many([CACHE_KEY.format(user_id) for user_id in user_ids])
+
+
+def _invalidate_user(sender, instance, **kwargs):
+    invalidate_principal(instance.pk)
+
+
+def _invalidate_branch_users(sender, instance, **kwargs):
+    invalidate_principal(*instance.users.values_list("pk", flat=True))
+
+
+def _invalidate_group_members(sender, instance, action, reverse, pk_set, **kwargs):
+    if not reverse:
+        if action.startswith("post_"):
+            invalidate_principal(instance.pk)
+    elif action in ("post_add", "post_remove"):
+        # instance is a Group and pk_set holds the affected user ids
+        invalidate_principal(*pk_set)
+    elif action == "pre_clear":
+        invalidate_principal(*instance.customuser_groups.values_list("pk", flat=True))
+
+
+def connect_principal_invalidation():
+    """Drop cached principals when a user, its branch or its groups change. Called from CoreConfig.ready()."""
+    from master.models import Branch
+
+    user_model = get_user_model()
+    post_save.connect(_invalidate_user, sender=user_model, dispatch_uid="principal_user_save")
+    post_delete.connect(_invalidate_user, sender=user_model, dispatch_uid="principal_user_delete")
+    post_save.connect(_invalidate_branch_users, sender=Branch, dispatch_uid="principal_branch_save")
+    m2m_changed.connect(
+        _invalidate_group_members, sender=user_model.groups.through, dispatch_uid="principal_user_groups"
+    )
+
+
+def get_principal(request):
+    """
+    Principal for the authenticated request user, memoised on the user
+    object so every layer of one request shares it.
+    """
+    user = getattr(request, "user", None)
+    if user is None or not user.is_authenticated:
+        return None
+
+    principal = getattr(user, "principal", None)
+    if principal is None:
+        principal = load_principal(user.pk)
+        user.principal = principal
+    return principal
+
+
+def _record_current_principal(principal):
+    # core.utils.userSession imports this module
+    from core.utils.userSession import set_current_principal
+
+    set_current_principal(principal)
+
+
+class PrincipalJWTAuthentication(JWTAuthentication):
+    """
+    JWTAuthentication that resolves the token's user through the principal
+    cache, so a warm request authenticates without touching the database.
+    """
+
+    def get_user(self, validated_token):
+        try:
+            user_id = validated_token[jwt_settings.USER_ID_CLAIM]
+        except KeyError:
+            raise InvalidToken(_("Token contained no recognizable user identification"))
+
+        principal = load_principal(user_id)
+        if principal is None:
+            raise AuthenticationFailed(_("User not found"), code="user_not_found")
+
+        user = principal.user
+        if jwt_settings.CHECK_USER_IS_ACTIVE and not user.is_active:
+            raise AuthenticationFailed(_("User is inactive"), code="user_inactive")
+
+        if jwt_settings.CHECK_REVOKE_TOKEN:
+            if validated_token.get(jwt_settings.REVOKE_TOKEN_CLAIM) != get_md5_hash_password(user.password):
+                raise AuthenticationFailed(_("The user's password has been changed."), code="password_changed")
+
+        user.principal = principal
+        _record_current_principal(principal)
+        return user
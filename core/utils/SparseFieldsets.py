@@ -0,0 +1,70 @@
+from rest_framework import serializers
+
+from core.utils.ReadablePKField import ReadablePKField
+
+
+def parse_field_paths(value):
+    """
+    Parse ``"id,name,items.product"`` into ``{"id": {}, "name": {}, "items":
+    {"product": {}}}``. An empty dict means "the whole field". Returns None
+    when the parameter is missing or blank.
+    """
+    if not value:
+        return None
+    tree = {}
+    for path in value.split(","):
+        node = tree
+        for part in path.strip().split("."):
+            part = part.strip()
+            if not part:
+                break
+            node = node.setdefault(part, {})
+    return tree or None
+
+
+def expand_relation(field):
+    """
+    Read-only ReadablePKField ({"id", "label"}) replacing a plain pk relation
+    field, or None if ``field`` is not one.
+    """
+    kwargs = {"read_only": True}
+    if field.source != field.field_name:
+        kwargs["source"] = field.source
+
+    if isinstance(field, serializers.ManyRelatedField):
+        child = field.child_relation
+        if isinstance(child, serializers.PrimaryKeyRelatedField) and not isinstance(child, ReadablePKField):
+            return ReadablePKField(many=True, **kwargs)
+        return None
+    if isinstance(field, serializers.PrimaryKeyRelatedField) and not isinstance(field, ReadablePKField):
+        return ReadablePKField(**kwargs)
+    return None
+
+
+def trim_serializer(serializer, fields=None, expand=None):
+    """
+    Drop the fields of ``serializer`` not named in ``fields`` and swap the pk
+    relations named in ``expand`` for labelled ones, recursing into nested
+    serializers with the dotted sub-paths. Naming a field in ``expand``
+    implies selecting it.
+    """
+    if isinstance(serializer, serializers.ListSerializer):
+        serializer = serializer.child
+    bound = serializer.fields
+    expand = expand or {}
+
+    if fields:
+        for name in list(bound):
+            if name not in fields and name not in expand:
+                del bound[name]
+
+    for name, field in list(bound.items()):
+        sub_fields = fields.get(name) if fields else None
+        sub_expand = expand.get(name)
+        if isinstance(field, serializers.BaseSerializer):
+            if sub_fields or sub_expand:
+                trim_serializer(field, sub_fields, sub_expand)
+        elif name in expand:
+            expanded = expand_relation(field)
+            if expanded is not None:
+                bound[name] = expanded
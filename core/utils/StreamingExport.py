@@ -0,0 +1,88 @@
+import csv
+
+from rest_framework import renderers
+
+from core.utils.FastJSON import ORJSONRenderer
+
+
+class _LineBuffer(object):
+    """File-like object for csv.writer that hands each written line back."""
+
+    def write(self, value):
+        return value
+
+
+def _batched(lines, size):
+    """Join encoded lines into chunks of ``size`` so the response is not written row by row."""
+    chunk = []
+    for line in lines:
+        chunk.append(line)
+        if len(chunk) >= size:
+            yield b"".join(chunk)
+            chunk = []
+    if chunk:
+        yield b"".join(chunk)
+
+
+class StreamingRenderer(renderers.BaseRenderer):
+    """
+    Renderer for BaseModelViewSet.export. ``stream(rows)`` turns an iterator of
+    serialized rows into encoded chunks for a StreamingHttpResponse; render()
+    covers ordinary responses such as errors.
+    """
+
+    charset = "utf-8"
+    rows_per_chunk = 500
+
+    def encode_rows(self, rows):
+        raise NotImplementedError
+
+    def stream(self, rows):
+        return _batched(self.encode_rows(rows), self.rows_per_chunk)
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b""
+        rows = data if isinstance(data, list) else [data]
+        return b"".join(self.encode_rows(rows))
+
+
+class NDJSONRenderer(StreamingRenderer):
+    media_type = "application/x-ndjson"
+    format = "ndjson"
+
+    def encode_rows(self, rows):
+        json_renderer = ORJSONRenderer()
+        for row in rows:
+            yield json_renderer.render(row) + b"\n"
+
+
+class CSVRenderer(StreamingRenderer):
+    """
+    Header from the first row's keys. Nested values (relation labels, lines)
+    are written as JSON in their cell; None is an empty cell.
+    """
+
+    media_type = "text/csv"
+    format = "csv"
+
+    def __init__(self):
+        self.json_renderer = ORJSONRenderer()
+
+    def cell(self, value):
+        if value is None:
+            return ""
+        if isinstance(value, bool):
+            return "true" if value else "false"
+        if isinstance(value, (dict, list)):
+            return self.json_renderer.render(value).decode(self.charset)
+        return value
+
+    def encode_rows(self, rows):
+        writer = csv.writer(_LineBuffer())
+        header = None
+        for row in rows:
+            if header is None:
+                header = list(row)
+                yield writer.writerow(header).encode(self.charset)
+            yield writer.writerow([self.cell(row.get(name)) for name in header]).encode(self.charset)
@@ -0,0 +1,243 @@
+import django_filters
+from django_filters.constants import EMPTY_VALUES
+from django.apps import apps
+from django.contrib.contenttypes.models import ContentType
+from django.db import transaction
+
+
+def _closure_model():
+    # core.models is loaded after the app models that use this mixin
+    return apps.get_model("core", "TreeClosure")
+
+
+def _closure(model):
+    return _closure_model().objects.filter(content_type=ContentType.objects.get_for_model(model))
+
+
+_UNLOADED = object()
+
+
+class TreeCycleError(ValueError):
+    """A write would make a node its own ancestor."""
+
+
+def _pk(node):
+    return getattr(node, "pk", node)
+
+
+def _parent_attname(model):
+    return model._meta.get_field(model.tree_parent_field).attname
+
+
+def descendants_of(queryset, node, include_self=True):
+    """``queryset`` narrowed to ``node`` (a row or id) and everything below it: one indexed semi-join."""
+    pairs = _closure(queryset.model).filter(ancestor_id=_pk(node))
+    if not include_self:
+        pairs = pairs.filter(depth__gt=0)
+    return queryset.filter(pk__in=pairs.values("descendant_id"))
+
+
+def ancestors_of(queryset, node, include_self=False):
+    """``queryset`` narrowed to the parents of ``node`` up to its root."""
+    pairs = _closure(queryset.model).filter(descendant_id=_pk(node))
+    if not include_self:
+        pairs = pairs.filter(depth__gt=0)
+    return queryset.filter(pk__in=pairs.values("ancestor_id"))
+
+
+def _closure_rows(closure_model, content_type_id, parents, known=None):
+    """
+    Closure rows for the nodes in ``parents`` ({id: parent_id}). ``known``
+    holds the (ancestor_id, depth) chains of parents outside ``parents``.
+    """
+    known = known or {}
+    chains = {}
+
+    def chain(node_id):
+        # Climb to the first node with a known chain, then fill in on the way down
+        trail = []
+        current = node_id
+        while current not in chains:
+            if current in trail:
+                raise TreeCycleError("Tree cycle through {}".format(current))
+            trail.append(current)
+            parent_id = parents[current]
+            if parent_id in parents:
+                current = parent_id
+                continue
+            above = known.get(parent_id, []) if parent_id is not None else []
+            chains[trail.pop()] = [(current, 0)] + [(a, d + 1) for a, d in above]
+            break
+        for child_id in reversed(trail):
+            chains[child_id] = [(child_id, 0)] + [(a, d + 1) for a, d in chains[parents[child_id]]]
+        return chains[node_id]
+
+    rows = []
+    for node_id in parents:
+        for ancestor_id, depth in chain(node_id):
+            rows.append(closure_model(
+                content_type_id=content_type_id,
+                ancestor_id=ancestor_id,
+                descendant_id=node_id,
+                depth=depth,
+            ))
+    return rows
+
+
+def _known_chains(closure, parent_ids):
+    known = {}
+    rows = closure.filter(descendant_id__in=parent_ids).values_list("descendant_id", "ancestor_id", "depth")
+    for descendant_id, ancestor_id, depth in rows:
+        known.setdefault(descendant_id, []).append((ancestor_id, depth))
+    return known
+
+
+def index_new_nodes(model, nodes):
+    """Add closure rows for freshly inserted ``nodes``; parents may be in the same batch."""
+    attname = _parent_attname(model)
+    parents = {node.pk: getattr(node, attname) for node in nodes}
+    if not parents:
+        return
+    closure = _closure(model)
+    outside = {parent_id for parent_id in parents.values() if parent_id is not None and parent_id not in parents}
+    rows = _closure_rows(
+        closure.model,
+        ContentType.objects.get_for_model(model).pk,
+        parents,
+        _known_chains(closure, outside) if outside else None,
+    )
+    closure.model.objects.bulk_create(rows, ignore_conflicts=True)
+    for node in nodes:
+        node._tree_parent_id = parents[node.pk]
+
+
+def move_node(model, node, parent_id):
+    """
+    Re-hang the subtree of ``node`` under ``parent_id``: drop the rows tying
+    it to its old ancestors and add the cross product with the new ones.
+    """
+    closure = _closure(model)
+    subtree = list(closure.filter(ancestor_id=node.pk).values_list("descendant_id", "depth"))
+    if not subtree:
+        index_new_nodes(model, [node])
+        return
+    subtree_ids = [descendant_id for descendant_id, _ in subtree]
+    if parent_id in subtree_ids:
+        raise TreeCycleError("Cannot move {} under its own descendant.".format(node))
+
+    closure.filter(descendant_id__in=subtree_ids).exclude(ancestor_id__in=subtree_ids).delete()
+    if parent_id is not None:
+        content_type_id = ContentType.objects.get_for_model(model).pk
+        above = closure.filter(descendant_id=parent_id).values_list("ancestor_id", "depth")
+        closure.model.objects.bulk_create([
+            closure.model(
+                content_type_id=content_type_id,
+                ancestor_id=ancestor_id,
+                descendant_id=descendant_id,
+                depth=ancestor_depth + 1 + depth,
+            )
+            for ancestor_id, ancestor_depth in above
+            for descendant_id, depth in subtree
+        ])
+    node._tree_parent_id = parent_id
+
+
+def sync_tree_index(model, nodes, created):
+    """Keep the closure table in step after ``nodes`` were bulk created or updated."""
+    if not issubclass(model, TreeIndexMixin):
+        return
+    if created:
+        index_new_nodes(model, nodes)
+        return
+    attname = _parent_attname(model)
+    for node in nodes:
+        if attname not in node.__dict__:
+            continue  # deferred and never assigned, so unchanged
+        parent_id = node.__dict__[attname]
+        if parent_id != node._tree_parent_id:
+            move_node(model, node, parent_id)
+
+
+def rebuild_closure(model, closure_model, content_type_id, parent_attname="parent_id", batch_size=1000):
+    """
+    Recompute every closure row of ``model`` from its parent column. Works on
+    migration-state models too, so data migrations can index existing rows.
+    """
+    parents = dict(model._default_manager.values_list("pk", parent_attname))
+    rows = _closure_rows(closure_model, content_type_id, parents)
+    closure_model._default_manager.filter(content_type_id=content_type_id).delete()
+    closure_model._default_manager.bulk_create(rows, batch_size=batch_size)
+    return len(rows)
+
+
+def rebuild_tree_index(model):
+    content_type = ContentType.objects.get_for_model(model)
+    with transaction.atomic():
+        return rebuild_closure(model, _closure_model(), content_type.pk, _parent_attname(model))
+
+
+class TreeIndexMixin(object):
+    """
+    Model mixin for adjacency-list trees (a ``parent`` self-FK). Ancestor /
+    descendant pairs are kept in core.TreeClosure as rows are saved, moved
+    or deleted, so subtree filters are one indexed join instead of a walk:
+
+        COA.descendants_of(assets)            # Assets and every account below
+        ProductCategory.ancestors_of(category)
+
+    Bulk writes through core.utils.AdaptedBulkListSerializer are indexed too.
+    """
+
+    tree_parent_field = "parent"
+    _tree_parent_id = None
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance._tree_parent_id = instance.__dict__.get(_parent_attname(cls), _UNLOADED)
+        return instance
+
+    @classmethod
+    def descendants_of(cls, node, include_self=True):
+        return descendants_of(cls._default_manager.all(), node, include_self)
+
+    @classmethod
+    def ancestors_of(cls, node, include_self=False):
+        return ancestors_of(cls._default_manager.all(), node, include_self)
+
+    def save(self, *args, **kwargs):
+        adding = self._state.adding
+        with transaction.atomic(using=kwargs.get("using")):
+            super().save(*args, **kwargs)
+            sync_tree_index(type(self), [self], created=adding)
+
+
+def _drop_closure_rows(sender, instance, **kwargs):
+    _closure(sender).filter(descendant_id=instance.pk).delete()
+
+
+def connect_tree_index():
+    """Remove closure rows of deleted nodes. Called from CoreConfig.ready()."""
+    from django.db.models.signals import post_delete
+
+    for model in apps.get_models():
+        if issubclass(model, TreeIndexMixin):
+            post_delete.connect(_drop_closure_rows, sender=model, dispatch_uid="tree_index_{}".format(model._meta.label))
+
+
+class UnderFilter(django_filters.UUIDFilter):
+    """
+    ``?under=<id>``: rows whose ``field_name`` is that tree node or any node
+    below it. ``tree_model`` is the indexed model the field points at.
+    """
+
+    def __init__(self, *args, tree_model=None, **kwargs):
+        self.tree_model = tree_model
+        super().__init__(*args, **kwargs)
+
+    def filter(self, qs, value):
+        if value in EMPTY_VALUES:
+            return qs
+        tree_model = self.tree_model or qs.model
+        pairs = _closure(tree_model).filter(ancestor_id=value).values("descendant_id")
+        return self.get_method(qs)(**{"{}__in".format(self.field_name): pairs})
@@ -64,3 +64,8 @@ class TransactionBasedBranchScopedStampedOwnedActive(StampedOwnedActive, BranchS
 
     class Meta:
         abstract = True
+        # Branch-scoped list views filter on branch/active and order by created.
+        # Concrete documents extend this with their (branch, <date>, status) index.
+        indexes = [
+            models.Index(fields=["branch", "active", "created"]),
+        ]
@@ -1,25 +1,4 @@
-from threading import local
-from django.contrib.auth.decorators import login_required
-from django.utils.deprecation import MiddlewareMixin
+# Kept for old imports; the request user now lives in core.utils.userSession.
+from core.utils.userSession import CurrentUserMiddleware, get_current_user_object as get_current_user
 
- 
-_user = local()
-
- 
-class CurrentUserMiddleware(MiddlewareMixin):
-    
-    def process_request(self, request):
-        try:
-            _user.value = request.user
-        except:
-            pass
- 
-def get_current_user():
-    try:
-        return _user.value
-    except AttributeError:
-        return None
-    except:
-        return None
-    
- 
\ No newline at end of file
+__all__ = ["CurrentUserMiddleware", "get_current_user"]
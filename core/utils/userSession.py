@@ -1,40 +1,93 @@
 import logging
-from threading import local
-from django.utils.deprecation import MiddlewareMixin
+from contextvars import ContextVar
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+
+from core.utils.RequestPrincipal import load_principal
 
 # Logger for debugging purposes
 logger = logging.getLogger(__name__)
 
-# Thread-local storage
-_user = local()
+# Principal of the request being served. A ContextVar is private to each
+# thread and to each asyncio task, so concurrent async requests don't see
+# each other's user the way they would with threading.local.
+_principal = ContextVar("current_principal", default=None)
+
+
+def set_current_principal(principal):
+    """Record the request principal; called by CurrentUserMiddleware and JWT authentication."""
+    _principal.set(principal)
+
 
+class CurrentUserMiddleware:
+    """
+    Scopes the current-user storage to one request, sync or async. Session
+    users are recorded here; JWT users are recorded once DRF authenticates
+    them (see PrincipalJWTAuthentication).
+    """
+
+    sync_capable = True
+    async_capable = True
 
-class CurrentUserMiddleware(MiddlewareMixin):
-    def process_request(self, request):
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(self.get_response):
+            markcoroutinefunction(self)
+
+    def _principal_for(self, user):
         try:
-            _user.id = getattr(request.user, 'id', None)
-            _user.branch = getattr(request.user, 'branch', None)
-            _user.branch_id = getattr(_user.branch, 'id', None)
+            if user is not None and user.is_authenticated:
+                return load_principal(user.pk)
         except Exception as e:
             logger.warning(f"CurrentUserMiddleware error: {e}")
+        return None
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        token = _principal.set(self._principal_for(getattr(request, "user", None)))
+        try:
+            return self.get_response(request)
+        finally:
+            _principal.reset(token)
+
+    async def __acall__(self, request):
+        user = await request.auser() if hasattr(request, "auser") else None
+        principal = await sync_to_async(self._principal_for)(user)
+        token = _principal.set(principal)
+        try:
+            return await self.get_response(request)
+        finally:
+            _principal.reset(token)
+
+
+def get_current_principal():
+    return _principal.get()
 
 
 def get_current_user():
     """
-    Returns the current user's ID stored in thread-local storage.
+    Returns the current user's ID for this request.
+    """
+    return getattr(_principal.get(), 'user_id', None)
+
+
+def get_current_user_object():
+    """
+    Returns the current user object for this request.
     """
-    return getattr(_user, 'id', None)
+    return getattr(_principal.get(), 'user', None)
 
 
 def get_current_user_branch():
     """
-    Returns the current user's branch object stored in thread-local storage.
+    Returns the current user's branch object for this request.
     """
-    return getattr(_user, 'branch', None)
+    return getattr(_principal.get(), 'branch', None)
 
 
 def get_current_user_branch_id():
     """
-    Returns the current user's branch ID stored in thread-local storage.
+    Returns the current user's branch ID for this request.
     """
-    return getattr(_user, 'branch_id', None)
+    return getattr(_principal.get(), 'branch_id', None)
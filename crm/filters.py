@@ -1,10 +1,12 @@
 import django_filters as filters
+from core.utils.TreeIndex import UnderFilter
 from .models import ContactGroup, Contact, Deal, DealItem, Activity
 
 
 class ContactGroupFilter(filters.FilterSet):
     branch = filters.UUIDFilter(field_name="branch_id")
     parent = filters.UUIDFilter(field_name="parent_id")
+    under = UnderFilter(field_name="pk")
     name = filters.CharFilter(field_name="name", lookup_expr="icontains")
     active = filters.BooleanFilter(field_name="active")
 
@@ -19,6 +21,7 @@ class ContactFilter(filters.FilterSet):
     name = filters.CharFilter(field_name="name", lookup_expr="icontains")
     code = filters.CharFilter(field_name="code", lookup_expr="icontains")
     group = filters.UUIDFilter(field_name="group_id")
+    group_under = UnderFilter(field_name="group_id", tree_model=ContactGroup)
     phone = filters.CharFilter(field_name="phone", lookup_expr="icontains")
     email = filters.CharFilter(field_name="email", lookup_expr="icontains")
     active = filters.BooleanFilter(field_name="active")
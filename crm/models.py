@@ -1,9 +1,10 @@
 from django.conf import settings
 from django.db import models
 from core.utils.coreModels import BranchScopedStampedOwnedActive
+from core.utils.TreeIndex import TreeIndexMixin
 
 
-class ContactGroup(BranchScopedStampedOwnedActive):
+class ContactGroup(TreeIndexMixin, BranchScopedStampedOwnedActive):
     name = models.CharField(max_length=150)
     parent = models.ForeignKey(
         "self",
@@ -134,6 +135,8 @@ class DealItem(BranchScopedStampedOwnedActive):
 
     line_total = models.DecimalField(max_digits=18, decimal_places=2, default=0)
 
+    label_related = ("deal",)
+
     def __str__(self):
         return f"{self.deal} - {self.id}"
 
@@ -1,30 +1,11 @@
-import uuid
+from django.conf import settings
 from rest_framework import serializers
 from core.utils.AdaptedBulkListSerializer import BulkModelSerializer
+from core.utils.NestedDocumentSerializer import NestedDocumentSerializerMixin
+from core.utils.ReadablePKField import ReadablePKField
 from .models import ContactGroup, Contact, Deal, DealItem, Activity
 
 
-class ReadablePKField(serializers.PrimaryKeyRelatedField):
-    """Shows readable string in response while still being PK-based."""
-
-    def __init__(self, *args, **kwargs):
-        self._placeholder_queryset = object()
-        if kwargs.get("queryset") is None and not kwargs.get("read_only", False):
-            kwargs["queryset"] = self._placeholder_queryset
-        super().__init__(*args, **kwargs)
-
-    def get_queryset(self):
-        queryset = self.queryset
-        if queryset is self._placeholder_queryset:
-            return None
-        if hasattr(queryset, "all"):
-            return queryset.all()
-        return queryset
-
-    def to_representation(self, value):
-        return {"id": str(value.pk), "label": str(value)}
-
-
 class ContactGroupSerializer(BulkModelSerializer):
     parent = ReadablePKField(queryset=ContactGroup.objects.all(), required=False, allow_null=True)
 
@@ -39,12 +20,10 @@ class ContactSerializer(BulkModelSerializer):
     receivable_account = ReadablePKField(queryset=None, required=False, allow_null=True)
     payable_account = ReadablePKField(queryset=None, required=False, allow_null=True)
 
-    def __init__(self, *args, **kwargs):
-        super().__init__(*args, **kwargs)
-        from accounting.models import COA
-
-        self.fields["receivable_account"].queryset = COA.objects.all()
-        self.fields["payable_account"].queryset = COA.objects.all()
+    lazy_querysets = {
+        "receivable_account": "accounting.COA",
+        "payable_account": "accounting.COA",
+    }
 
     class Meta:
         model = Contact
@@ -57,13 +36,10 @@ class DealItemSerializer(BulkModelSerializer):
     product = ReadablePKField(queryset=None, required=False, allow_null=True)
     tax_rate = ReadablePKField(queryset=None, required=False, allow_null=True)
 
-    def __init__(self, *args, **kwargs):
-        super().__init__(*args, **kwargs)
-        from inventory.models import Product
-        from master.models import TaxRate
-
-        self.fields["product"].queryset = Product.objects.all()
-        self.fields["tax_rate"].queryset = TaxRate.objects.all()
+    lazy_querysets = {
+        "product": "inventory.Product",
+        "tax_rate": "master.TaxRate",
+    }
 
     class Meta:
         model = DealItem
@@ -89,56 +65,25 @@ class DealItemSerializer(BulkModelSerializer):
         return attrs
 
 
-class DealSerializer(BulkModelSerializer):
+class DealSerializer(NestedDocumentSerializerMixin, BulkModelSerializer):
     contact = ReadablePKField(queryset=Contact.objects.all())
     currency = ReadablePKField(queryset=None, required=False, allow_null=True)
     owner = ReadablePKField(queryset=None, required=False, allow_null=True)
     items = DealItemSerializer(many=True, required=False)
+    line_field = "items"
 
-    def __init__(self, *args, **kwargs):
-        super().__init__(*args, **kwargs)
-        from master.models import Currency
-        from django.contrib.auth import get_user_model
-
-        self.fields["currency"].queryset = Currency.objects.all()
-        self.fields["owner"].queryset = get_user_model().objects.all()
+    lazy_querysets = {
+        "currency": "master.Currency",
+        "owner": settings.AUTH_USER_MODEL,
+    }
 
     class Meta:
         model = Deal
         fields = "__all__"
         read_only_fields = ("id", "created", "updated", "user_add", "history", "is_system_generated")
 
-    def _ensure_item_uuid(self, item):
-        if not item.get("id"):
-            item["id"] = uuid.uuid4()
-        return item
-
-    def create(self, validated_data):
-        items_data = validated_data.pop("items", [])
-        obj = Deal.objects.create(**validated_data)
-
-        for item in items_data:
-            item = self._ensure_item_uuid(item)
-            item.setdefault("branch", obj.branch)
-            DealItem.objects.create(deal=obj, **item)
-
-        return obj
-
-    def update(self, instance, validated_data):
-        items_data = validated_data.pop("items", None)
-
-        for key, value in validated_data.items():
-            setattr(instance, key, value)
-        instance.save()
-
-        if items_data is not None:
-            instance.items.all().delete()
-            for item in items_data:
-                item = self._ensure_item_uuid(item)
-                item.setdefault("branch", instance.branch)
-                DealItem.objects.create(deal=instance, **item)
-
-        return instance
+    def get_line_defaults(self, header):
+        return {"branch": header.branch}
 
 
 class ActivitySerializer(BulkModelSerializer):
@@ -146,11 +91,7 @@ class ActivitySerializer(BulkModelSerializer):
     deal = ReadablePKField(queryset=Deal.objects.all(), required=False, allow_null=True)
     assigned_to = ReadablePKField(queryset=None, required=False, allow_null=True)
 
-    def __init__(self, *args, **kwargs):
-        super().__init__(*args, **kwargs)
-        from django.contrib.auth import get_user_model
-
-        self.fields["assigned_to"].queryset = get_user_model().objects.all()
+    lazy_querysets = {"assigned_to": settings.AUTH_USER_MODEL}
 
     class Meta:
         model = Activity
@@ -1,3 +1,4 @@
+from core.utils.AsyncReadMixin import AsyncReadMixin
 from core.utils.BaseModelViewSet import BaseModelViewSet
 from .models import ContactGroup, Contact, Deal, DealItem, Activity
 from .serializers import (
@@ -23,7 +24,7 @@ class ContactGroupViewSet(BaseModelViewSet):
     search_fields = ["name", "description"]
 
 
-class ContactViewSet(BaseModelViewSet):
+class ContactViewSet(AsyncReadMixin, BaseModelViewSet):
     queryset = Contact.objects.select_related("group", "receivable_account", "payable_account", "branch").all()
     serializer_class = ContactSerializer
     filterset_class = ContactFilter
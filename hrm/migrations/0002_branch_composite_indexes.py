@@ -0,0 +1,32 @@
+# Generated by Django 5.2.18 on 2026-10-18 12:38
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('hrm', '0001_initial'),
+        ('master', '0001_initial'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='leaverequest',
+            index=models.Index(fields=['branch', 'active', 'created'], name='hrm_leavere_branch__2739c6_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='leaverequest',
+            index=models.Index(fields=['branch', 'from_date', 'status'], name='hrm_leavere_branch__fd43bd_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='payslip',
+            index=models.Index(fields=['branch', 'active', 'created'], name='hrm_payslip_branch__d1b4c7_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='payslip',
+            index=models.Index(fields=['branch', 'status'], name='hrm_payslip_branch__e5ff04_idx'),
+        ),
+    ]
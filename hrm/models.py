@@ -73,6 +73,8 @@ class Attendance(BranchScopedStampedOwnedActive):
     total_minutes = models.IntegerField(default=0)
     note = models.TextField(null=True, blank=True)
 
+    label_related = ("employee",)
+
     class Meta:
         unique_together = ("employee", "date")
 
@@ -113,6 +115,13 @@ class LeaveRequest(TransactionBasedBranchScopedStampedOwnedActive):
     total = models.DecimalField(max_digits=18, decimal_places=2, default=0)
     note = models.TextField(null=True, blank=True)
 
+    label_related = ("employee",)
+
+    class Meta(TransactionBasedBranchScopedStampedOwnedActive.Meta):
+        indexes = TransactionBasedBranchScopedStampedOwnedActive.Meta.indexes + [
+            models.Index(fields=["branch", "from_date", "status"]),
+        ]
+
     def __str__(self):
         return f"{self.employee} {self.from_date}→{self.to_date}"
 
@@ -172,7 +181,12 @@ class Payslip(TransactionBasedBranchScopedStampedOwnedActive):
     total = models.DecimalField(max_digits=18, decimal_places=2, default=0)
     note = models.TextField(null=True, blank=True)
 
-    class Meta:
+    label_related = ("employee", "payroll_period")
+
+    class Meta(TransactionBasedBranchScopedStampedOwnedActive.Meta):
+        indexes = TransactionBasedBranchScopedStampedOwnedActive.Meta.indexes + [
+            models.Index(fields=["branch", "status"]),
+        ]
         unique_together = ("payroll_period", "employee")
 
     def __str__(self):
@@ -1,6 +1,8 @@
-import uuid
+from django.conf import settings
 from rest_framework import serializers
 from core.utils.AdaptedBulkListSerializer import BulkModelSerializer
+from core.utils.NestedDocumentSerializer import NestedDocumentSerializerMixin
+from core.utils.ReadablePKField import ReadablePKField
 from .models import (
     Department,
     Designation,
@@ -16,27 +18,6 @@ from .models import (
 )
 
 
-class ReadablePKField(serializers.PrimaryKeyRelatedField):
-    """Shows readable string in response while still being PK-based."""
-
-    def __init__(self, *args, **kwargs):
-        self._placeholder_queryset = object()
-        if kwargs.get("queryset") is None and not kwargs.get("read_only", False):
-            kwargs["queryset"] = self._placeholder_queryset
-        super().__init__(*args, **kwargs)
-
-    def get_queryset(self):
-        queryset = self.queryset
-        if queryset is self._placeholder_queryset:
-            return None
-        if hasattr(queryset, "all"):
-            return queryset.all()
-        return queryset
-
-    def to_representation(self, value):
-        return {"id": str(value.pk), "label": str(value)}
-
-
 class DepartmentSerializer(BulkModelSerializer):
     class Meta:
         model = Department
@@ -58,11 +39,7 @@ class EmployeeSerializer(BulkModelSerializer):
     department = ReadablePKField(queryset=Department.objects.all(), required=False, allow_null=True)
     designation = ReadablePKField(queryset=Designation.objects.all(), required=False, allow_null=True)
 
-    def __init__(self, *args, **kwargs):
-        super().__init__(*args, **kwargs)
-        from django.contrib.auth import get_user_model
-
-        self.fields["user"].queryset = get_user_model().objects.all()
+    lazy_querysets = {"user": settings.AUTH_USER_MODEL}
 
     class Meta:
         model = Employee
@@ -130,42 +107,13 @@ class PayslipLineSerializer(BulkModelSerializer):
         read_only_fields = ("payslip", "created", "updated")
 
 
-class PayslipSerializer(BulkModelSerializer):
+class PayslipSerializer(NestedDocumentSerializerMixin, BulkModelSerializer):
     payroll_period = ReadablePKField(queryset=PayrollPeriod.objects.all())
     employee = ReadablePKField(queryset=Employee.objects.all())
     lines = PayslipLineSerializer(many=True, required=False)
+    line_field = "lines"
 
     class Meta:
         model = Payslip
         fields = "__all__"
         read_only_fields = ("id", "created", "updated", "user_add", "history", "is_system_generated")
-
-    def _ensure_line_uuid(self, line):
-        if not line.get("id"):
-            line["id"] = uuid.uuid4()
-        return line
-
-    def create(self, validated_data):
-        lines_data = validated_data.pop("lines", [])
-        obj = Payslip.objects.create(**validated_data)
-
-        for line in lines_data:
-            line = self._ensure_line_uuid(line)
-            PayslipLine.objects.create(payslip=obj, **line)
-
-        return obj
-
-    def update(self, instance, validated_data):
-        lines_data = validated_data.pop("lines", None)
-
-        for key, value in validated_data.items():
-            setattr(instance, key, value)
-        instance.save()
-
-        if lines_data is not None:
-            instance.lines.all().delete()
-            for line in lines_data:
-                line = self._ensure_line_uuid(line)
-                PayslipLine.objects.create(payslip=instance, **line)
-
-        return instance
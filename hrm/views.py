@@ -66,6 +66,7 @@ class AttendanceViewSet(BaseModelViewSet):
     serializer_class = AttendanceSerializer
     filterset_class = AttendanceFilter
     search_fields = ["note"]
+    cursor_ordering = ("-date", "-created", "-id")
 
 
 class LeaveTypeViewSet(BaseModelViewSet):
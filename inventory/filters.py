@@ -1,4 +1,5 @@
 import django_filters as filters
+from core.utils.TreeIndex import UnderFilter
 from .models import (
     ProductCategory,
     UnitOfMeasurement,
@@ -22,6 +23,7 @@ from .models import (
 class ProductCategoryFilter(filters.FilterSet):
     branch = filters.UUIDFilter(field_name="branch_id")
     parent = filters.UUIDFilter(field_name="parent_id")
+    under = UnderFilter(field_name="pk")
     name = filters.CharFilter(field_name="name", lookup_expr="icontains")
     active = filters.BooleanFilter(field_name="active")
 
@@ -71,6 +73,7 @@ class ProductFilter(filters.FilterSet):
     name = filters.CharFilter(field_name="name", lookup_expr="icontains")
     code = filters.CharFilter(field_name="code", lookup_expr="icontains")
     category = filters.UUIDFilter(field_name="category_id")
+    category_under = UnderFilter(field_name="category_id", tree_model=ProductCategory)
     tax_class = filters.UUIDFilter(field_name="tax_class_id")
     primary_unit = filters.UUIDFilter(field_name="primary_unit_id")
     hs_code = filters.CharFilter(field_name="hs_code", lookup_expr="icontains")
@@ -0,0 +1,40 @@
+# Generated by Django 5.2.18 on 2026-10-18 12:38
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('inventory', '0001_initial'),
+        ('master', '0001_initial'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='inventoryadjustment',
+            index=models.Index(fields=['branch', 'active', 'created'], name='inventory_i_branch__ab49b5_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='inventoryadjustment',
+            index=models.Index(fields=['branch', 'adjustment_date', 'status'], name='inventory_i_branch__286f79_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='productionorder',
+            index=models.Index(fields=['branch', 'active', 'created'], name='inventory_p_branch__c2e6c2_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='productionorder',
+            index=models.Index(fields=['branch', 'production_date', 'status'], name='inventory_p_branch__10808d_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='warehousetransfer',
+            index=models.Index(fields=['branch', 'active', 'created'], name='inventory_w_branch__0cef18_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='warehousetransfer',
+            index=models.Index(fields=['branch', 'transfer_date', 'status'], name='inventory_w_branch__95a165_idx'),
+        ),
+    ]
@@ -3,11 +3,12 @@ from core.utils.coreModels import (
     BranchScopedStampedOwnedActive,
     TransactionBasedBranchScopedStampedOwnedActive,
 )
+from core.utils.TreeIndex import TreeIndexMixin
 from master.models import TaxClass, TaxRate
 from accounting.models import COA
 
 
-class ProductCategory(BranchScopedStampedOwnedActive):
+class ProductCategory(TreeIndexMixin, BranchScopedStampedOwnedActive):
     name = models.CharField(max_length=150)
     parent = models.ForeignKey("self", on_delete=models.PROTECT, null=True, blank=True, related_name="children")
     description = models.TextField(null=True, blank=True)
@@ -41,6 +42,8 @@ class VariantAttributeOption(BranchScopedStampedOwnedActive):
     key = models.CharField(max_length=60, db_index=True)
     description = models.TextField(null=True, blank=True)
 
+    label_related = ("attribute",)
+
     def __str__(self):
         return f"{self.attribute.name}: {self.name}"
 
@@ -137,6 +140,12 @@ class WarehouseTransfer(TransactionBasedBranchScopedStampedOwnedActive):
     total = models.DecimalField(max_digits=18, decimal_places=2, default=0)
     note = models.TextField(null=True, blank=True)
 
+    class Meta(TransactionBasedBranchScopedStampedOwnedActive.Meta):
+        indexes = TransactionBasedBranchScopedStampedOwnedActive.Meta.indexes + [
+            models.Index(fields=["branch", "transfer_date", "status"]),
+        ]
+
+
 
 class WarehouseTransferItem(models.Model):
     id = models.UUIDField(primary_key=True, editable=False)
@@ -163,6 +172,12 @@ class InventoryAdjustment(TransactionBasedBranchScopedStampedOwnedActive):
     total = models.DecimalField(max_digits=18, decimal_places=2, default=0)
     note = models.TextField(null=True, blank=True)
 
+    class Meta(TransactionBasedBranchScopedStampedOwnedActive.Meta):
+        indexes = TransactionBasedBranchScopedStampedOwnedActive.Meta.indexes + [
+            models.Index(fields=["branch", "adjustment_date", "status"]),
+        ]
+
+
 
 class InventoryAdjustmentItem(models.Model):
     id = models.UUIDField(primary_key=True, editable=False)
@@ -194,6 +209,12 @@ class ProductionOrder(TransactionBasedBranchScopedStampedOwnedActive):
     total = models.DecimalField(max_digits=18, decimal_places=2, default=0)
     note = models.TextField(null=True, blank=True)
 
+    class Meta(TransactionBasedBranchScopedStampedOwnedActive.Meta):
+        indexes = TransactionBasedBranchScopedStampedOwnedActive.Meta.indexes + [
+            models.Index(fields=["branch", "production_date", "status"]),
+        ]
+
+
 
 class ProductionInput(models.Model):
     id = models.UUIDField(primary_key=True, editable=False)
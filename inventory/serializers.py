@@ -1,4 +1,4 @@
-from rest_framework import serializers
+from core.utils.AdaptedBulkListSerializer import BulkModelSerializer
 from .models import (
     ProductCategory,
     UnitOfMeasurement,
@@ -19,97 +19,97 @@ from .models import (
 )
 
 
-class ProductCategorySerializer(serializers.ModelSerializer):
+class ProductCategorySerializer(BulkModelSerializer):
     class Meta:
         model = ProductCategory
         fields = "__all__"
 
 
-class UnitOfMeasurementSerializer(serializers.ModelSerializer):
+class UnitOfMeasurementSerializer(BulkModelSerializer):
     class Meta:
         model = UnitOfMeasurement
         fields = "__all__"
 
 
-class VariantAttributeSerializer(serializers.ModelSerializer):
+class VariantAttributeSerializer(BulkModelSerializer):
     class Meta:
         model = VariantAttribute
         fields = "__all__"
 
 
-class VariantAttributeOptionSerializer(serializers.ModelSerializer):
+class VariantAttributeOptionSerializer(BulkModelSerializer):
     class Meta:
         model = VariantAttributeOption
         fields = "__all__"
 
 
-class ProductSerializer(serializers.ModelSerializer):
+class ProductSerializer(BulkModelSerializer):
     class Meta:
         model = Product
         fields = "__all__"
 
 
-class ProductVariantSerializer(serializers.ModelSerializer):
+class ProductVariantSerializer(BulkModelSerializer):
     class Meta:
         model = ProductVariant
         fields = "__all__"
 
 
-class ProductVariantOptionSerializer(serializers.ModelSerializer):
+class ProductVariantOptionSerializer(BulkModelSerializer):
     class Meta:
         model = ProductVariantOption
         fields = "__all__"
 
 
-class ProductPictureSerializer(serializers.ModelSerializer):
+class ProductPictureSerializer(BulkModelSerializer):
     class Meta:
         model = ProductPicture
         fields = "__all__"
 
 
-class WarehouseSerializer(serializers.ModelSerializer):
+class WarehouseSerializer(BulkModelSerializer):
     class Meta:
         model = Warehouse
         fields = "__all__"
 
 
-class WarehouseTransferItemSerializer(serializers.ModelSerializer):
+class WarehouseTransferItemSerializer(BulkModelSerializer):
     class Meta:
         model = WarehouseTransferItem
         fields = "__all__"
 
 
-class WarehouseTransferSerializer(serializers.ModelSerializer):
+class WarehouseTransferSerializer(BulkModelSerializer):
     class Meta:
         model = WarehouseTransfer
         fields = "__all__"
 
 
-class InventoryAdjustmentSerializer(serializers.ModelSerializer):
+class InventoryAdjustmentSerializer(BulkModelSerializer):
     class Meta:
         model = InventoryAdjustment
         fields = "__all__"
 
 
-class InventoryAdjustmentItemSerializer(serializers.ModelSerializer):
+class InventoryAdjustmentItemSerializer(BulkModelSerializer):
     class Meta:
         model = InventoryAdjustmentItem
         fields = "__all__"
 
 
-class ProductionOrderSerializer(serializers.ModelSerializer):
+class ProductionOrderSerializer(BulkModelSerializer):
     class Meta:
         model = ProductionOrder
         fields = "__all__"
 
 
-class ProductionInputSerializer(serializers.ModelSerializer):
+class ProductionInputSerializer(BulkModelSerializer):
     class Meta:
         model = ProductionInput
         fields = "__all__"
 
 
-class ProductionOutputSerializer(serializers.ModelSerializer):
+class ProductionOutputSerializer(BulkModelSerializer):
     class Meta:
         model = ProductionOutput
         fields = "__all__"
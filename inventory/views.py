@@ -1,3 +1,4 @@
+from core.utils.AsyncReadMixin import AsyncReadMixin
 from core.utils.BaseModelViewSet import BaseModelViewSet
 from .models import (
     ProductCategory,
@@ -83,7 +84,7 @@ class VariantAttributeOptionViewSet(BaseModelViewSet):
     search_fields = ["name", "key", "description", "attribute__name"]
 
 
-class ProductViewSet(BaseModelViewSet):
+class ProductViewSet(AsyncReadMixin, BaseModelViewSet):
     queryset = Product.objects.select_related(
         "category",
         "tax_class",
@@ -98,7 +99,7 @@ class ProductViewSet(BaseModelViewSet):
     search_fields = ["name", "code", "description", "hs_code"]
 
 
-class ProductVariantViewSet(BaseModelViewSet):
+class ProductVariantViewSet(AsyncReadMixin, BaseModelViewSet):
     queryset = ProductVariant.objects.select_related("product", "branch").all()
     serializer_class = ProductVariantSerializer
     filterset_class = ProductVariantFilter
@@ -140,6 +141,7 @@ class WarehouseTransferViewSet(BaseModelViewSet):
     serializer_class = WarehouseTransferSerializer
     filterset_class = WarehouseTransferFilter
     search_fields = ["transfer_no", "note"]
+    cursor_ordering = ("-transfer_date", "-created", "-id")
 
 
 class WarehouseTransferItemViewSet(BaseModelViewSet):
@@ -154,6 +156,7 @@ class InventoryAdjustmentViewSet(BaseModelViewSet):
     serializer_class = InventoryAdjustmentSerializer
     filterset_class = InventoryAdjustmentFilter
     search_fields = ["adjustment_no", "reason", "note"]
+    cursor_ordering = ("-adjustment_date", "-created", "-id")
 
 
 class InventoryAdjustmentItemViewSet(BaseModelViewSet):
@@ -172,6 +175,7 @@ class ProductionOrderViewSet(BaseModelViewSet):
     serializer_class = ProductionOrderSerializer
     filterset_class = ProductionOrderFilter
     search_fields = ["production_no", "note", "finished_good_variant__sku", "finished_good_variant__name"]
+    cursor_ordering = ("-production_date", "-created", "-id")
 
 
 class ProductionInputViewSet(BaseModelViewSet):
@@ -1,3 +1,4 @@
+import os
 from pathlib import Path
 from datetime import timedelta
 BASE_DIR = Path(__file__).resolve().parent.parent
@@ -31,15 +32,14 @@ INSTALLED_APPS = [
 ]
 MIDDLEWARE = [
     "corsheaders.middleware.CorsMiddleware",
-    "core.seeders.default_seed.DefaultDataSeedMiddleware",
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
+    'core.utils.userSession.CurrentUserMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
-    "core.middlewares.protectSystemGeneratedData.SystemGeneratedWriteProtectMiddleware",
 ]
 ROOT_URLCONF = 'ledgerserver.urls'
 TEMPLATES = [
@@ -60,9 +60,84 @@ WSGI_APPLICATION = 'ledgerserver.wsgi.application'
 DATABASES = {
     'default': {
         'ENGINE': 'django.db.backends.sqlite3',
-        'NAME': BASE_DIR / 'db.sqlite3',
+        'NAME': os.environ.get("DB_NAME", BASE_DIR / 'db.sqlite3'),
     }
 }
+
+# Database profile, picked with LEDGER_DB_PROFILE:
+#   "development" (default) - plain SQLite, a new connection per request.
+#   "production" - persistent connections with health checks. SQLite runs in
+#   WAL mode with the pragmas below and IMMEDIATE write transactions, so
+#   concurrent POS writers queue on busy_timeout instead of failing with
+#   "database is locked". Set DB_ENGINE (postgresql, mysql ...) plus DB_NAME,
+#   DB_USER, DB_PASSWORD, DB_HOST, DB_PORT for a server database; with
+#   postgresql, DB_POOL_MAX_SIZE turns on psycopg connection pooling.
+DB_PROFILE = os.environ.get("LEDGER_DB_PROFILE", "development")
+
+SQLITE_PRAGMAS = {
+    "journal_mode": "WAL",
+    "synchronous": "NORMAL",
+    "busy_timeout": 5000,       # ms
+    "cache_size": -64000,       # KiB, i.e. 64 MB of page cache
+    "mmap_size": 268435456,     # 256 MB
+}
+
+if DB_PROFILE == "production":
+    DB_ENGINE = os.environ.get("DB_ENGINE", "sqlite3")
+    DB_CONN_MAX_AGE = int(os.environ.get("DB_CONN_MAX_AGE", 600))
+
+    if DB_ENGINE == "sqlite3":
+        DATABASES['default'].update({
+            "CONN_MAX_AGE": DB_CONN_MAX_AGE,
+            "CONN_HEALTH_CHECKS": True,
+            "OPTIONS": {
+                # Run by Django on every new connection
+                "init_command": ";".join(
+                    "PRAGMA {}={}".format(name, value) for name, value in SQLITE_PRAGMAS.items()
+                ),
+                "transaction_mode": "IMMEDIATE",
+            },
+        })
+    else:
+        DATABASES['default'] = {
+            "ENGINE": "django.db.backends.{}".format(DB_ENGINE),
+            "NAME": os.environ.get("DB_NAME", "ledgerserver"),
+            "USER": os.environ.get("DB_USER", ""),
+            "PASSWORD": os.environ.get("DB_PASSWORD", ""),
+            "HOST": os.environ.get("DB_HOST", "localhost"),
+            "PORT": os.environ.get("DB_PORT", ""),
+            "CONN_MAX_AGE": DB_CONN_MAX_AGE,
+            "CONN_HEALTH_CHECKS": True,
+            "OPTIONS": {},
+        }
+        DB_POOL_MAX_SIZE = int(os.environ.get("DB_POOL_MAX_SIZE", 0))
+        if DB_ENGINE == "postgresql" and DB_POOL_MAX_SIZE:
+            # Pooled connections are returned to the pool after each request,
+            # so Django's own persistence is switched off.
+            DATABASES['default']["CONN_MAX_AGE"] = 0
+            DATABASES['default']["OPTIONS"]["pool"] = {
+                "min_size": int(os.environ.get("DB_POOL_MIN_SIZE", 2)),
+                "max_size": DB_POOL_MAX_SIZE,
+                "timeout": int(os.environ.get("DB_POOL_TIMEOUT", 10)),
+            }
+# Read replica: DB_REPLICA_NAME (an SQLite file, or the database name on
+# DB_REPLICA_HOST for a server database) adds a "replica" alias. Reads made
+# while serving GET/HEAD requests go there; a user who writes is pinned to
+# the primary for REPLICA_PIN_SECONDS (pins live in the cache, so use a
+# shared cache with several workers). Locally, `manage.py sync_replica`
+# copies the SQLite primary onto the replica file.
+REPLICA_DATABASE = None
+REPLICA_PIN_SECONDS = int(os.environ.get("DB_REPLICA_PIN_SECONDS", 5))
+if os.environ.get("DB_REPLICA_NAME") or os.environ.get("DB_REPLICA_HOST"):
+    REPLICA_DATABASE = "replica"
+    DATABASES[REPLICA_DATABASE] = dict(DATABASES['default'], TEST={"MIRROR": "default"})
+    if os.environ.get("DB_REPLICA_NAME"):
+        DATABASES[REPLICA_DATABASE]["NAME"] = os.environ["DB_REPLICA_NAME"]
+    if os.environ.get("DB_REPLICA_HOST"):
+        DATABASES[REPLICA_DATABASE]["HOST"] = os.environ["DB_REPLICA_HOST"]
+    DATABASE_ROUTERS = ["core.utils.ReplicaRouter.ReplicaRouter"]
+    MIDDLEWARE.append("core.utils.ReplicaRouter.ReplicaRoutingMiddleware")
+
 AUTH_PASSWORD_VALIDATORS = [
     {
         'NAME': 'django.contrib.auth.password_validation.UserAttributeSimilarityValidator',
@@ -104,14 +179,49 @@ DJOSER = {
 
 REST_FRAMEWORK = {
     "DEFAULT_AUTHENTICATION_CLASSES": (
-        "rest_framework_simplejwt.authentication.JWTAuthentication",
+        "core.utils.RequestPrincipal.PrincipalJWTAuthentication",
     ),
      "DEFAULT_PERMISSION_CLASSES": (
         "rest_framework.permissions.IsAuthenticated",
     ),
     "DEFAULT_PAGINATION_CLASS": "rest_framework.pagination.PageNumberPagination",
     "PAGE_SIZE": 20,
+    # orjson-backed JSON (same output as DRF's JSONRenderer); both classes
+    # fall back to the stock ones when orjson is not installed.
+    "DEFAULT_RENDERER_CLASSES": (
+        "core.utils.FastJSON.ORJSONRenderer",
+        "rest_framework.renderers.BrowsableAPIRenderer",
+    ),
+    "DEFAULT_PARSER_CLASSES": (
+        "core.utils.FastJSON.ORJSONParser",
+        "rest_framework.parsers.FormParser",
+        "rest_framework.parsers.MultiPartParser",
+    ),
+}
+
+# Seconds a request principal (user + branch + groups) stays cached per JWT
+# user_id. Saving the user, its branch or its groups drops the entry early.
+PRINCIPAL_CACHE_TIMEOUT = 60
+
+# Bulk POST/PUT/PATCH on BulkModelViewSet endpoints write plain rows with
+# bulk_create/bulk_update (and bulk simple_history rows). Serializers can
+# override per class with Meta.bulk_persistence / Meta.bulk_batch_size.
+BULK_PERSISTENCE = {
+    "ENABLED": True,
+    "BATCH_SIZE": 500,
+}
 
+# Chart-of-accounts codes the ledger posts to when a document does not name
+# an account itself (contact receivable/payable, product sales/purchase,
+# bank account). Looked up in the document's branch.
+LEDGER_CONTROL_ACCOUNTS = {
+    "cash": "1110",
+    "receivable": "1200",
+    "payable": "2200",
+    "tax": "2110",
+    "sales": "4200",
+    "purchase": "5200",
+    "expense": "5200",
 }
 
 CORS_ALLOWED_ORIGINS = [
@@ -1,4 +1,5 @@
 import django_filters as filters
+from core.utils.TreeIndex import UnderFilter
 from .models import Currency, TaxClass, TaxRate, MasterData, Branch
 
 
@@ -41,6 +42,7 @@ class MasterDataFilter(filters.FilterSet):
     name = filters.CharFilter(field_name="name", lookup_expr="icontains")
     is_boolean = filters.BooleanFilter(field_name="is_boolean")
     parent = filters.UUIDFilter(field_name="parent_id")
+    under = UnderFilter(field_name="pk")
     active = filters.BooleanFilter(field_name="active")
 
     class Meta:
@@ -1,5 +1,6 @@
 from django.db import models
 from core.utils.coreModels import StampedOwnedActive
+from core.utils.TreeIndex import TreeIndexMixin
 
 
 class Currency(StampedOwnedActive):
@@ -34,7 +35,7 @@ class TaxRate(StampedOwnedActive):
         return f"{self.name} ({self.rate_percent}%)"
 
 
-class MasterData(StampedOwnedActive):
+class MasterData(TreeIndexMixin, StampedOwnedActive):
     key = models.CharField(max_length=80, db_index=True)
     name = models.CharField(max_length=150)
     value = models.TextField(null=True, blank=True)
@@ -1,3 +1,62 @@
-from django.test import TestCase
+from django.contrib.auth import get_user_model
+from rest_framework.test import APITestCase
 
-# Create your tests here.
+from core.utils.RequestPrincipal import load_principal
+from master.models import Branch, Currency
+
+
+class SharedModelWriteTests(APITestCase):
+    """Rows every branch shares (Branch, Currency ...) are writable by the head office only."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.head_office = Branch.objects.create(code="T-HQ", name="Test Head Office", is_head_office=True)
+        cls.branch = Branch.objects.create(code="T-B1", name="Test Branch 1")
+        cls.currency = Currency.objects.create(code="XTS", name="Test Currency")
+        user_model = get_user_model()
+        cls.branch_user = user_model.objects.create_user(
+            username="branch", email="branch@example.com", password="x", branch=cls.branch
+        )
+        cls.head_office_user = user_model.objects.create_user(
+            username="head", email="head@example.com", password="x", branch=cls.head_office
+        )
+
+    def test_branch_user_cannot_promote_own_branch_to_head_office(self):
+        self.client.force_authenticate(self.branch_user)
+        response = self.client.patch(
+            "/api/master/branches/{}/".format(self.branch.pk), {"is_head_office": True}, format="json"
+        )
+
+        self.assertEqual(response.status_code, 403)
+        self.branch.refresh_from_db()
+        self.assertFalse(self.branch.is_head_office)
+        self.assertFalse(load_principal(self.branch_user.pk).is_head_office)
+
+    def test_branch_user_cannot_create_or_bulk_update_shared_rows(self):
+        self.client.force_authenticate(self.branch_user)
+        created = self.client.post("/api/master/branches/", {"code": "T-B2", "name": "Test Branch 2"}, format="json")
+        bulk = self.client.patch(
+            "/api/master/currencies/", [{"id": str(self.currency.pk), "name": "Changed"}], format="json"
+        )
+
+        self.assertEqual(created.status_code, 403)
+        self.assertEqual(bulk.status_code, 403)
+        self.assertFalse(Branch.objects.filter(code="T-B2").exists())
+        self.currency.refresh_from_db()
+        self.assertEqual(self.currency.name, "Test Currency")
+
+    def test_branch_user_can_read_shared_rows(self):
+        self.client.force_authenticate(self.branch_user)
+        response = self.client.get("/api/master/currencies/{}/".format(self.currency.pk))
+
+        self.assertEqual(response.status_code, 200)
+
+    def test_head_office_user_can_write_shared_rows(self):
+        self.client.force_authenticate(self.head_office_user)
+        response = self.client.patch(
+            "/api/master/currencies/{}/".format(self.currency.pk), {"name": "Dollar"}, format="json"
+        )
+
+        self.assertEqual(response.status_code, 200)
+        self.currency.refresh_from_db()
+        self.assertEqual(self.currency.name, "Dollar")
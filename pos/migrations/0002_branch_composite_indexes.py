@@ -0,0 +1,53 @@
+# Generated by Django 5.2.18 on 2026-10-18 12:38
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('crm', '0001_initial'),
+        ('master', '0001_initial'),
+        ('pos', '0001_initial'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='poscashmovement',
+            index=models.Index(fields=['branch', 'active', 'created'], name='pos_poscash_branch__d27868_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='posorder',
+            index=models.Index(fields=['branch', 'active', 'created'], name='pos_posorde_branch__6770fa_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='posorder',
+            index=models.Index(fields=['branch', 'order_date', 'status'], name='pos_posorde_branch__f58877_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='pospayment',
+            index=models.Index(fields=['branch', 'active', 'created'], name='pos_pospaym_branch__0748ca_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='pospayment',
+            index=models.Index(fields=['branch', 'status'], name='pos_pospaym_branch__bff2b6_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='posreturn',
+            index=models.Index(fields=['branch', 'active', 'created'], name='pos_posretu_branch__5d88a4_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='posreturn',
+            index=models.Index(fields=['branch', 'return_date', 'status'], name='pos_posretu_branch__5fea66_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='posshift',
+            index=models.Index(fields=['branch', 'active', 'created'], name='pos_posshif_branch__da78a2_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='posshift',
+            index=models.Index(fields=['branch', 'opened_at', 'status'], name='pos_posshif_branch__15b22d_idx'),
+        ),
+    ]
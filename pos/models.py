@@ -61,6 +61,13 @@ class POSShift(TransactionBasedBranchScopedStampedOwnedActive):
     total = models.DecimalField(max_digits=18, decimal_places=2, default=0)
     note = models.TextField(null=True, blank=True)
 
+    label_related = ("register",)
+
+    class Meta(TransactionBasedBranchScopedStampedOwnedActive.Meta):
+        indexes = TransactionBasedBranchScopedStampedOwnedActive.Meta.indexes + [
+            models.Index(fields=["branch", "opened_at", "status"]),
+        ]
+
     def __str__(self):
         return f"{self.register} - {self.opened_at}"
 
@@ -71,6 +78,8 @@ class POSSession(BranchScopedStampedOwnedActive):
     started_at = models.DateTimeField()
     ended_at = models.DateTimeField(null=True, blank=True)
 
+    label_related = ("shift",)
+
     def __str__(self):
         return f"{self.shift} - {self.device_id or 'device'}"
 
@@ -139,6 +148,11 @@ class POSOrder(TransactionBasedBranchScopedStampedOwnedActive):
     total = models.DecimalField(max_digits=18, decimal_places=2, default=0)
     note = models.TextField(null=True, blank=True)
 
+    class Meta(TransactionBasedBranchScopedStampedOwnedActive.Meta):
+        indexes = TransactionBasedBranchScopedStampedOwnedActive.Meta.indexes + [
+            models.Index(fields=["branch", "order_date", "status"]),
+        ]
+
     def __str__(self):
         return self.order_no or str(self.id)
 
@@ -186,6 +200,13 @@ class POSPayment(TransactionBasedBranchScopedStampedOwnedActive):
     total = models.DecimalField(max_digits=18, decimal_places=2, default=0)
     note = models.TextField(null=True, blank=True)
 
+    label_related = ("method",)
+
+    class Meta(TransactionBasedBranchScopedStampedOwnedActive.Meta):
+        indexes = TransactionBasedBranchScopedStampedOwnedActive.Meta.indexes + [
+            models.Index(fields=["branch", "status"]),
+        ]
+
     def __str__(self):
         return f"{self.method} {self.amount}"
 
@@ -225,6 +246,11 @@ class POSReturn(TransactionBasedBranchScopedStampedOwnedActive):
     total = models.DecimalField(max_digits=18, decimal_places=2, default=0)
     note = models.TextField(null=True, blank=True)
 
+    class Meta(TransactionBasedBranchScopedStampedOwnedActive.Meta):
+        indexes = TransactionBasedBranchScopedStampedOwnedActive.Meta.indexes + [
+            models.Index(fields=["branch", "return_date", "status"]),
+        ]
+
     def __str__(self):
         return self.return_no or str(self.id)
 
@@ -1,11 +1,12 @@
 # pos/serializers.py
 
-import uuid
 from django.apps import apps
 from django.contrib.auth import get_user_model
 from rest_framework import serializers
 
 from core.utils.AdaptedBulkListSerializer import BulkModelSerializer
+from core.utils.NestedDocumentSerializer import NestedDocumentSerializerMixin
+from core.utils.ReadablePKField import ReadablePKField
 from .models import (
     POSRegister,
     POSShift,
@@ -34,15 +35,6 @@ ProductVariant = apps.get_model("inventory", "ProductVariant")
 TaxRate = apps.get_model("master", "TaxRate")
 
 
-class ReadablePKField(serializers.PrimaryKeyRelatedField):
-    """Shows readable string in response while still being PK-based."""
-
-    def to_representation(self, value):
-        if value is None:
-            return None
-        return {"id": str(value.pk), "label": str(value)}
-
-
 # =========================================================
 # REGISTER
 # =========================================================
@@ -139,48 +131,19 @@ class POSOrderItemSerializer(BulkModelSerializer):
 # =========================================================
 # ORDER
 # =========================================================
-class POSOrderSerializer(BulkModelSerializer):
+class POSOrderSerializer(NestedDocumentSerializerMixin, BulkModelSerializer):
     register = ReadablePKField(queryset=POSRegister.objects.all())
     shift = ReadablePKField(queryset=POSShift.objects.all())
     customer = ReadablePKField(queryset=Contact.objects.all(), required=False, allow_null=True)
 
     items = POSOrderItemSerializer(many=True, required=False)
+    line_field = "items"
 
     class Meta:
         model = POSOrder
         fields = "__all__"
         read_only_fields = ("id", "created", "updated", "user_add", "history", "is_system_generated")
 
-    def _ensure_item_uuid(self, item: dict) -> dict:
-        if not item.get("id"):
-            item["id"] = uuid.uuid4()
-        return item
-
-    def create(self, validated_data):
-        items_data = validated_data.pop("items", [])
-        obj = POSOrder.objects.create(**validated_data)
-
-        for item in items_data:
-            item = self._ensure_item_uuid(item)
-            POSOrderItem.objects.create(pos_order=obj, **item)
-
-        return obj
-
-    def update(self, instance, validated_data):
-        items_data = validated_data.pop("items", None)
-
-        for key, value in validated_data.items():
-            setattr(instance, key, value)
-        instance.save()
-
-        if items_data is not None:
-            instance.items.all().delete()
-            for item in items_data:
-                item = self._ensure_item_uuid(item)
-                POSOrderItem.objects.create(pos_order=instance, **item)
-
-        return instance
-
 
 # =========================================================
 # PAYMENT
@@ -239,47 +202,18 @@ class POSReturnItemSerializer(BulkModelSerializer):
 # =========================================================
 # RETURN
 # =========================================================
-class POSReturnSerializer(BulkModelSerializer):
+class POSReturnSerializer(NestedDocumentSerializerMixin, BulkModelSerializer):
     pos_order = ReadablePKField(queryset=POSOrder.objects.all(), required=False, allow_null=True)
     customer = ReadablePKField(queryset=Contact.objects.all(), required=False, allow_null=True)
 
     items = POSReturnItemSerializer(many=True, required=False)
+    line_field = "items"
 
     class Meta:
         model = POSReturn
         fields = "__all__"
         read_only_fields = ("id", "created", "updated", "user_add", "history", "is_system_generated")
 
-    def _ensure_item_uuid(self, item: dict) -> dict:
-        if not item.get("id"):
-            item["id"] = uuid.uuid4()
-        return item
-
-    def create(self, validated_data):
-        items_data = validated_data.pop("items", [])
-        obj = POSReturn.objects.create(**validated_data)
-
-        for item in items_data:
-            item = self._ensure_item_uuid(item)
-            POSReturnItem.objects.create(pos_return=obj, **item)
-
-        return obj
-
-    def update(self, instance, validated_data):
-        items_data = validated_data.pop("items", None)
-
-        for key, value in validated_data.items():
-            setattr(instance, key, value)
-        instance.save()
-
-        if items_data is not None:
-            instance.items.all().delete()
-            for item in items_data:
-                item = self._ensure_item_uuid(item)
-                POSReturnItem.objects.create(pos_return=instance, **item)
-
-        return instance
-
 
 # =========================================================
 # DISCOUNT PROFILE
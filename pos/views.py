@@ -86,6 +86,7 @@ class POSOrderViewSet(BaseModelViewSet):
     serializer_class = POSOrderSerializer
     filterset_class = POSOrderFilter
     search_fields = ["order_no", "note"]
+    cursor_ordering = ("-order_date", "-created", "-id")
 
 
 class POSOrderItemViewSet(BaseModelViewSet):
@@ -114,6 +115,7 @@ class POSReturnViewSet(BaseModelViewSet):
     serializer_class = POSReturnSerializer
     filterset_class = POSReturnFilter
     search_fields = ["return_no", "reason", "note"]
+    cursor_ordering = ("-return_date", "-created", "-id")
 
 
 class POSReturnItemViewSet(BaseModelViewSet):
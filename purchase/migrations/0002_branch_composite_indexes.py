@@ -0,0 +1,58 @@
+# Generated by Django 5.2.18 on 2026-10-18 12:38
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounting', '0003_branch_composite_indexes'),
+        ('crm', '0001_initial'),
+        ('master', '0001_initial'),
+        ('purchase', '0001_initial'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='debitnote',
+            index=models.Index(fields=['branch', 'active', 'created'], name='purchase_de_branch__60f31e_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='debitnote',
+            index=models.Index(fields=['branch', 'debit_note_date', 'status'], name='purchase_de_branch__281649_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='expense',
+            index=models.Index(fields=['branch', 'active', 'created'], name='purchase_ex_branch__c53572_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='expense',
+            index=models.Index(fields=['branch', 'expense_date', 'status'], name='purchase_ex_branch__6954ea_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='purchasebill',
+            index=models.Index(fields=['branch', 'active', 'created'], name='purchase_pu_branch__7b454e_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='purchasebill',
+            index=models.Index(fields=['branch', 'bill_date', 'status'], name='purchase_pu_branch__8a97cd_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='purchaseorder',
+            index=models.Index(fields=['branch', 'active', 'created'], name='purchase_pu_branch__f68d1a_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='purchaseorder',
+            index=models.Index(fields=['branch', 'po_date', 'status'], name='purchase_pu_branch__73874e_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='supplierpayment',
+            index=models.Index(fields=['branch', 'active', 'created'], name='purchase_su_branch__edf21f_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='supplierpayment',
+            index=models.Index(fields=['branch', 'payment_date', 'status'], name='purchase_su_branch__bd327d_idx'),
+        ),
+    ]
@@ -30,6 +30,11 @@ class PurchaseOrder(TransactionBasedBranchScopedStampedOwnedActive):
     total = models.DecimalField(max_digits=18, decimal_places=2, default=0)
     note = models.TextField(null=True, blank=True)
 
+    class Meta(TransactionBasedBranchScopedStampedOwnedActive.Meta):
+        indexes = TransactionBasedBranchScopedStampedOwnedActive.Meta.indexes + [
+            models.Index(fields=["branch", "po_date", "status"]),
+        ]
+
     def __str__(self):
         return self.po_no or str(self.id)
 
@@ -80,6 +85,11 @@ class PurchaseBill(TransactionBasedBranchScopedStampedOwnedActive):
     total = models.DecimalField(max_digits=18, decimal_places=2, default=0)
     note = models.TextField(null=True, blank=True)
 
+    class Meta(TransactionBasedBranchScopedStampedOwnedActive.Meta):
+        indexes = TransactionBasedBranchScopedStampedOwnedActive.Meta.indexes + [
+            models.Index(fields=["branch", "bill_date", "status"]),
+        ]
+
     def __str__(self):
         return self.bill_no or str(self.id)
 
@@ -132,6 +142,11 @@ class Expense(TransactionBasedBranchScopedStampedOwnedActive):
     total = models.DecimalField(max_digits=18, decimal_places=2, default=0)
     note = models.TextField(null=True, blank=True)
 
+    class Meta(TransactionBasedBranchScopedStampedOwnedActive.Meta):
+        indexes = TransactionBasedBranchScopedStampedOwnedActive.Meta.indexes + [
+            models.Index(fields=["branch", "expense_date", "status"]),
+        ]
+
     def __str__(self):
         return self.expense_no or str(self.id)
 
@@ -191,6 +206,11 @@ class SupplierPayment(TransactionBasedBranchScopedStampedOwnedActive):
     total = models.DecimalField(max_digits=18, decimal_places=2, default=0)
     note = models.TextField(null=True, blank=True)
 
+    class Meta(TransactionBasedBranchScopedStampedOwnedActive.Meta):
+        indexes = TransactionBasedBranchScopedStampedOwnedActive.Meta.indexes + [
+            models.Index(fields=["branch", "payment_date", "status"]),
+        ]
+
     def __str__(self):
         return self.payment_no or str(self.id)
 
@@ -233,6 +253,11 @@ class DebitNote(TransactionBasedBranchScopedStampedOwnedActive):
     total = models.DecimalField(max_digits=18, decimal_places=2, default=0)
     note = models.TextField(null=True, blank=True)
 
+    class Meta(TransactionBasedBranchScopedStampedOwnedActive.Meta):
+        indexes = TransactionBasedBranchScopedStampedOwnedActive.Meta.indexes + [
+            models.Index(fields=["branch", "debit_note_date", "status"]),
+        ]
+
     def __str__(self):
         return self.debit_note_no or str(self.id)
 
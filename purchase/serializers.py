@@ -1,6 +1,7 @@
-import uuid
 from rest_framework import serializers
 from core.utils.AdaptedBulkListSerializer import BulkModelSerializer
+from core.utils.NestedDocumentSerializer import NestedDocumentSerializerMixin
+from core.utils.ReadablePKField import ReadablePKField
 from .models import (
     PurchaseOrder,
     PurchaseOrderLine,
@@ -15,39 +16,15 @@ from .models import (
 )
 
 
-class ReadablePKField(serializers.PrimaryKeyRelatedField):
-    """Shows readable string in response while still being PK-based."""
-
-    def __init__(self, *args, **kwargs):
-        self._placeholder_queryset = object()
-        if kwargs.get("queryset") is None and not kwargs.get("read_only", False):
-            kwargs["queryset"] = self._placeholder_queryset
-        super().__init__(*args, **kwargs)
-
-    def get_queryset(self):
-        queryset = self.queryset
-        if queryset is self._placeholder_queryset:
-            return None
-        if hasattr(queryset, "all"):
-            return queryset.all()
-        return queryset
-
-    def to_representation(self, value):
-        return {"id": str(value.pk), "label": str(value)}
-
-
 class PurchaseOrderLineSerializer(BulkModelSerializer):
     id = serializers.UUIDField(required=False)
     product = ReadablePKField(queryset=None, required=False, allow_null=True)
     tax_rate = ReadablePKField(queryset=None, required=False, allow_null=True)
 
-    def __init__(self, *args, **kwargs):
-        super().__init__(*args, **kwargs)
-        from inventory.models import Product
-        from master.models import TaxRate
-
-        self.fields["product"].queryset = Product.objects.all()
-        self.fields["tax_rate"].queryset = TaxRate.objects.all()
+    lazy_querysets = {
+        "product": "inventory.Product",
+        "tax_rate": "master.TaxRate",
+    }
 
     class Meta:
         model = PurchaseOrderLine
@@ -67,67 +44,32 @@ class PurchaseOrderLineSerializer(BulkModelSerializer):
         read_only_fields = ("purchase_order", "created", "updated")
 
 
-class PurchaseOrderSerializer(BulkModelSerializer):
+class PurchaseOrderSerializer(NestedDocumentSerializerMixin, BulkModelSerializer):
     supplier = ReadablePKField(queryset=None)
     currency = ReadablePKField(queryset=None, required=False, allow_null=True)
     lines = PurchaseOrderLineSerializer(many=True, required=False)
+    line_field = "lines"
 
-    def __init__(self, *args, **kwargs):
-        super().__init__(*args, **kwargs)
-        from crm.models import Contact
-        from master.models import Currency
-
-        self.fields["supplier"].queryset = Contact.objects.all()
-        self.fields["currency"].queryset = Currency.objects.all()
+    lazy_querysets = {
+        "supplier": "crm.Contact",
+        "currency": "master.Currency",
+    }
 
     class Meta:
         model = PurchaseOrder
         fields = "__all__"
         read_only_fields = ("id", "created", "updated", "user_add", "history", "is_system_generated")
 
-    def _ensure_line_uuid(self, line):
-        if not line.get("id"):
-            line["id"] = uuid.uuid4()
-        return line
-
-    def create(self, validated_data):
-        lines_data = validated_data.pop("lines", [])
-        obj = PurchaseOrder.objects.create(**validated_data)
-
-        for line in lines_data:
-            line = self._ensure_line_uuid(line)
-            PurchaseOrderLine.objects.create(purchase_order=obj, **line)
-
-        return obj
-
-    def update(self, instance, validated_data):
-        lines_data = validated_data.pop("lines", None)
-
-        for key, value in validated_data.items():
-            setattr(instance, key, value)
-        instance.save()
-
-        if lines_data is not None:
-            instance.lines.all().delete()
-            for line in lines_data:
-                line = self._ensure_line_uuid(line)
-                PurchaseOrderLine.objects.create(purchase_order=instance, **line)
-
-        return instance
-
 
 class PurchaseBillLineSerializer(BulkModelSerializer):
     id = serializers.UUIDField(required=False)
     product = ReadablePKField(queryset=None, required=False, allow_null=True)
     tax_rate = ReadablePKField(queryset=None, required=False, allow_null=True)
 
-    def __init__(self, *args, **kwargs):
-        super().__init__(*args, **kwargs)
-        from inventory.models import Product
-        from master.models import TaxRate
-
-        self.fields["product"].queryset = Product.objects.all()
-        self.fields["tax_rate"].queryset = TaxRate.objects.all()
+    lazy_querysets = {
+        "product": "inventory.Product",
+        "tax_rate": "master.TaxRate",
+    }
 
     class Meta:
         model = PurchaseBillLine
@@ -147,67 +89,32 @@ class PurchaseBillLineSerializer(BulkModelSerializer):
         read_only_fields = ("purchase_bill", "created", "updated")
 
 
-class PurchaseBillSerializer(BulkModelSerializer):
+class PurchaseBillSerializer(NestedDocumentSerializerMixin, BulkModelSerializer):
     supplier = ReadablePKField(queryset=None)
     currency = ReadablePKField(queryset=None, required=False, allow_null=True)
     lines = PurchaseBillLineSerializer(many=True, required=False)
+    line_field = "lines"
 
-    def __init__(self, *args, **kwargs):
-        super().__init__(*args, **kwargs)
-        from crm.models import Contact
-        from master.models import Currency
-
-        self.fields["supplier"].queryset = Contact.objects.all()
-        self.fields["currency"].queryset = Currency.objects.all()
+    lazy_querysets = {
+        "supplier": "crm.Contact",
+        "currency": "master.Currency",
+    }
 
     class Meta:
         model = PurchaseBill
         fields = "__all__"
         read_only_fields = ("id", "created", "updated", "user_add", "history", "is_system_generated")
 
-    def _ensure_line_uuid(self, line):
-        if not line.get("id"):
-            line["id"] = uuid.uuid4()
-        return line
-
-    def create(self, validated_data):
-        lines_data = validated_data.pop("lines", [])
-        obj = PurchaseBill.objects.create(**validated_data)
-
-        for line in lines_data:
-            line = self._ensure_line_uuid(line)
-            PurchaseBillLine.objects.create(purchase_bill=obj, **line)
-
-        return obj
-
-    def update(self, instance, validated_data):
-        lines_data = validated_data.pop("lines", None)
-
-        for key, value in validated_data.items():
-            setattr(instance, key, value)
-        instance.save()
-
-        if lines_data is not None:
-            instance.lines.all().delete()
-            for line in lines_data:
-                line = self._ensure_line_uuid(line)
-                PurchaseBillLine.objects.create(purchase_bill=instance, **line)
-
-        return instance
-
 
 class ExpenseLineSerializer(BulkModelSerializer):
     id = serializers.UUIDField(required=False)
     product = ReadablePKField(queryset=None, required=False, allow_null=True)
     tax_rate = ReadablePKField(queryset=None, required=False, allow_null=True)
 
-    def __init__(self, *args, **kwargs):
-        super().__init__(*args, **kwargs)
-        from inventory.models import Product
-        from master.models import TaxRate
-
-        self.fields["product"].queryset = Product.objects.all()
-        self.fields["tax_rate"].queryset = TaxRate.objects.all()
+    lazy_querysets = {
+        "product": "inventory.Product",
+        "tax_rate": "master.TaxRate",
+    }
 
     class Meta:
         model = ExpenseLine
@@ -227,57 +134,24 @@ class ExpenseLineSerializer(BulkModelSerializer):
         read_only_fields = ("expense", "created", "updated")
 
 
-class ExpenseSerializer(BulkModelSerializer):
+class ExpenseSerializer(NestedDocumentSerializerMixin, BulkModelSerializer):
     supplier = ReadablePKField(queryset=None, required=False, allow_null=True)
     currency = ReadablePKField(queryset=None, required=False, allow_null=True)
     expense_account = ReadablePKField(queryset=None, required=False, allow_null=True)
     lines = ExpenseLineSerializer(many=True, required=False)
+    line_field = "lines"
 
-    def __init__(self, *args, **kwargs):
-        super().__init__(*args, **kwargs)
-        from crm.models import Contact
-        from master.models import Currency
-        from accounting.models import COA
-
-        self.fields["supplier"].queryset = Contact.objects.all()
-        self.fields["currency"].queryset = Currency.objects.all()
-        self.fields["expense_account"].queryset = COA.objects.all()
+    lazy_querysets = {
+        "supplier": "crm.Contact",
+        "currency": "master.Currency",
+        "expense_account": "accounting.COA",
+    }
 
     class Meta:
         model = Expense
         fields = "__all__"
         read_only_fields = ("id", "created", "updated", "user_add", "history", "is_system_generated")
 
-    def _ensure_line_uuid(self, line):
-        if not line.get("id"):
-            line["id"] = uuid.uuid4()
-        return line
-
-    def create(self, validated_data):
-        lines_data = validated_data.pop("lines", [])
-        obj = Expense.objects.create(**validated_data)
-
-        for line in lines_data:
-            line = self._ensure_line_uuid(line)
-            ExpenseLine.objects.create(expense=obj, **line)
-
-        return obj
-
-    def update(self, instance, validated_data):
-        lines_data = validated_data.pop("lines", None)
-
-        for key, value in validated_data.items():
-            setattr(instance, key, value)
-        instance.save()
-
-        if lines_data is not None:
-            instance.lines.all().delete()
-            for line in lines_data:
-                line = self._ensure_line_uuid(line)
-                ExpenseLine.objects.create(expense=instance, **line)
-
-        return instance
-
 
 class SupplierPaymentLineSerializer(BulkModelSerializer):
     id = serializers.UUIDField(required=False)
@@ -289,70 +163,34 @@ class SupplierPaymentLineSerializer(BulkModelSerializer):
         read_only_fields = ("supplier_payment", "created", "updated")
 
 
-class SupplierPaymentSerializer(BulkModelSerializer):
+class SupplierPaymentSerializer(NestedDocumentSerializerMixin, BulkModelSerializer):
     supplier = ReadablePKField(queryset=None)
     currency = ReadablePKField(queryset=None, required=False, allow_null=True)
     bank_account = ReadablePKField(queryset=None, required=False, allow_null=True)
     lines = SupplierPaymentLineSerializer(many=True, required=False)
+    line_field = "lines"
 
-    def __init__(self, *args, **kwargs):
-        super().__init__(*args, **kwargs)
-        from crm.models import Contact
-        from master.models import Currency
-        from accounting.models import BankAccount
-
-        self.fields["supplier"].queryset = Contact.objects.all()
-        self.fields["currency"].queryset = Currency.objects.all()
-        self.fields["bank_account"].queryset = BankAccount.objects.all()
+    lazy_querysets = {
+        "supplier": "crm.Contact",
+        "currency": "master.Currency",
+        "bank_account": "accounting.BankAccount",
+    }
 
     class Meta:
         model = SupplierPayment
         fields = "__all__"
         read_only_fields = ("id", "created", "updated", "user_add", "history", "is_system_generated")
 
-    def _ensure_line_uuid(self, line):
-        if not line.get("id"):
-            line["id"] = uuid.uuid4()
-        return line
-
-    def create(self, validated_data):
-        lines_data = validated_data.pop("lines", [])
-        obj = SupplierPayment.objects.create(**validated_data)
-
-        for line in lines_data:
-            line = self._ensure_line_uuid(line)
-            SupplierPaymentLine.objects.create(supplier_payment=obj, **line)
-
-        return obj
-
-    def update(self, instance, validated_data):
-        lines_data = validated_data.pop("lines", None)
-
-        for key, value in validated_data.items():
-            setattr(instance, key, value)
-        instance.save()
-
-        if lines_data is not None:
-            instance.lines.all().delete()
-            for line in lines_data:
-                line = self._ensure_line_uuid(line)
-                SupplierPaymentLine.objects.create(supplier_payment=instance, **line)
-
-        return instance
-
 
 class DebitNoteLineSerializer(BulkModelSerializer):
     id = serializers.UUIDField(required=False)
     product = ReadablePKField(queryset=None, required=False, allow_null=True)
     tax_rate = ReadablePKField(queryset=None, required=False, allow_null=True)
 
-    def __init__(self, *args, **kwargs):
-        super().__init__(*args, **kwargs)
-        from inventory.models import Product
-        from master.models import TaxRate
-
-        self.fields["product"].queryset = Product.objects.all()
-        self.fields["tax_rate"].queryset = TaxRate.objects.all()
+    lazy_querysets = {
+        "product": "inventory.Product",
+        "tax_rate": "master.TaxRate",
+    }
 
     class Meta:
         model = DebitNoteLine
@@ -371,51 +209,19 @@ class DebitNoteLineSerializer(BulkModelSerializer):
         read_only_fields = ("debit_note", "created", "updated")
 
 
-class DebitNoteSerializer(BulkModelSerializer):
+class DebitNoteSerializer(NestedDocumentSerializerMixin, BulkModelSerializer):
     supplier = ReadablePKField(queryset=None)
     purchase_bill = ReadablePKField(queryset=PurchaseBill.objects.all(), required=False, allow_null=True)
     currency = ReadablePKField(queryset=None, required=False, allow_null=True)
     lines = DebitNoteLineSerializer(many=True, required=False)
+    line_field = "lines"
 
-    def __init__(self, *args, **kwargs):
-        super().__init__(*args, **kwargs)
-        from crm.models import Contact
-        from master.models import Currency
-
-        self.fields["supplier"].queryset = Contact.objects.all()
-        self.fields["currency"].queryset = Currency.objects.all()
+    lazy_querysets = {
+        "supplier": "crm.Contact",
+        "currency": "master.Currency",
+    }
 
     class Meta:
         model = DebitNote
         fields = "__all__"
         read_only_fields = ("id", "created", "updated", "user_add", "history", "is_system_generated")
-
-    def _ensure_line_uuid(self, line):
-        if not line.get("id"):
-            line["id"] = uuid.uuid4()
-        return line
-
-    def create(self, validated_data):
-        lines_data = validated_data.pop("lines", [])
-        obj = DebitNote.objects.create(**validated_data)
-
-        for line in lines_data:
-            line = self._ensure_line_uuid(line)
-            DebitNoteLine.objects.create(debit_note=obj, **line)
-
-        return obj
-
-    def update(self, instance, validated_data):
-        lines_data = validated_data.pop("lines", None)
-
-        for key, value in validated_data.items():
-            setattr(instance, key, value)
-        instance.save()
-
-        if lines_data is not None:
-            instance.lines.all().delete()
-            for line in lines_data:
-                line = self._ensure_line_uuid(line)
-                DebitNoteLine.objects.create(debit_note=instance, **line)
-
-        return instance
@@ -1,4 +1,5 @@
 from core.utils.BaseModelViewSet import BaseModelViewSet
+from accounting.posting import LedgerLineMixin, LedgerPostingMixin
 from .models import (
     PurchaseOrder,
     PurchaseOrderLine,
@@ -42,6 +43,7 @@ class PurchaseOrderViewSet(BaseModelViewSet):
     serializer_class = PurchaseOrderSerializer
     filterset_class = PurchaseOrderFilter
     search_fields = ["po_no", "note"]
+    cursor_ordering = ("-po_date", "-created", "-id")
 
 
 class PurchaseOrderLineViewSet(BaseModelViewSet):
@@ -51,25 +53,28 @@ class PurchaseOrderLineViewSet(BaseModelViewSet):
     search_fields = ["product_name"]
 
 
-class PurchaseBillViewSet(BaseModelViewSet):
+class PurchaseBillViewSet(LedgerPostingMixin, BaseModelViewSet):
     queryset = PurchaseBill.objects.select_related("supplier", "currency", "branch").prefetch_related("lines").all()
     serializer_class = PurchaseBillSerializer
     filterset_class = PurchaseBillFilter
     search_fields = ["bill_no", "note"]
+    cursor_ordering = ("-bill_date", "-created", "-id")
 
 
-class PurchaseBillLineViewSet(BaseModelViewSet):
+class PurchaseBillLineViewSet(LedgerLineMixin, BaseModelViewSet):
+    ledger_document_field = "purchase_bill"
     queryset = PurchaseBillLine.objects.select_related("purchase_bill", "product", "tax_rate").all()
     serializer_class = PurchaseBillLineSerializer
     filterset_class = PurchaseBillLineFilter
     search_fields = ["product_name"]
 
 
-class ExpenseViewSet(BaseModelViewSet):
+class ExpenseViewSet(LedgerPostingMixin, BaseModelViewSet):
     queryset = Expense.objects.select_related("supplier", "currency", "expense_account", "branch").prefetch_related("lines").all()
     serializer_class = ExpenseSerializer
     filterset_class = ExpenseFilter
     search_fields = ["expense_no", "description", "note"]
+    cursor_ordering = ("-expense_date", "-created", "-id")
 
 
 class ExpenseLineViewSet(BaseModelViewSet):
@@ -79,11 +84,12 @@ class ExpenseLineViewSet(BaseModelViewSet):
     search_fields = ["product_name"]
 
 
-class SupplierPaymentViewSet(BaseModelViewSet):
+class SupplierPaymentViewSet(LedgerPostingMixin, BaseModelViewSet):
     queryset = SupplierPayment.objects.select_related("supplier", "currency", "bank_account", "branch").prefetch_related("lines").all()
     serializer_class = SupplierPaymentSerializer
     filterset_class = SupplierPaymentFilter
     search_fields = ["payment_no", "reference", "note"]
+    cursor_ordering = ("-payment_date", "-created", "-id")
 
 
 class SupplierPaymentLineViewSet(BaseModelViewSet):
@@ -93,14 +99,16 @@ class SupplierPaymentLineViewSet(BaseModelViewSet):
     search_fields = ["note"]
 
 
-class DebitNoteViewSet(BaseModelViewSet):
+class DebitNoteViewSet(LedgerPostingMixin, BaseModelViewSet):
     queryset = DebitNote.objects.select_related("supplier", "purchase_bill", "currency", "branch").prefetch_related("lines").all()
     serializer_class = DebitNoteSerializer
     filterset_class = DebitNoteFilter
     search_fields = ["debit_note_no", "reason", "note"]
+    cursor_ordering = ("-debit_note_date", "-created", "-id")
 
 
-class DebitNoteLineViewSet(BaseModelViewSet):
+class DebitNoteLineViewSet(LedgerLineMixin, BaseModelViewSet):
+    ledger_document_field = "debit_note"
     queryset = DebitNoteLine.objects.select_related("debit_note", "product", "tax_rate").all()
     serializer_class = DebitNoteLineSerializer
     filterset_class = DebitNoteLineFilter
@@ -0,0 +1,58 @@
+# Generated by Django 5.2.18 on 2026-10-18 12:38
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounting', '0003_branch_composite_indexes'),
+        ('crm', '0001_initial'),
+        ('master', '0001_initial'),
+        ('sales', '0001_initial'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='creditnote',
+            index=models.Index(fields=['branch', 'active', 'created'], name='sales_credi_branch__1de08b_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='creditnote',
+            index=models.Index(fields=['branch', 'credit_note_date', 'status'], name='sales_credi_branch__dcf39f_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='customerpayment',
+            index=models.Index(fields=['branch', 'active', 'created'], name='sales_custo_branch__634408_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='customerpayment',
+            index=models.Index(fields=['branch', 'payment_date', 'status'], name='sales_custo_branch__e84ee7_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='invoice',
+            index=models.Index(fields=['branch', 'active', 'created'], name='sales_invoi_branch__116b7a_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='invoice',
+            index=models.Index(fields=['branch', 'invoice_date', 'status'], name='sales_invoi_branch__14014b_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='quotation',
+            index=models.Index(fields=['branch', 'active', 'created'], name='sales_quota_branch__764238_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='quotation',
+            index=models.Index(fields=['branch', 'quotation_date', 'status'], name='sales_quota_branch__768899_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='sale',
+            index=models.Index(fields=['branch', 'active', 'created'], name='sales_sale_branch__86d2db_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='sale',
+            index=models.Index(fields=['branch', 'sale_date', 'status'], name='sales_sale_branch__cfe53f_idx'),
+        ),
+    ]
@@ -1,3 +1,50 @@
+import datetime
+import unittest
+
+from django.db import connection
 from django.test import TestCase
 
-# Create your tests here.
+from core.utils.BranchScopeRegistry import get_branch_scope
+from master.models import Branch
+from sales.models import Invoice
+from sales.views import InvoiceViewSet
+
+
+class InvoiceListIndexTests(TestCase):
+    """The branch-scoped invoice list is served by the composite indexes on Invoice."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.branch = Branch.objects.create(code="T-B1", name="Test Branch 1")
+
+    def index_name(self, fields):
+        for index in Invoice._meta.indexes:
+            if list(index.fields) == fields:
+                return index.name
+        self.fail("Invoice has no index on {}".format(fields))
+
+    def plan(self, queryset):
+        if connection.vendor == "postgresql":
+            # The test table is nearly empty, where a sequential scan always wins
+            with connection.cursor() as cursor:
+                cursor.execute("SET LOCAL enable_seqscan = off")
+        return queryset.explain()
+
+    def branch_queryset(self):
+        return get_branch_scope(Invoice).filter(InvoiceViewSet.queryset.all(), self.branch.pk)
+
+    def test_date_range_and_status_filter_uses_branch_date_status_index(self):
+        queryset = self.branch_queryset().filter(
+            invoice_date__range=(datetime.date(2026, 1, 1), datetime.date(2026, 1, 31)),
+            status=Invoice.Status.POSTED,
+        )
+
+        self.assertIn(self.index_name(["branch", "invoice_date", "status"]), self.plan(queryset))
+
+    # Django writes active=True as a bare "active" condition; PostgreSQL
+    # matches that to the index column, SQLite only uses the branch prefix.
+    @unittest.skipUnless(connection.vendor == "postgresql", "needs boolean index matching")
+    def test_active_listing_by_created_uses_branch_active_created_index(self):
+        queryset = self.branch_queryset().filter(active=True).order_by("-created")
+
+        self.assertIn(self.index_name(["branch", "active", "created"]), self.plan(queryset))
@@ -1,4 +1,5 @@
 from core.utils.BaseModelViewSet import BaseModelViewSet
+from accounting.posting import LedgerLineMixin, LedgerPostingMixin
 from .models import (
     Quotation,
     QuotationItem,
@@ -42,6 +43,7 @@ class QuotationViewSet(BaseModelViewSet):
     serializer_class = QuotationSerializer
     filterset_class = QuotationFilter
     search_fields = ["quotation_no", "note"]
+    cursor_ordering = ("-quotation_date", "-created", "-id")
 
 
 class QuotationItemViewSet(BaseModelViewSet):
@@ -56,6 +58,7 @@ class SaleViewSet(BaseModelViewSet):
     serializer_class = SaleSerializer
     filterset_class = SaleFilter
     search_fields = ["sale_no", "note"]
+    cursor_ordering = ("-sale_date", "-created", "-id")
 
 
 class SaleItemViewSet(BaseModelViewSet):
@@ -65,27 +68,30 @@ class SaleItemViewSet(BaseModelViewSet):
     search_fields = ["product_name"]
 
 
-class InvoiceViewSet(BaseModelViewSet):
+class InvoiceViewSet(LedgerPostingMixin, BaseModelViewSet):
     queryset = Invoice.objects.select_related("customer", "currency", "branch").prefetch_related("items").all()
     serializer_class = InvoiceSerializer
     filterset_class = InvoiceFilter
     search_fields = ["invoice_no", "note"]
+    cursor_ordering = ("-invoice_date", "-created", "-id")
 
 
-class InvoiceItemViewSet(BaseModelViewSet):
+class InvoiceItemViewSet(LedgerLineMixin, BaseModelViewSet):
+    ledger_document_field = "invoice"
     queryset = InvoiceItem.objects.select_related("invoice", "product", "tax_rate").all()
     serializer_class = InvoiceItemSerializer
     filterset_class = InvoiceItemFilter
     search_fields = ["product_name"]
 
 
-class CustomerPaymentViewSet(BaseModelViewSet):
+class CustomerPaymentViewSet(LedgerPostingMixin, BaseModelViewSet):
     queryset = CustomerPayment.objects.select_related("customer", "currency", "bank_account", "branch").prefetch_related(
         "allocations"
     ).all()
     serializer_class = CustomerPaymentSerializer
     filterset_class = CustomerPaymentFilter
     search_fields = ["payment_no", "reference", "note"]
+    cursor_ordering = ("-payment_date", "-created", "-id")
 
 
 class CustomerPaymentAllocationViewSet(BaseModelViewSet):
@@ -95,14 +101,16 @@ class CustomerPaymentAllocationViewSet(BaseModelViewSet):
     search_fields = ["note"]
 
 
-class CreditNoteViewSet(BaseModelViewSet):
+class CreditNoteViewSet(LedgerPostingMixin, BaseModelViewSet):
     queryset = CreditNote.objects.select_related("customer", "invoice", "currency", "branch").prefetch_related("lines").all()
     serializer_class = CreditNoteSerializer
     filterset_class = CreditNoteFilter
     search_fields = ["credit_note_no", "reason", "note"]
+    cursor_ordering = ("-credit_note_date", "-created", "-id")
 
 
-class CreditNoteLineViewSet(BaseModelViewSet):
+class CreditNoteLineViewSet(LedgerLineMixin, BaseModelViewSet):
+    ledger_document_field = "credit_note"
     queryset = CreditNoteLine.objects.select_related("credit_note", "product", "tax_rate").all()
     serializer_class = CreditNoteLineSerializer
     filterset_class = CreditNoteLineFilter